@@ -1,7 +1,8 @@
 from django.contrib import admin
-from django.http import HttpResponse
-import csv
+from django.utils import timezone
 
+from .cache import invalidate_models
+from .exports import PARTICIPATIONS_EXPORT, REPORTS_EXPORT, SEASON_STATS_EXPORT, streaming_export_response
 from .models import (
     User,
     Player,
@@ -28,7 +29,8 @@ class PlayerAdmin(admin.ModelAdmin):
     actions = ['mark_unavailable']
 
     def mark_unavailable(self, request, queryset):
-        updated = queryset.update(is_available=False)
+        updated = queryset.update(is_available=False, updated_at=timezone.now())
+        invalidate_models(Player)
         self.message_user(request, f"{updated} joueur(s) marqué(s) comme absent(s).")
     mark_unavailable.short_description = "Marquer comme absent"
 
@@ -54,24 +56,13 @@ class ParticipationAdmin(admin.ModelAdmin):
     actions = ['mark_all_notified', 'export_participations_csv']
 
     def mark_all_notified(self, request, queryset):
-        updated = queryset.update(notified=True)
+        updated = queryset.update(notified=True, updated_at=timezone.now())
+        invalidate_models(Participation)
         self.message_user(request, f"{updated} participation(s) marquée(s) comme notifiée(s).")
     mark_all_notified.short_description = "Marquer comme notifiée"
 
     def export_participations_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="participations.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['Player', 'Event', 'Will Attend', 'Notified'])
-
-        for p in queryset:
-            writer.writerow([
-                p.player.user.get_full_name() or p.player.user.email,
-                p.event.title,
-                'Oui' if p.will_attend else 'Non',
-                'Oui' if p.notified else 'Non'
-            ])
-        return response
+        return streaming_export_response(PARTICIPATIONS_EXPORT, queryset)
     export_participations_csv.short_description = "Exporter les participations en CSV"
 
 # ------------------------
@@ -86,23 +77,7 @@ class SeasonStatsAdmin(admin.ModelAdmin):
     actions = ['export_stats_csv']
 
     def export_stats_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="season_stats.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['Player', 'Season', 'Games Played', 'Goals', 'Assists', 'Yellow Cards', 'Red Cards', 'Note moyenne'])
-
-        for stat in queryset:
-            writer.writerow([
-                stat.player.user.get_full_name() or stat.player.user.email,
-                stat.season_year,
-                stat.games_played,
-                stat.goals,
-                stat.assists,
-                stat.yellow_cards,
-                stat.red_cards,
-                stat.notes_moyenne_saison
-            ])
-        return response
+        return streaming_export_response(SEASON_STATS_EXPORT, queryset)
 
     export_stats_csv.short_description = "📥 Exporter les statistiques en CSV"
 
@@ -119,17 +94,5 @@ class ReportAdminAdmin(admin.ModelAdmin):
     actions = ['export_reports_csv']
 
     def export_reports_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="reports_admin.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['Title', 'Type', 'Created By', 'Created At'])
-
-        for report in queryset:
-            writer.writerow([
-                report.title,
-                report.reporter_type,
-                report.created_by_admin.email if report.created_by_admin else "Inconnu",
-                report.created_at.strftime('%Y-%m-%d %H:%M')
-            ])
-        return response
+        return streaming_export_response(REPORTS_EXPORT, queryset)
     export_reports_csv.short_description = "Exporter les rapports en CSV"
\ No newline at end of file
@@ -0,0 +1,213 @@
+import asyncio
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .metrics import cache_lookup
+
+
+# ------------------------
+# Cache des utilisateurs authentifiés (par processus)
+# ------------------------
+class UserCache:
+    """
+    LRU borné avec durée de vie, propre au processus et thread-safe.
+    Chaque lecture renvoie une copie : l'instance en cache n'est jamais modifiée par une requête.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _config():
+        config = getattr(settings, 'JWT_USER_CACHE', {})
+        return config.get('MAX_SIZE', 1024), config.get('TTL', 60)
+
+    def get(self, key):
+        max_size, ttl = self._config()
+        if not max_size:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, stored_at = entry
+            if time.monotonic() - stored_at > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.copy(user)
+
+    def set(self, key, user):
+        max_size, _ = self._config()
+        if not max_size:
+            return
+        with self._lock:
+            self._entries[key] = (copy.copy(user), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(str(key), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(user_id):
+    user_cache.invalidate(user_id)
+
+
+# ------------------------
+# Utilisateur lu dans les claims du token
+# ------------------------
+class ClaimsUser(SimpleLazyObject):
+    """
+    Utilisateur paresseux : id, rôle et is_authenticated viennent des claims du token
+    (voir CustomTokenObtainPairSerializer.get_token). Tout autre attribut charge le vrai User.
+    Le rôle et l'état actif ne sont donc revérifiés qu'à l'expiration du token : réservé aux lectures
+    (GET, HEAD, OPTIONS) des vues qui l'acceptent (claims_only_user = True).
+    """
+
+    def __init__(self, claims, loader):
+        super().__init__(loader)
+        self.__dict__['_claims'] = claims
+
+    @property
+    def pk(self):
+        if self._wrapped is empty:
+            return get_user_model()._meta.pk.to_python(self._claims[api_settings.USER_ID_CLAIM])
+        return self._wrapped.pk
+
+    id = pk
+
+    @property
+    def role(self):
+        if self._wrapped is empty:
+            if 'role' in self._claims:
+                return self._claims['role']
+            self._setup()
+        return self._wrapped.role
+
+    def __bool__(self):
+        return True
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+
+# ------------------------
+# Authentification JWT
+# ------------------------
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication sans requête SQL par lecture : le User est servi par un LRU avec TTL,
+    invalidé à l'enregistrement / la suppression d'un User (api/signals.py) et à l'approbation.
+    Les lectures des vues marquées claims_only_user reçoivent un ClaimsUser (aucune lecture
+    tant que seuls l'id et le rôle sont utilisés).
+
+    Les écritures, et les vues marquées fresh_user (qui sérialisent l'utilisateur lui-même),
+    relisent toujours le User en base : le cache est propre au processus et un compte
+    désactivé ou supprimé sur un autre worker n'y est pas invalidé.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        if request.method not in SAFE_METHODS or getattr(view, 'fresh_user', False):
+            return JWTAuthentication.get_user(self, validated_token), validated_token
+        if getattr(view, 'claims_only_user', False) and api_settings.USER_ID_CLAIM in validated_token:
+            return ClaimsUser(validated_token.payload, lambda: self.get_user(validated_token)), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(user_id)
+        cache_lookup("jwt_user", hit=user is not None)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+            return user
+
+        # Mêmes vérifications que JWTAuthentication.get_user, sur l'instance en cache
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+# ------------------------
+# Vérification du mot de passe hors du thread de requête
+# ------------------------
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    """Pool borné (LOGIN_HASH_WORKERS, un thread par cœur par défaut) : PBKDF2 libère le GIL."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            workers = getattr(settings, 'LOGIN_HASH_WORKERS', None) or os.cpu_count() or 1
+            _hash_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+    return _hash_pool
+
+
+async def acheck_password(user, raw_password):
+    """
+    user.check_password sans bloquer la boucle d'événements : le hachage tourne dans le pool,
+    la mise à niveau éventuelle du hash (changement d'algorithme / d'itérations) aussi.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_hash_pool()
+    must_update = []
+    valid = await loop.run_in_executor(pool, check_password, raw_password, user.password, must_update.append)
+    if valid and must_update:
+        user.password = await loop.run_in_executor(pool, make_password, raw_password)
+        await user.asave(update_fields=['password'])
+    return valid
+
+
+async def ahash_password(raw_password):
+    """Un hachage sans compte derrière : un email inconnu coûte autant qu'un mot de passe faux."""
+    await asyncio.get_running_loop().run_in_executor(get_hash_pool(), make_password, raw_password)
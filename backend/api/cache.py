@@ -0,0 +1,181 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .metrics import cache_lookup
+
+TAG_PREFIX = "tag"
+LOCK_TIMEOUT = 10   # secondes : au-delà, un calcul bloqué ne retient plus les autres processus
+LOCK_POLL = 0.025   # secondes entre deux lectures pendant qu'un autre calcule
+_MISSING = object()
+
+
+def get_cache():
+    """Cache des réponses : alias RESPONSE_CACHE_ALIAS (locmem par défaut, fichier/BD partagé en production)."""
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def default_timeout():
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def lock_wait():
+    """Attente maximale (s) du résultat d'un autre calcul avant de calculer soi-même."""
+    return getattr(settings, "RESPONSE_CACHE_LOCK_WAIT", 0.5)
+
+
+def model_tag(model):
+    return model._meta.label_lower
+
+
+# ------------------------
+# Versions des étiquettes
+# ------------------------
+def _tag_key(tag):
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def tag_versions(tags):
+    """Version courante de chaque étiquette, en une lecture ; initialisée à une valeur unique si absente."""
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Version initiale unique : une étiquette évincée ne peut pas ressusciter d'anciennes entrées
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(tags):
+    cache = get_cache()
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            # Étiquette absente (cache vidé ou évincé) : on repart sur une nouvelle version
+            cache.set(_tag_key(tag), time.time_ns(), timeout=None)
+
+
+def invalidate_tags(*tags):
+    """
+    Rend obsolètes toutes les entrées portant l'une de ces étiquettes : tout de suite, puis
+    de nouveau au commit (une lecture concurrente a pu remettre en cache l'état d'avant).
+    """
+    _bump(tags)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(tags))
+
+
+def invalidate_models(*models):
+    invalidate_tags(*(model_tag(model) for model in models))
+
+
+# ------------------------
+# Lecture / calcul protégé contre la ruée
+# ------------------------
+def get_or_compute(key, tags, compute, timeout=None):
+    """
+    Valeur en cache pour (key, versions des étiquettes) ; sinon un seul appelant calcule
+    (verrou cache.add) pendant que les autres attendent son résultat au plus
+    RESPONSE_CACHE_LOCK_WAIT secondes, puis calculent eux-mêmes : un calcul lent ne bloque
+    pas les threads de requête. Le verrou suppose un add() atomique (locmem, BD, memcached,
+    Redis) ; avec FileBasedCache, add() et incr() ne le sont pas : plusieurs processus
+    peuvent calculer la même entrée, ce qui ne coûte que le calcul en double.
+    """
+    cache = get_cache()
+    versions = ":".join(str(version) for version in tag_versions(tags))
+    digest = hashlib.md5(f"{key}|{versions}".encode(), usedforsecurity=False).hexdigest()
+    entry_key, lock_key = f"resp:{digest}", f"resp-lock:{digest}"
+
+    value = cache.get(entry_key, _MISSING)
+    if value is not _MISSING:
+        cache_lookup("response", hit=True)
+        return value
+
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        deadline = time.monotonic() + lock_wait()
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            value = cache.get(entry_key, _MISSING)
+            if value is not _MISSING:
+                cache_lookup("response", hit=True)
+                return value
+            if cache.get(lock_key) is None:
+                break  # calcul abandonné (erreur) : on prend le relais
+
+    cache_lookup("response", hit=False)
+    try:
+        value = compute()
+        cache.set(entry_key, value, default_timeout() if timeout is None else timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+# ------------------------
+# Vues
+# ------------------------
+def cache_response(tags, timeout=None):
+    """
+    Décorateur de méthode de vue DRF (get, list) : met en cache response.data, clé = chemin
+    + paramètres + rôle (+ self.cache_variant(request) si la vue le définit, pour ce qui
+    dépend d'autre chose que la requête, comme l'heure). Réservé aux réponses identiques pour
+    tous les utilisateurs d'un même rôle. L'entrée garde l'instant de son calcul, exposé dans
+    self.response_cache_version : ConditionalGetMixin en tire l'ETag sans sonde en base.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            role = getattr(request.user, "role", None) if request.user.is_authenticated else "anonyme"
+            key = "|".join([
+                "etag", type(self).__name__, request.get_host(), request.path,
+                request.META.get("QUERY_STRING", ""), str(role),
+                self.cache_variant(request) if hasattr(self, "cache_variant") else "",
+            ])
+
+            def compute():
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise _Uncacheable(response)
+                return time.time_ns(), response.data
+
+            try:
+                version, data = get_or_compute(key, tags, compute, timeout)
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+            self.response_cache_version = version
+            return Response(data)
+        wrapper.response_cache = True
+        return wrapper
+    return decorator
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class CachedListMixin:
+    """list() servie par cache_response ; étiquettes dans cache_tags (ex. ('api.event',))."""
+    cache_tags = ()
+    cache_timeout = None
+
+    def serves_from_cache(self, request):
+        """list() seulement : retrieve() d'un ViewSet n'est pas en cache."""
+        return getattr(self, "action", "list") == "list"
+
+    def list(self, request, *args, **kwargs):
+        cached_list = cache_response(self.cache_tags, self.cache_timeout)(type(self)._uncached_list)
+        return cached_list(self, request, *args, **kwargs)
+
+    def _uncached_list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,129 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import User
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+class BloomFilter:
+    """Filtre de Bloom (double hachage blake2b) : « absent » est certain, « présent » est probable."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(int(capacity), 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class EmailIndex:
+    """
+    Emails connus de ce processus, normalisés. Construit à la première requête HTTP du worker
+    (warm_up, api/signals.py : pas dans AppConfig.ready(), qui tourne aussi pour migrate et
+    avant le fork de gunicorn), complété à chaque enregistrement de User et resynchronisé par
+    updated_at toutes les EMAIL_INDEX_REFRESH secondes pour voir les inscriptions faites par
+    les autres processus. Reconstruit en entier quand il dépasse sa capacité.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._filter = None
+        self._synced_at = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _error_rate():
+        return getattr(settings, 'EMAIL_INDEX_ERROR_RATE', 0.01)
+
+    @staticmethod
+    def _refresh_interval():
+        return getattr(settings, 'EMAIL_INDEX_REFRESH', 30)
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+
+    def warm_up(self):
+        """Construit le filtre s'il n'existe pas encore dans ce processus."""
+        if self._filter is not None:
+            return
+        with self._lock:
+            if self._filter is None:
+                self._rebuild()
+
+    def _rebuild(self):
+        synced_at = timezone.now()
+        emails = list(User.objects.values_list('email', flat=True).iterator(chunk_size=5000))
+        bloom = BloomFilter(max(len(emails) * 2, 1000), self._error_rate())
+        for email in emails:
+            bloom.add(normalize_email(email))
+        self._filter, self._synced_at, self._checked_at = bloom, synced_at, time.monotonic()
+
+    def _sync(self):
+        if self._filter is None:
+            self._rebuild()
+            return
+        if time.monotonic() - self._checked_at < self._refresh_interval():
+            return
+        synced_at = timezone.now()
+        # Marge d'un intervalle : lignes validées tard par une transaction longue
+        since = self._synced_at - timedelta(seconds=self._refresh_interval())
+        for email in User.objects.filter(updated_at__gte=since).values_list('email', flat=True):
+            self._add(email)
+        self._synced_at, self._checked_at = synced_at, time.monotonic()
+
+    def _add(self, email):
+        email = normalize_email(email)
+        if email in self._filter:
+            return
+        if self._filter.count >= self._filter.capacity:
+            self._rebuild()
+        self._filter.add(email)
+
+    def add(self, email):
+        with self._lock:
+            if self._filter is not None:
+                self._add(email)
+
+    def might_contain(self, email):
+        with self._lock:
+            self._sync()
+            return normalize_email(email) in self._filter
+
+
+email_index = EmailIndex()
+# Un worker forké construit son propre filtre (et ne garde pas un verrou tenu pendant le fork)
+os.register_at_fork(after_in_child=email_index.reset)
+
+
+def email_exists(email):
+    """User.objects.filter(email=email).exists(), sans requête quand le filtre garantit l'absence."""
+    if not email_index.might_contain(email):
+        return False
+    return User.objects.filter(email=email).exists()
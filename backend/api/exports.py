@@ -0,0 +1,159 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .models import Participation, ReportAdmin, SeasonStats
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """Pseudo-fichier : csv.writer renvoie la ligne au lieu de l'écrire en mémoire."""
+    def write(self, value):
+        return value
+
+
+def _full_name(user):
+    return user.get_full_name() or user.email
+
+
+def _yes_no(value):
+    return 'Oui' if value else 'Non'
+
+
+# ------------------------
+# Définition des exports : (clé NDJSON, en-tête CSV) + jointures + ligne
+# ------------------------
+class Export:
+    def __init__(self, filename, columns, select_related, row, filters=None):
+        self.filename = filename
+        self.columns = columns
+        self.select_related = select_related
+        self.row = row
+        # Paramètre de requête -> lookup ORM, pour les exports via l'API
+        self.filters = filters or {}
+
+    @property
+    def keys(self):
+        return [key for key, _ in self.columns]
+
+    @property
+    def header(self):
+        return [label for _, label in self.columns]
+
+    def filter(self, queryset, params):
+        lookups = {lookup: params[param] for param, lookup in self.filters.items() if params.get(param)}
+        return queryset.filter(**lookups)
+
+    def prepare(self, queryset):
+        # Jointures en une seule requête, lue par blocs : mémoire constante, pas de N+1
+        chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+        return queryset.select_related(*self.select_related).iterator(chunk_size=chunk_size)
+
+
+SEASON_STATS_EXPORT = Export(
+    filename='season_stats',
+    columns=[
+        ('player', 'Player'),
+        ('season', 'Season'),
+        ('games_played', 'Games Played'),
+        ('goals', 'Goals'),
+        ('assists', 'Assists'),
+        ('yellow_cards', 'Yellow Cards'),
+        ('red_cards', 'Red Cards'),
+        ('notes_moyenne_saison', 'Note moyenne'),
+    ],
+    select_related=('player__user',),
+    filters={'season': 'season_year'},
+    row=lambda stat: [
+        _full_name(stat.player.user),
+        stat.season_year,
+        stat.games_played,
+        stat.goals,
+        stat.assists,
+        stat.yellow_cards,
+        stat.red_cards,
+        stat.notes_moyenne_saison,
+    ],
+)
+
+PARTICIPATIONS_EXPORT = Export(
+    filename='participations',
+    columns=[
+        ('player', 'Player'),
+        ('event', 'Event'),
+        ('will_attend', 'Will Attend'),
+        ('notified', 'Notified'),
+    ],
+    select_related=('player__user', 'event'),
+    filters={'event': 'event_id'},
+    row=lambda p: [
+        _full_name(p.player.user),
+        p.event.title,
+        _yes_no(p.will_attend),
+        _yes_no(p.notified),
+    ],
+)
+
+REPORTS_EXPORT = Export(
+    filename='reports_admin',
+    columns=[
+        ('title', 'Title'),
+        ('type', 'Type'),
+        ('created_by', 'Created By'),
+        ('created_at', 'Created At'),
+    ],
+    select_related=('created_by_admin',),
+    filters={'type': 'reporter_type'},
+    row=lambda report: [
+        report.title,
+        report.reporter_type,
+        report.created_by_admin.email if report.created_by_admin else "Inconnu",
+        report.created_at.strftime('%Y-%m-%d %H:%M'),
+    ],
+)
+
+EXPORTS = {
+    'season-stats': (SEASON_STATS_EXPORT, SeasonStats),
+    'participations': (PARTICIPATIONS_EXPORT, Participation),
+    'reports': (REPORTS_EXPORT, ReportAdmin),
+}
+
+
+# ------------------------
+# Générateurs + réponse
+# ------------------------
+def iter_csv(export, queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(export.header)
+    for obj in export.prepare(queryset):
+        yield writer.writerow(export.row(obj))
+
+
+def iter_ndjson(export, queryset):
+    keys = export.keys
+    for obj in export.prepare(queryset):
+        yield json.dumps(dict(zip(keys, export.row(obj))), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def streaming_export_response(export, queryset, output='csv'):
+    rows = iter_ndjson(export, queryset) if output == 'ndjson' else iter_csv(export, queryset)
+    response = StreamingHttpResponse(rows, content_type=CONTENT_TYPES.get(output, CONTENT_TYPES['csv']))
+    response['Content-Disposition'] = f'attachment; filename="{export.filename}.{output}"'
+    return response
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Le format est choisi par ?output= ; l'en-tête Accept (text/csv...) ne doit pas provoquer de 406."""
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
@@ -0,0 +1,234 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+from .sparse import parse_field_spec, prune_fields
+
+TIMEZONE_KEY = '_fast_timezone'
+
+
+class Unsupported(Exception):
+    """Champ que le chemin rapide ne sait pas reproduire : la vue repasse par le serializer DRF."""
+
+
+def full_name(first_name, last_name):
+    """Même résultat que User.get_full_name(), à partir des colonnes."""
+    return f"{first_name} {last_name}".strip()
+
+
+def player_display_name(get):
+    """Champ fast_player_name partagé : nom complet du joueur, à défaut son email (comme get_player_name)."""
+    return full_name(get('player__user__first_name'), get('player__user__last_name')) or get('player__user__email')
+
+
+class CompiledSerializer:
+    """
+    Serializer en lecture seule compilé en une liste de (nom, fonction(row, context)).
+
+    Les lignes viennent de queryset.values(*columns) : ni instance de modèle, ni
+    introspection des champs par ligne. Chaque valeur passe par le to_representation
+    du champ DRF d'origine, ou par un équivalent exact pour les types simples et les
+    dates : la sortie JSON est identique.
+    """
+
+    def __init__(self, columns, mappers):
+        self.columns = columns
+        self.mappers = mappers
+
+    def values(self, queryset, extra=()):
+        columns = list(self.columns)
+        columns += [column for column in extra if column not in columns]
+        return queryset.values(*columns)
+
+    def to_representation(self, row, context=None):
+        return {name: mapper(row, context) for name, mapper in self.mappers}
+
+    def to_representation_many(self, rows, context=None):
+        # Fuseau courant résolu une fois par liste plutôt qu'une fois par valeur date-heure
+        context = dict(context or {})
+        context[TIMEZONE_KEY] = timezone.get_current_timezone() if settings.USE_TZ else None
+        to_representation = self.to_representation
+        return [to_representation(row, context) for row in rows]
+
+
+def _concrete_path(model, attrs):
+    """Chemin 'a__b__c' vers une colonne réelle ; lève Unsupported pour une propriété ou une relation multiple."""
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise Unsupported(attr)
+        if field.many_to_many or field.one_to_many:
+            raise Unsupported(attr)
+        last = index == len(attrs) - 1
+        if field.is_relation and not last:
+            model = field.related_model
+            continue
+        if field.is_relation:
+            return '__'.join(attrs), field
+        if not last:
+            raise Unsupported(attr)
+        return '__'.join(attrs), field
+    raise Unsupported('*')
+
+
+# Champs dont to_representation est str()/int()/bool() : la base renvoie déjà le bon type
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+
+def _identity_mapper(column):
+    def mapper(row, context):
+        return row[column]
+    return mapper
+
+
+def _value_mapper(field, column):
+    if type(field) in IDENTITY_FIELDS or type(field) is serializers.EmailField:
+        return _identity_mapper(column)
+    to_representation = field.to_representation
+
+    def mapper(row, context):
+        value = row[column]
+        return None if value is None else to_representation(value)
+    return mapper
+
+
+def _datetime_mapper(field, column):
+    generic = _value_mapper(field, column)
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if hasattr(field, 'timezone') or output_format is None or output_format.lower() != ISO_8601:
+        return generic
+    to_representation = field.to_representation
+
+    def mapper(row, context):
+        value = row[column]
+        if not value:
+            return None
+        tz = context.get(TIMEZONE_KEY) if context else None
+        if tz is None or value.tzinfo is None:
+            return to_representation(value)
+        # Même sortie que DateTimeField.to_representation (ISO 8601, 'Z' pour UTC)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return mapper
+
+
+def _pk_mapper(field, column):
+    to_representation = field.to_representation
+
+    def mapper(row, context):
+        value = row[column]
+        return None if value is None else to_representation(PKOnlyObject(pk=value))
+    return mapper
+
+
+def _file_mapper(field, column, model_field):
+    storage = model_field.storage
+    use_url = getattr(field, 'use_url', True)
+
+    def mapper(row, context):
+        name = row[column]
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        request = (context or {}).get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+    return mapper
+
+
+def _computed_mapper(func, prefix):
+    def mapper(row, context):
+        return func(lambda column: row[prefix + column])
+    return mapper
+
+
+def _nested_mapper(compiled, pk_column):
+    def mapper(row, context):
+        if row[pk_column] is None:
+            return None
+        return compiled.to_representation(row, context)
+    return mapper
+
+
+def _compile(serializer, model, prefix=''):
+    meta = getattr(serializer, 'Meta', None)
+    dependencies = getattr(meta, 'field_dependencies', {})
+    columns = []
+    mappers = []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        computed = getattr(serializer, f'fast_{name}', None)
+        if computed is not None:
+            columns += [prefix + dependency for dependency in dependencies.get(name, ())]
+            mappers.append((name, _computed_mapper(computed, prefix)))
+            continue
+
+        attrs = list(field.source_attrs)
+        if not attrs:
+            raise Unsupported(name)
+
+        if isinstance(field, serializers.ModelSerializer):
+            _, relation = _concrete_path(model, attrs)
+            if not relation.is_relation:
+                raise Unsupported(name)
+            nested_prefix = prefix + '__'.join(attrs) + '__'
+            nested = _compile(field, relation.related_model, nested_prefix)
+            pk_column = nested_prefix + relation.related_model._meta.pk.name
+            columns += [pk_column] + nested.columns
+            mappers.append((name, _nested_mapper(nested, pk_column)))
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            raise Unsupported(name)
+
+        path, model_field = _concrete_path(model, attrs)
+        column = prefix + path
+        columns.append(column)
+
+        if isinstance(field, serializers.RelatedField):
+            if not field.use_pk_only_optimization():
+                raise Unsupported(name)
+            mappers.append((name, _pk_mapper(field, column)))
+        elif isinstance(field, serializers.ManyRelatedField):
+            raise Unsupported(name)
+        elif isinstance(field, serializers.FileField):
+            mappers.append((name, _file_mapper(field, column, model_field)))
+        elif type(field) is serializers.DateTimeField:
+            mappers.append((name, _datetime_mapper(field, column)))
+        else:
+            mappers.append((name, _value_mapper(field, column)))
+
+    # Colonnes uniques, ordre conservé
+    return CompiledSerializer(list(dict.fromkeys(columns)), mappers)
+
+
+@lru_cache(maxsize=256)
+def compile_serializer(serializer_class, fields='', omit=''):
+    """
+    Compile une classe de serializer une seule fois par forme demandée (?fields= / ?omit=) ;
+    None si un champ n'est pas supporté.
+    """
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    serializer = prune_fields(serializer_class(), parse_field_spec(fields), parse_field_spec(omit))
+    try:
+        return _compile(serializer, model)
+    except Unsupported:
+        return None
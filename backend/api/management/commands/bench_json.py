@@ -0,0 +1,76 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Event, Participation, Player, SeasonStats
+from api.parsers import FastJSONParser
+from api.prefetch import plan_queryset
+from api.renderers import FastJSONRenderer, use_orjson
+from api.serializers import EventSerializer, ParticipationSerializer, PlayerSerializer, SeasonStatsSerializer
+from api.stats import compute_team_season_stats
+from api.synthetic import seed_club, temporary_database
+from api.utils import bulk_create_participations
+
+TARGETS = [
+    (PlayerSerializer, Player),
+    (EventSerializer, Event),
+    (SeasonStatsSerializer, SeasonStats),
+    (ParticipationSerializer, Participation),
+]
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Compare le rendu et le parsing JSON stdlib / orjson sur les plus gros payloads de l'API (base jetable)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help="Nombre de joueurs (et d'événements) générés.")
+        parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures ; le meilleur temps est retenu.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        if not use_orjson():
+            self.stderr.write("orjson indisponible (ou API_JSON_BACKEND='json') : les deux chemins utilisent la stdlib.")
+
+        context = {'request': Request(APIRequestFactory().get('/api/'))}
+        stdlib_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        with temporary_database():
+            roster = seed_club(players=rows, events=max(rows // 100, 1), seasons=3)
+            bulk_create_participations([player.id for player in roster], Event.objects.values_list('id', flat=True))
+
+            payloads = [
+                (serializer_class.__name__, serializer_class(
+                    plan_queryset(model.objects.all(), serializer_class), many=True, context=context).data)
+                for serializer_class, model in TARGETS
+            ]
+            # Agrégats bruts : Decimal et entiers hors serializer
+            payloads.append(('team_season_stats', compute_team_season_stats(None, 'season')))
+
+            for name, data in payloads:
+                stdlib_time, stdlib_bytes = _best_of(repeat, lambda: stdlib_renderer.render(data))
+                fast_time, fast_bytes = _best_of(repeat, lambda: fast_renderer.render(data))
+                parse_stdlib, _ = _best_of(repeat, lambda: stdlib_parser.parse(io.BytesIO(stdlib_bytes)))
+                parse_fast, _ = _best_of(repeat, lambda: fast_parser.parse(io.BytesIO(stdlib_bytes)))
+
+                self.stdout.write(
+                    f"{name:<24} {len(stdlib_bytes) / 1024:8.0f} Ko | "
+                    f"rendu x{stdlib_time / fast_time:4.1f} ({stdlib_time * 1e3:7.2f} -> {fast_time * 1e3:6.2f} ms) | "
+                    f"parsing x{parse_stdlib / parse_fast:4.1f} | "
+                    f"octets identiques : {'oui' if stdlib_bytes == fast_bytes else 'NON'}"
+                )
@@ -0,0 +1,269 @@
+import json
+import math
+import platform
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, reverse
+
+from api import urls
+from api.models import Event, Participation, Player, ReportAdmin, SeasonStats, User
+from api.serializers import CustomTokenObtainPairSerializer
+from api.synthetic import seed_club, temporary_database
+
+PASSWORD = "test1234"
+NEW_PASSWORD = "Motdepasse1!"
+EXPORT_RESOURCES = ("season-stats", "participations", "reports")
+
+
+def percentile(ordered, rank):
+    """Percentile au rang le plus proche, sur des valeurs déjà triées."""
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _pending_users(prefix, count):
+    """Comptes en attente d'approbation (sans profil joueur, comme après une inscription)."""
+    hashed = make_password(PASSWORD)
+    return User.objects.bulk_create([
+        User(email=f"{prefix}{i}@test.com", username=f"{prefix}{i}", password=hashed,
+             role="player", is_active=False, is_approved=False)
+        for i in range(count)
+    ])
+
+
+class Club:
+    """Données et jetons partagés par les scénarios ; les pools consommés par les écritures sont dimensionnés à --requests."""
+
+    def __init__(self, options):
+        requests = options["requests"]
+        self.admin = User.objects.create_superuser(email="admin@test.com", password=PASSWORD)
+        self.roster = seed_club(
+            players=options["players"], events=options["events"], seasons=options["seasons"],
+            seed=options["seed"], password=PASSWORD, participation_rate=options["participation_rate"],
+            reports=options["reports"], admin=self.admin,
+        )
+        if not self.roster or not options["events"]:
+            raise CommandError("--players et --events doivent être supérieurs à 0.")
+        self.player = self.roster[0]
+        self.event = Event.objects.order_by("date_event").first()
+        self.participation, _ = Participation.objects.get_or_create(player=self.player, event=self.event)
+        self.stats = SeasonStats.objects.filter(player=self.player).first() or SeasonStats.objects.create(
+            player=self.player, season_year="2000-2001",
+        )
+
+        self.to_approve = _pending_users("attente", requests)
+        self.to_bulk_approve = _pending_users("vague", requests * 5)
+        doomed = _pending_users("depart", requests)
+        User.objects.filter(pk__in=[user.pk for user in doomed]).update(is_active=True, is_approved=True)
+        self.to_delete = Player.objects.bulk_create([Player(user=user) for user in doomed])
+
+        self.tokens = {}
+        for role, user in (("admin", self.admin), ("player", self.player.user)):
+            refresh = CustomTokenObtainPairSerializer.get_token(user)
+            self.tokens[role] = (str(refresh.access_token), str(refresh))
+
+    def counts(self):
+        return {
+            model.__name__: model.objects.count()
+            for model in (User, Player, Event, Participation, SeasonStats, ReportAdmin)
+        }
+
+
+def scenarios(club):
+    """
+    Libellé -> (route, rôle, fabrique(i) -> (méthode, kwargs de la route, corps, query string)).
+    Chaque route de api/urls.py doit y figurer ; les écritures consomment les pools de Club.
+    """
+    players = club.roster
+    cases = {
+        "register": ("register", None, lambda i: ("post", {}, {"email": f"inscrit{i}@test.com", "password": NEW_PASSWORD}, "")),
+        "token_obtain_pair": ("token_obtain_pair", None,
+                              lambda i: ("post", {}, {"email": players[i % len(players)].user.email, "password": PASSWORD}, "")),
+        "async_login": ("async_login", None,
+                        lambda i: ("post", {}, {"email": players[i % len(players)].user.email, "password": PASSWORD}, "")),
+        "validate_login": ("validate_login", None,
+                           lambda i: ("post", {}, {"email": players[i % len(players)].user.email, "password": PASSWORD}, "")),
+        "token_refresh": ("token_refresh", None, lambda i: ("post", {}, {"refresh": club.tokens["admin"][1]}, "")),
+        "validate_email": ("validate_email", None, lambda i: ("post", {}, {"email": f"libre{i}@test.com"}, "")),
+        "validate_password": ("validate_password", None, lambda i: ("post", {}, {"password": NEW_PASSWORD}, "")),
+        "user_update": ("user_update", "admin", lambda i: ("get", {"pk": club.player.user.pk}, None, "")),
+        "approve_user": ("approve_user", "admin",
+                         lambda i: ("post", {"user_id": club.to_approve[i].pk}, {}, "")),
+        "bulk_approve_users": ("bulk_approve_users", "admin",
+                               lambda i: ("post", {}, {"ids": [str(user.pk) for user in club.to_bulk_approve[i * 5:i * 5 + 5]]}, "")),
+        "delete_player_and_user": ("delete_player_and_user", "admin",
+                                   lambda i: ("delete", {"pk": club.to_delete[i].pk}, None, "")),
+        "admin_season_stats?season": ("admin_season_stats", "admin",
+                                      lambda i: ("get", {}, None, f"?season={club.stats.season_year}")),
+        "team_season_stats?group_by": ("team_season_stats", "admin", lambda i: ("get", {}, None, "?group_by=season")),
+        "create_season_stats": ("create_season_stats", "admin",
+                                lambda i: ("post", {}, {"player": str(club.player.pk), "season_year": f"{1000 + i}-{1001 + i}", "goals": i % 10}, "")),
+        "season_stats_detail": ("season_stats_detail", "admin", lambda i: ("get", {"pk": club.stats.pk}, None, "")),
+        "event_participations": ("event_participations", "admin", lambda i: ("get", {"event_id": club.event.pk}, None, "")),
+        "report_admin_create": ("report_admin_create", "admin",
+                                lambda i: ("post", {}, {"title": f"Rapport bench {i}", "reporter_type": "match", "content": "-"}, "")),
+        "player_participation_update": ("player_participation_update", "player",
+                                        lambda i: ("patch", {"pk": club.participation.pk}, {"will_attend": i % 2 == 0}, "")),
+        "event-detail": ("event-detail", "admin", lambda i: ("get", {"pk": club.event.pk}, None, "")),
+        "player-detail": ("player-detail", "admin", lambda i: ("get", {"pk": club.player.pk}, None, "")),
+        "player-bulk": ("player-bulk", "admin",
+                        lambda i: ("patch", {}, [{"id": str(player.pk), "jersey_number": i % 99} for player in players[:10]], "")),
+    }
+    for resource in EXPORT_RESOURCES:
+        cases[f"admin_export:{resource}"] = ("admin_export", "admin", lambda i, resource=resource: ("get", {"resource": resource}, None, ""))
+    player_routes = {"player_profile", "my_participations", "my_season_stats"}
+    names = {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern)}
+    for name in sorted(names - {route for route, _, _ in cases.values()}):
+        cases[name] = (name, "player" if name in player_routes else "admin", lambda i: ("get", {}, None, ""))
+    return cases
+
+
+class Command(BaseCommand):
+    help = (
+        "Banc de charge : génère un club synthétique sur une base jetable, appelle chaque route de "
+        "api/urls.py en parallèle et écrit p50/p95/p99, requêtes SQL par appel et débit en JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=100)
+        parser.add_argument('--seasons', type=int, default=3)
+        parser.add_argument('--participation-rate', type=float, default=0.3, help="Part des joueurs inscrits à chaque événement.")
+        parser.add_argument('--reports', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=50, help="Appels par route.")
+        parser.add_argument('--concurrency', type=int, default=4, help="Clients simultanés (threads).")
+        parser.add_argument('--warmup', type=int, default=2, help="Appels non mesurés par route de lecture.")
+        parser.add_argument('--routes', default='', help="Libellés à mesurer, séparés par des virgules (défaut : tous).")
+        parser.add_argument('--fast-hash', action='store_true', help="Hachage MD5 : isole le coût hors PBKDF2 des routes de connexion.")
+        parser.add_argument('--output', help="Fichier JSON (défaut : sortie standard).")
+
+    def handle(self, *args, **options):
+        overrides = {
+            'ALLOWED_HOSTS': ['*'],
+            # Sans limite de débit : le banc mesure les vues, pas le throttling
+            'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+        }
+        if options['fast_hash']:
+            overrides['PASSWORD_HASHERS'] = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+        with temporary_database(file_backed=True), override_settings(**overrides):
+            club = Club(options)
+            cases = scenarios(club)
+            selected = [label.strip() for label in options['routes'].split(',') if label.strip()]
+            unknown = set(selected) - set(cases)
+            if unknown:
+                raise CommandError(f"Routes inconnues : {', '.join(sorted(unknown))}. Disponibles : {', '.join(sorted(cases))}")
+
+            report = {
+                "meta": {
+                    "commit": _git_commit(),
+                    "django": django.get_version(),
+                    "python": platform.python_version(),
+                    "database": connection.vendor,
+                    "requests_per_route": options['requests'],
+                    "concurrency": options['concurrency'],
+                    "fast_hash": options['fast_hash'],
+                    "dataset": club.counts(),
+                },
+                "routes": {},
+            }
+            for label in selected or sorted(cases):
+                report["routes"][label] = self.run_route(club, *cases[label], options)
+                self.stderr.write(self.summary(label, report["routes"][label]))
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def run_route(self, club, route, role, factory, options):
+        headers = {"Authorization": f"Bearer {club.tokens[role][0]}"} if role else {}
+
+        def call(i):
+            method, kwargs, body, query = factory(i)
+            client = Client(headers=headers, raise_request_exception=False)
+            path = reverse(route, kwargs=kwargs) + query
+            queries = 0
+
+            def count(execute, sql, params, many, context):
+                nonlocal queries
+                queries += 1
+                return execute(sql, params, many, context)
+
+            try:
+                with connections['default'].execute_wrapper(count):
+                    start = time.perf_counter()
+                    if body is None:
+                        response = getattr(client, method)(path)
+                    else:
+                        response = getattr(client, method)(path, json.dumps(body), content_type="application/json")
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    elapsed = time.perf_counter() - start
+            finally:
+                connections.close_all()
+            return method.upper(), path, elapsed, queries, response.status_code
+
+        # Échauffement (lectures seulement : les écritures consomment des pools à usage unique)
+        if factory(0)[0] == "get":
+            for i in range(options['warmup']):
+                call(i)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(options['concurrency'], 1)) as pool:
+            results = list(pool.map(call, range(options['requests'])))
+        wall = time.perf_counter() - start
+
+        latencies = sorted(result[2] * 1e3 for result in results)
+        queries = [result[3] for result in results]
+        return {
+            "method": results[0][0] if results else None,
+            "path": results[0][1] if results else None,
+            "requests": len(results),
+            "status": dict(sorted(Counter(str(result[4]) for result in results).items())),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "mean": round(sum(latencies) / len(latencies), 3),
+                "max": round(latencies[-1], 3),
+            } if latencies else None,
+            "queries": {
+                "mean": round(sum(queries) / len(queries), 2),
+                "max": max(queries),
+            } if queries else None,
+            "throughput_rps": round(len(results) / wall, 2) if wall else None,
+        }
+
+    @staticmethod
+    def summary(label, result):
+        latency = result["latency_ms"] or {}
+        return (
+            f"{label:<32} {result['status']} p50 {latency.get('p50', 0):8.2f} ms | p95 {latency.get('p95', 0):8.2f} ms | "
+            f"p99 {latency.get('p99', 0):8.2f} ms | {result['queries']['mean'] if result['queries'] else 0:5.1f} requêtes | "
+            f"{result['throughput_rps'] or 0:7.1f} req/s"
+        )
@@ -0,0 +1,65 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+
+from api.synthetic import seed_club, temporary_database
+
+PASSWORD = "test1234"
+
+
+def _post(client, url, email):
+    response = client.post(url, json.dumps({"email": email, "password": PASSWORD}), content_type="application/json")
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} : {response.status_code} {response.content[:200]!r}")
+
+
+def login_today(client, email):
+    """Parcours actuel du frontend : validate-login puis auth/token/ (deux hachages)."""
+    _post(client, "/api/auth/validate-login/", email)
+    _post(client, "/api/auth/token/", email)
+
+
+def login_async(client, email):
+    """Nouvel endpoint : un seul hachage, hors de la boucle d'événements."""
+    _post(client, "/api/auth/login/", email)
+
+
+class Command(BaseCommand):
+    help = "Mesure les connexions par seconde (et par cœur) : parcours actuel contre auth/login/, sur une base jetable."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help="Connexions par scénario.")
+        parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 1, help="Clients simultanés.")
+
+    def handle(self, *args, **options):
+        logins, concurrency = options['logins'], options['concurrency']
+        cores = min(concurrency, os.cpu_count() or 1)
+
+        with temporary_database(), override_settings(ALLOWED_HOSTS=['*']):
+            roster = seed_club(players=max(logins, 1), events=0, seasons=0, password=PASSWORD)
+            emails = [player.user.email for player in roster][:logins]
+
+            for label, scenario in (("validate-login + token", login_today), ("auth/login/ (async)", login_async)):
+                def run(email, scenario=scenario):
+                    try:
+                        scenario(Client(), email)
+                    finally:
+                        connections.close_all()
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    list(pool.map(run, emails))
+                elapsed = time.perf_counter() - start
+
+                rate = len(emails) / elapsed
+                self.stdout.write(
+                    f"{label:<24} {len(emails)} connexions, {concurrency} clients | "
+                    f"{rate:6.2f} connexions/s | {rate / cores:6.2f} /s/cœur | "
+                    f"{elapsed / len(emails) * 1e3:7.1f} ms/connexion"
+                )
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast_serializers import compile_serializer
+from api.models import Event, Player, SeasonStats
+from api.prefetch import plan_queryset
+from api.serializers import EventSerializer, PlayerSerializer, SeasonStatsSerializer
+from api.synthetic import seed_club, temporary_database
+
+TARGETS = [
+    (PlayerSerializer, Player),
+    (EventSerializer, Event),
+    (SeasonStatsSerializer, SeasonStats),
+]
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Compare le coût par ligne du serializer DRF et du chemin rapide (.values()) sur une base synthétique jetable."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help="Nombre de joueurs (et d'événements) générés.")
+        parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures ; le meilleur temps est retenu.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        request = Request(APIRequestFactory().get('/api/'))
+        context = {'request': request}
+        renderer = JSONRenderer()
+
+        with temporary_database():
+            seed_club(players=rows, events=rows, seasons=1)
+
+            for serializer_class, model in TARGETS:
+                queryset = model.objects.all()
+                compiled = compile_serializer(serializer_class)
+
+                drf_time, drf_data = _best_of(repeat, lambda: serializer_class(
+                    plan_queryset(queryset, serializer_class), many=True, context=context).data)
+                fast_time, fast_data = _best_of(repeat, lambda: compiled.to_representation_many(
+                    compiled.values(queryset), context))
+
+                identical = renderer.render(drf_data) == renderer.render(fast_data)
+                count = len(drf_data)
+                self.stdout.write(
+                    f"{serializer_class.__name__:<24} {count} lignes | "
+                    f"DRF {drf_time / count * 1e6:7.1f} µs/ligne | "
+                    f"rapide {fast_time / count * 1e6:7.1f} µs/ligne | "
+                    f"x{drf_time / fast_time:4.1f} | JSON identique : {'oui' if identical else 'NON'}"
+                )
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import invalidate_models
+from api.models import Event, Participation, Player, ReportAdmin, SeasonStats, User
+from api.synthetic import SYNTHETIC_EMAILS, clear_synthetic, seed_club
+
+# Joueurs, événements, saisons, part des joueurs inscrits par événement, rapports
+SCALES = {
+    'small': dict(players=1_000, events=50, seasons=3, participation_rate=0.3, reports=100),
+    'medium': dict(players=10_000, events=200, seasons=5, participation_rate=0.2, reports=1_000),
+    'large': dict(players=50_000, events=500, seasons=5, participation_rate=0.1, reports=5_000),
+}
+MODELS = (User, Player, Event, Participation, SeasonStats, ReportAdmin)
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un club synthétique dans la base configurée (joueurs, événements, participations, "
+        "statistiques, rapports) : un seul hachage du mot de passe, bulk_create par lots, graine fixe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small', help="Volume de départ (défaut : small).")
+        parser.add_argument('--players', type=int, help="Remplace le nombre de joueurs de --scale.")
+        parser.add_argument('--events', type=int)
+        parser.add_argument('--seasons', type=int)
+        parser.add_argument('--participation-rate', type=float)
+        parser.add_argument('--reports', type=int)
+        parser.add_argument('--seed', type=int, default=0, help="Même graine, mêmes données.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--password', default='test1234', help="Mot de passe commun des comptes générés.")
+        parser.add_argument('--clear', action='store_true',
+                            help="Supprime d'abord les données déjà générées (comptes joueurN@test.com, événements, rapports).")
+
+    def handle(self, *args, **options):
+        params = dict(SCALES[options['scale']])
+        for name in params:
+            if options[name] is not None:
+                params[name] = options[name]
+
+        if options['clear']:
+            self.stdout.write(f"{clear_synthetic()} lignes générées précédemment supprimées.")
+        elif User.objects.filter(email__regex=SYNTHETIC_EMAILS).exists():
+            raise CommandError("Des comptes joueurN@test.com existent déjà : relancer avec --clear pour les remplacer.")
+
+        admin = User.objects.filter(role='admin', is_superuser=True).order_by('date_joined').first()
+        before = {model: model.objects.count() for model in MODELS}
+        start = time.perf_counter()
+        with transaction.atomic():
+            seed_club(
+                seed=options['seed'], password=options['password'], batch_size=options['batch_size'],
+                admin=admin, **params,
+            )
+        elapsed = time.perf_counter() - start
+        # bulk_create n'émet pas post_save : les réponses en cache partagé sont invalidées ici
+        invalidate_models(*MODELS)
+
+        for model in MODELS:
+            self.stdout.write(f"{model.__name__:<14} +{model.objects.count() - before[model]}")
+        self.stdout.write(self.style.SUCCESS(f"Données générées en {elapsed:.1f} s (échelle {options['scale']}, graine {options['seed']})."))
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api import querystats
+
+
+class Command(BaseCommand):
+    help = (
+        "Journal des requêtes SQL collecté par QueryStatsMiddleware sur tous les workers : "
+        "par route (requêtes SQL par requête HTTP) ou par empreinte, avec les plans EXPLAIN des requêtes lentes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--by', choices=('route', 'fingerprint'), default='route')
+        parser.add_argument('--sort', choices=querystats.SORT_KEYS, default='total')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--route', help="Limite le rapport à une route (nom dans api/urls.py).")
+        parser.add_argument('--explain', action='store_true', help="Affiche le SQL et le plan des requêtes lentes.")
+        parser.add_argument('--json', action='store_true', help="Rapport brut en JSON.")
+        parser.add_argument('--reset', action='store_true', help="Remet à zéro les statistiques de tous les workers.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            querystats.reset()
+            self.stdout.write(self.style.SUCCESS("Statistiques remises à zéro."))
+            return
+
+        data = querystats.report(by=options['by'], sort=options['sort'], limit=options['limit'], route=options['route'])
+        if options['json']:
+            self.stdout.write(json.dumps(data, indent=2, ensure_ascii=False))
+            return
+        if not data['results']:
+            self.stdout.write(f"Aucune requête enregistrée ({querystats.stats_dir()}).")
+            return
+
+        self.stdout.write(f"{data['workers']} worker(s), tri par {options['sort']}")
+        if options['by'] == 'fingerprint':
+            for row in data['results']:
+                self.write_query(row, f"routes : {', '.join(row['routes'])}", options['explain'])
+            return
+        for route in data['results']:
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{route['route']} : {route['requests']} requêtes HTTP, {route['per_request']} SQL / requête, "
+                f"{route['total_ms']:.1f} ms au total"
+            ))
+            for row in route['queries']:
+                self.write_query(row, f"{row['per_request']} / requête", options['explain'])
+
+    def write_query(self, row, detail, explain):
+        self.stdout.write(
+            f"  {row['count']:>7} x  total {row['total_ms']:>9.1f} ms  moy. {row['mean_ms']:>7.2f} ms  "
+            f"max {row['max_ms']:>8.2f} ms  ({detail})"
+        )
+        self.stdout.write(f"      {row['fingerprint'][:160]}")
+        if explain and row['explain']:
+            self.stdout.write(f"      SQL : {row['sql']}")
+            for line in row['explain']:
+                self.stdout.write(self.style.WARNING(f"      | {line}"))
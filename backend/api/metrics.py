@@ -0,0 +1,275 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from .snapshots import pid_alive, read_snapshot, read_snapshots, snapshot_lock, snapshot_path, write_snapshot
+
+SNAPSHOT_PREFIX = "metrics"
+RETIRED = "retired"  # metrics-retired.json : totaux cumulés des workers arrêtés
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Nom -> (aide, étiquettes) ; seules ces métriques peuvent être incrémentées
+COUNTERS = {
+    "api_db_queries_total": ("Requêtes SQL exécutées, par route.", ("route",)),
+    "api_db_query_duration_seconds_total": ("Temps passé en base, par route.", ("route",)),
+    "api_cache_requests_total": ("Lectures de cache (response, query, jwt_user) par résultat hit / miss.", ("cache", "result")),
+    "api_login_attempts_total": ("Tentatives de connexion par route et issue (success, failure, throttled).", ("route", "outcome")),
+}
+HISTOGRAMS = {
+    "api_http_request_duration_seconds": ("Durée des requêtes HTTP par route, méthode et code de statut.", ("route", "method", "status")),
+}
+GAUGES = {
+    "api_workers": "Workers en vie ayant publié leurs métriques.",
+    "api_workers_busy": "Workers en vie qui traitaient au moins une requête à leur dernière publication.",
+    "api_http_requests_in_flight": "Requêtes HTTP en cours, tous workers confondus (à la dernière publication de chacun).",
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def metrics_dir():
+    return Path(_setting("METRICS_DIR", Path(tempfile.gettempdir()) / "metrics"))
+
+
+def buckets():
+    return tuple(_setting("METRICS_LATENCY_BUCKETS", DEFAULT_BUCKETS))
+
+
+# ------------------------
+# Registre du processus
+# ------------------------
+
+class Registry:
+    """
+    Compteurs et histogrammes du worker, recopiés toutes les METRICS_FLUSH_INTERVAL secondes
+    dans METRICS_DIR/metrics-<pid>.json par un thread du worker (démarré après le fork de gunicorn).
+    Chaque processus a son identifiant d'instance : un fichier laissé par un ancien processus
+    de même pid est versé dans metrics-retired.json avant la première écriture, pas écrasé.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.in_flight = 0
+        self.dirty = False
+        self.flusher_pid = None
+        self.instance = f"{os.getpid()}-{time.time_ns()}"
+        self.owns_file = False
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(str(labels[label]) for label in COUNTERS[name][1]))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+            self.dirty = True
+        self._ensure_flusher()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(str(labels[label]) for label in HISTOGRAMS[name][1]))
+        bounds = buckets()
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(bounds), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(bounds):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+            self.dirty = True
+        self._ensure_flusher()
+
+    def request_started(self):
+        with self.lock:
+            self.in_flight += 1
+            self.dirty = True
+        self._ensure_flusher()
+
+    def request_finished(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.dirty = True
+        self._ensure_flusher()
+
+    def snapshot(self):
+        with self.lock:
+            self.dirty = False
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, list(labels), dict(data, buckets=list(data["buckets"]))] for (name, labels), data in self.histograms.items()],
+                "in_flight": self.in_flight,
+                "buckets": list(buckets()),
+                "instance": self.instance,
+                "updated": time.time(),
+            }
+
+    def flush(self):
+        directory = metrics_dir()
+        if not self.owns_file:
+            with snapshot_lock(directory, SNAPSHOT_PREFIX):
+                path = snapshot_path(directory, SNAPSHOT_PREFIX)
+                previous = read_snapshot(path)
+                if previous is not None and previous.get("instance") != self.instance:
+                    _retire(directory, path, previous)  # pid réutilisé : fichier d'un processus mort
+                write_snapshot(directory, SNAPSHOT_PREFIX, self.snapshot())
+                self.owns_file = True
+            return
+        write_snapshot(directory, SNAPSHOT_PREFIX, self.snapshot())
+
+    def _ensure_flusher(self):
+        if self.flusher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.flusher_pid == os.getpid():
+                return
+            self.flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(_setting("METRICS_FLUSH_INTERVAL", 5))
+            if self.dirty:
+                try:
+                    self.flush()
+                except OSError:
+                    pass  # répertoire indisponible : nouvel essai au prochain passage
+
+
+registry = Registry()
+# Un worker forké repart de zéro : les valeurs du parent sont déjà dans son propre fichier
+os.register_at_fork(after_in_child=registry.reset)
+
+
+@atexit.register
+def _flush_at_exit():
+    if registry.counters or registry.histograms:
+        registry.flush()
+
+
+def inc(name, value=1, **labels):
+    registry.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    registry.observe(name, value, **labels)
+
+
+def cache_lookup(cache, hit):
+    registry.inc("api_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+# ------------------------
+# Agrégation et format texte Prometheus
+# ------------------------
+
+def _merge(counters, histograms, data):
+    for name, labels, value in data.get("counters", []):
+        key = (name, tuple(labels))
+        counters[key] = counters.get(key, 0) + value
+    if tuple(data.get("buckets", ())) != buckets():
+        return  # bornes modifiées depuis l'écriture du fichier : histogrammes incomparables
+    for name, labels, histogram in data.get("histograms", []):
+        key = (name, tuple(labels))
+        merged = histograms.setdefault(key, {"buckets": [0] * len(buckets()), "sum": 0.0, "count": 0})
+        merged["buckets"] = [a + b for a, b in zip(merged["buckets"], histogram["buckets"])]
+        merged["sum"] += histogram["sum"]
+        merged["count"] += histogram["count"]
+
+
+def _retire(directory, path, data):
+    """Verse le fichier d'un processus mort dans metrics-retired.json puis le supprime (sous snapshot_lock)."""
+    counters, histograms = {}, {}
+    _merge(counters, histograms, read_snapshot(snapshot_path(directory, SNAPSHOT_PREFIX, RETIRED)) or {})
+    _merge(counters, histograms, data)
+    write_snapshot(directory, SNAPSHOT_PREFIX, {
+        "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [[name, list(labels), histogram] for (name, labels), histogram in histograms.items()],
+        "buckets": list(buckets()),
+        "updated": time.time(),
+    }, pid=RETIRED)
+    path.unlink()
+
+
+def retire_dead_workers():
+    """Regroupe les fichiers des workers arrêtés : un seul fichier au lieu d'un par pid ayant existé."""
+    directory = metrics_dir()
+    if not any(not pid_alive(pid) for pid, _ in read_snapshots(directory, SNAPSHOT_PREFIX)):
+        return
+    with snapshot_lock(directory, SNAPSHOT_PREFIX):
+        # Relu sous le verrou : un nouveau processus de même pid ne peut pas écrire entre-temps
+        for pid, data in read_snapshots(directory, SNAPSHOT_PREFIX):
+            if not pid_alive(pid):
+                _retire(directory, snapshot_path(directory, SNAPSHOT_PREFIX, pid), data)
+
+
+def collect():
+    """
+    Somme des fichiers de tous les workers et des totaux des workers arrêtés (metrics-retired.json) :
+    les compteurs ne reculent pas quand gunicorn recycle un worker ; les jauges ne comptent que les vivants.
+    """
+    registry.flush()
+    retire_dead_workers()
+    directory = metrics_dir()
+    counters, histograms = {}, {}
+    _merge(counters, histograms, read_snapshot(snapshot_path(directory, SNAPSHOT_PREFIX, RETIRED)) or {})
+    workers = busy = in_flight = 0
+    for pid, data in read_snapshots(directory, SNAPSHOT_PREFIX):
+        _merge(counters, histograms, data)
+        if pid_alive(pid):
+            workers += 1
+            busy += data.get("in_flight", 0) > 0
+            in_flight += data.get("in_flight", 0)
+    gauges = {"api_workers": workers, "api_workers_busy": busy, "api_http_requests_in_flight": in_flight}
+    return counters, histograms, gauges
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render():
+    """Toutes les métriques au format texte d'exposition Prometheus 0.0.4."""
+    counters, histograms, gauges = collect()
+    lines = []
+    for name, (help_text, label_names) in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (metric, values), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_labels(label_names, values)} {_number(value)}")
+    for name, (help_text, label_names) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (metric, values), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets(), histogram["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(label_names, values, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(label_names, values, [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"{name}_sum{_labels(label_names, values)} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_labels(label_names, values)} {histogram['count']}")
+    for name, help_text in GAUGES.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {gauges[name]}"]
+    return "\n".join(lines) + "\n"
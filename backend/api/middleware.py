@@ -0,0 +1,216 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics, querystats
+from .performance import RequestTimings, collecting, route_name
+from .throttling import RATE_LIMIT_ATTR
+
+performance_logger = logging.getLogger('api.performance')
+
+# Routes de connexion suivies par api_login_attempts_total (api/urls.py)
+LOGIN_ROUTES = {'token_obtain_pair', 'async_login'}
+
+
+def wrapping_connections(wrapper):
+    """execute_wrapper installé sur toutes les connexions (à utiliser avec with)."""
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+    return stack
+
+
+def on_response_end(response, wrapper, done):
+    """
+    Appelle done() quand la réponse est terminée : tout de suite, ou après le dernier morceau
+    d'une réponse en streaming (exports), dont les requêtes SQL passent aussi par wrapper.
+    """
+    if not response.streaming or response.is_async:
+        done()
+        return
+
+    def stream(chunks):
+        try:
+            iterator = iter(chunks)
+            while True:
+                with wrapping_connections(wrapper):
+                    chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            done()
+
+    response.streaming_content = stream(response.streaming_content)
+
+
+class RateLimitHeadersMiddleware:
+    """
+    En-têtes RateLimit-Limit / -Remaining / -Reset (secondes) sur les vues limitées
+    (api/throttling.py), y compris sur les réponses 429, pour que les clients ralentissent d'eux-mêmes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        state = getattr(request, RATE_LIMIT_ATTR, None)
+        if state is not None:
+            limit, remaining, reset = state
+            response['RateLimit-Limit'] = str(limit)
+            response['RateLimit-Remaining'] = str(remaining)
+            response['RateLimit-Reset'] = str(reset)
+        return response
+
+
+class PerformanceMiddleware:
+    """
+    Mesure, sur une fraction PERFORMANCE_SAMPLE_RATE des requêtes : nombre et durée des requêtes SQL,
+    sérialisation, rendu JSON, vue et total. Publié en en-tête Server-Timing (PERFORMANCE_SERVER_TIMING)
+    et en une ligne JSON sur le logger 'api.performance', par nom de route (api/urls.py).
+    Une requête plus longue que PERFORMANCE_SLOW_MS est journalisée en WARNING, même hors échantillon
+    (durée totale seule). À placer en tête de MIDDLEWARE pour que 'total' couvre les autres middlewares.
+    """
+    view_start_attr = '_performance_view_start'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def sample_rate():
+        return getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 1.0)
+
+    @staticmethod
+    def slow_seconds():
+        slow_ms = getattr(settings, 'PERFORMANCE_SLOW_MS', None)
+        return None if slow_ms is None else slow_ms / 1e3
+
+    def __call__(self, request):
+        rate = self.sample_rate()
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            slow = self.slow_seconds()
+            if slow is None:
+                return self.get_response(request)
+            start = time.perf_counter()
+            response = self.get_response(request)
+            elapsed = time.perf_counter() - start
+            if elapsed >= slow:
+                timings = RequestTimings()
+                timings.add('total', elapsed)
+                self.log(request, response, timings, sampled=False)
+            return response
+
+        timings = RequestTimings()
+        start = time.perf_counter()
+        with collecting(timings), wrapping_connections(timings.record_query):
+            response = self.get_response(request)
+        end = time.perf_counter()
+        timings.add('total', end - start)
+        view_start = getattr(request, self.view_start_attr, None)
+        if view_start is not None:
+            timings.add('view', end - view_start)
+
+        if getattr(settings, 'PERFORMANCE_SERVER_TIMING', True):
+            response['Server-Timing'] = self.server_timing(timings)
+        self.log(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        setattr(request, self.view_start_attr, time.perf_counter())
+
+    @staticmethod
+    def server_timing(timings):
+        metrics = [f'db;dur={timings.phases["db"] * 1e3:.1f};desc="{timings.queries} SQL"']
+        for phase in ('serialize', 'render', 'view', 'total'):
+            if phase in timings.phases:
+                metrics.append(f'{phase};dur={timings.phases[phase] * 1e3:.1f}')
+        return ', '.join(metrics)
+
+    @classmethod
+    def log(cls, request, response, timings, sampled=True):
+        record = {
+            'route': route_name(request),
+            'method': request.method,
+            'status': response.status_code,
+            **({'db_queries': timings.queries} if sampled else {}),
+            **{f'{phase}_ms': round(seconds * 1e3, 2) for phase, seconds in sorted(timings.phases.items())},
+        }
+        slow = cls.slow_seconds()
+        level = logging.WARNING if slow is not None and timings.phases['total'] >= slow else logging.INFO
+        performance_logger.log(level, json.dumps(record, ensure_ascii=False), extra={'performance': record})
+
+
+class QueryStatsMiddleware:
+    """
+    Journal des requêtes SQL (api/querystats.py) : agrégats par route et par empreinte, EXPLAIN des requêtes
+    au-dessus de QUERY_STATS_SLOW_MS. Les réponses en streaming (exports) sont suivies jusqu'au dernier morceau.
+    Placé avant PerformanceMiddleware : les EXPLAIN ne comptent pas dans les mesures de la requête.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = querystats.QueryCollector()
+        with wrapping_connections(collector):
+            response = self.get_response(request)
+        on_response_end(response, collector, lambda: querystats.process_stats.record(route_name(request) or '-', collector))
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Métriques Prometheus (api/metrics.py) de chaque requête : durée par route / méthode / statut,
+    requêtes SQL, issue des connexions, requêtes en cours. À placer en tête de MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0, 0.0]
+
+        def count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                queries[1] += time.perf_counter() - start
+
+        metrics.registry.request_started()
+        start = time.perf_counter()
+        try:
+            with wrapping_connections(count_query):
+                response = self.get_response(request)
+        except BaseException:
+            metrics.registry.request_finished()
+            raise
+
+        def done():
+            metrics.registry.request_finished()
+            route = route_name(request) or '-'
+            metrics.observe(
+                'api_http_request_duration_seconds', time.perf_counter() - start,
+                route=route, method=request.method, status=response.status_code,
+            )
+            if queries[0]:
+                metrics.inc('api_db_queries_total', queries[0], route=route)
+                metrics.inc('api_db_query_duration_seconds_total', queries[1], route=route)
+            if route in LOGIN_ROUTES:
+                metrics.inc('api_login_attempts_total', route=route, outcome=self.login_outcome(response.status_code))
+
+        on_response_end(response, count_query, done)
+        return response
+
+    @staticmethod
+    def login_outcome(status_code):
+        if status_code == 429:
+            return 'throttled'
+        return 'success' if 200 <= status_code < 300 else 'failure'
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_alter_event_opponent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_cancelled', 'date_event'], name='event_cancelled_date_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_event_cancelled_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryCacheVersion',
+            fields=[
+                ('table', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_query_cache_version'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_cancelled_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_cancelled', False)), fields=['-date_event', 'id'], name='event_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['team_name', 'created_at', 'id'], name='player_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportadmin',
+            index=models.Index(fields=['-created_at', 'id'], name='report_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonstats',
+            index=models.Index(fields=['-season_year', 'id'], name='seasonstats_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_approved', True), models.Q(('role', 'admin'), _negated=True)), fields=['email', 'id'], name='user_approved_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_approved', False), models.Q(('role', 'admin'), _negated=True)), fields=['email', 'id'], name='user_pending_list_idx'),
+        ),
+    ]
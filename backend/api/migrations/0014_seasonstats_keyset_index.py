@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_index_audit'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='seasonstats',
+            name='seasonstats_season_idx',
+        ),
+        migrations.AddIndex(
+            model_name='seasonstats',
+            index=models.Index(fields=['-season_year', 'player'], name='seasonstats_season_player_idx'),
+        ),
+    ]
@@ -1,8 +1,165 @@
+import hashlib
+
 from django.db import models
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .fast_serializers import compile_serializer
+from .performance import timed
+from .prefetch import plan_queryset
+from .sparse import sparse_params
+
 
 class TimestampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+
+def _keyset_ordering(view):
+    get_ordering = getattr(view.paginator, 'get_ordering', None)
+    return tuple(get_ordering(view)) if get_ordering else ()
+
+
+class AutoPrefetchMixin:
+    """
+    Applique automatiquement select_related / prefetch_related selon les champs
+    que le serializer de la vue lit (voir api/prefetch.py) : plus de N+1 par ligne.
+    Avec ?fields= / ?omit=, les colonnes inutiles sont en plus différées par only().
+    """
+    # Branché sur filter_queryset (appelé par list() et get_object()) pour rester actif
+    # même quand la vue redéfinit get_queryset.
+    def filter_queryset(self, queryset):
+        fields, omit = sparse_params(self.request)
+        return plan_queryset(
+            super().filter_queryset(queryset), self.get_serializer_class(),
+            fields, omit, _keyset_ordering(self),
+        )
+
+
+class FastListMixin:
+    """
+    list() en lecture seule à partir de lignes .values() passées dans un serializer compilé
+    (api/fast_serializers.py). Même JSON que le serializer DRF, sans instancier de modèles.
+    Repli automatique sur le chemin DRF si le serializer contient un champ non supporté.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        fields, omit = sparse_params(request)
+        compiled = compile_serializer(self.get_serializer_class(), fields, omit) if self.fast_list else None
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        # Les champs d'ordre de la pagination par clé doivent figurer dans chaque ligne
+        ordering = [field.lstrip('-') for field in _keyset_ordering(self)]
+        rows = compiled.values(self.filter_queryset(self.get_queryset()), extra=ordering)
+
+        page = self.paginate_queryset(rows)
+        context = self.get_serializer_context()
+        with timed('serialize'):
+            data = compiled.to_representation_many(rows if page is None else page, context)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class NotModified(Exception):
+    """Levée depuis initial() pour court-circuiter la vue : la réponse 304/412 est déjà prête."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    GET conditionnel (If-None-Match / If-Modified-Since). Les validateurs viennent d'une
+    sonde MAX(updated_at) / COUNT : une ressource inchangée renvoie 304 sans requête
+    principale ni sérialisation. L'ETag couvre aussi l'URL complète, l'utilisateur et le format.
+    Une réponse servie par le cache des réponses (api/cache.py) n'a pas de sonde : l'ETag vient
+    de la version de l'entrée, et le 304 est décidé après la lecture du cache.
+    """
+    # Colonnes date de modification agrégées (ex. 'user__updated_at' pour un serializer imbriqué)
+    conditional_timestamp_fields = ('updated_at',)
+    # Last-Modified seulement pour une ressource unique : une suppression dans une liste ne change pas le MAX
+    conditional_last_modified = False
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_conditional_probe(self):
+        aggregates = {f'last_{index}': Max(field) for index, field in enumerate(self.conditional_timestamp_fields)}
+        row = self.get_conditional_queryset().order_by().aggregate(count=Count('pk'), **aggregates)
+        count = row.pop('count')
+        return max(filter(None, row.values()), default=None), count
+
+    def get_conditional_etag(self, request, last_modified, version):
+        # version : COUNT de la sonde, ou version de l'entrée du cache des réponses
+        raw = '|'.join([
+            request.get_full_path(),
+            str(getattr(request.user, 'pk', '') or ''),
+            getattr(request, 'accepted_media_type', '') or '',
+            last_modified.isoformat() if last_modified else '',
+            str(version),
+        ])
+        return 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+    def serves_from_cache(self, request):
+        """Vrai si la méthode passe par cache_response (ou CachedListMixin.list)."""
+        handler = getattr(self, request.method.lower(), None)
+        if getattr(handler, 'response_cache', False):
+            return True
+        parent = getattr(super(), 'serves_from_cache', None)
+        return bool(parent and parent(request))
+
+    def initial(self, request, *args, **kwargs):
+        # Après authentification et permissions : jamais de 304 pour une requête refusée
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ('GET', 'HEAD') or self.serves_from_cache(request):
+            return
+
+        last_modified, count = self.get_conditional_probe()
+        if not self.conditional_last_modified:
+            last_modified = None
+        etag = self.get_conditional_etag(request, last_modified, count)
+        self._validators = (etag, last_modified)
+
+        response = get_conditional_response(
+            request, etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_validators', None)
+        version = getattr(self, 'response_cache_version', None)
+        if validators is None and version is not None and response.status_code == 200:
+            etag = self.get_conditional_etag(request, None, f'cache:{version}')
+            validators = (etag, None)
+            response = get_conditional_response(request, etag=etag, response=response)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            # Le navigateur garde la réponse mais revalide à chaque fois ; propre à l'utilisateur
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+        return response
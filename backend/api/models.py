@@ -1,6 +1,7 @@
 import re
 import uuid
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.base_user import BaseUserManager
 from django.core.exceptions import PermissionDenied, ValidationError
@@ -8,6 +9,7 @@ from django.utils import timezone
 
 # from .managers import UserManager
 from .mixins import TimestampedModel
+from .querycache import CachedQuerySet
 
 # -------------------------------
 # Custom User Manager
@@ -104,6 +106,17 @@ class User(AbstractUser, TimestampedModel):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['email']
+        indexes = [
+            # Listes approuvés / en attente (hors admins), parcourues dans l'ordre de la pagination
+            models.Index(
+                fields=['email', 'id'], condition=Q(is_approved=True) & ~Q(role='admin'),
+                name='user_approved_list_idx',
+            ),
+            models.Index(
+                fields=['email', 'id'], condition=Q(is_approved=False) & ~Q(role='admin'),
+                name='user_pending_list_idx',
+            ),
+        ]
         permissions = [
             ("can_approve_users", "Peut approuver les comptes utilisateurs"),
         ]
@@ -125,6 +138,8 @@ class Player(TimestampedModel):
     jersey_number = models.PositiveIntegerField(null=True, blank=True)
     is_available = models.BooleanField(default=True)
 
+    objects = CachedQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if self.user.role != "player":
             raise ValueError("Le profil joueur ne peut être créé que pour les utilisateurs ayant le rôle 'player'.")
@@ -134,6 +149,10 @@ class Player(TimestampedModel):
         verbose_name = 'Player'
         verbose_name_plural = 'Players'
         ordering = ['team_name', 'jersey_number', 'user__email']
+        indexes = [
+            # Ordre de la pagination par clé de admin/players/
+            models.Index(fields=['team_name', 'created_at', 'id'], name='player_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.email}"
@@ -200,6 +219,14 @@ class Event(TimestampedModel):
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['-date_event']
+        indexes = [
+            # Fil des événements : index partiel (SQLite n'utilise pas un index composite
+            # pour « NOT is_cancelled »), dans l'ordre de la pagination par clé
+            models.Index(
+                fields=['-date_event', 'id'], condition=Q(is_cancelled=False),
+                name='event_upcoming_idx',
+            ),
+        ]
         permissions = [
             ("can_manage_events", "Can create, update, delete events"),
         ]
@@ -250,6 +277,9 @@ class ReportAdmin(TimestampedModel):
         verbose_name = 'Report Admin'
         verbose_name_plural = 'Reports Admin'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='report_keyset_idx'),
+        ]
 
     def __str__(self):
         reporter_email = self.created_by_admin.email if self.created_by_admin else "Unknown"
@@ -269,9 +299,29 @@ class SeasonStats(TimestampedModel):
     red_cards = models.PositiveIntegerField(default=0)
     notes_moyenne_saison = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
 
+    objects = CachedQuerySet.as_manager()
+
     class Meta:
         unique_together = ('player', 'season_year')
         ordering = ['-season_year', 'player__user__email']
+        indexes = [
+            # Filtre par saison et début de l'ordre de la pagination par clé ; l'email (table user)
+            # ne peut pas entrer dans un index de cette table : player_id sert la jointure qui le lit
+            models.Index(fields=['-season_year', 'player'], name='seasonstats_season_player_idx'),
+        ]
 
     def __str__(self):
         return f"{self.player.user.get_full_name() or self.player.user.email} - Saison {self.season_year}"
+
+
+# -------------------------------
+# Versions du cache de requêtes (api/querycache.py)
+# -------------------------------
+
+class QueryCacheVersion(models.Model):
+    """Compteur par table, incrémenté à chaque écriture : invalide les résultats en cache de tous les workers."""
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
@@ -0,0 +1,195 @@
+import base64
+import datetime
+import decimal
+import json
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['values', 'reverse'])
+
+
+def _encode_value(value):
+    # Précision complète : un curseur tronqué (ms) sauterait ou répéterait des lignes
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+def _position_value(item, field):
+    """Valeur d'un champ d'ordre pour une instance (chemins 'a__b' suivis) ou une ligne .values()."""
+    if isinstance(item, dict):
+        return item[field]
+    for attr in field.split('__'):
+        item = getattr(item, attr)
+    return getattr(item, 'pk', item)
+
+
+def _model_field(model, path):
+    """Champ désigné par un chemin d'ordre ('user__email'), relations suivies ; 'pk' = clé primaire."""
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par clé (keyset) sur l'ordre de la vue + l'id UUID.
+
+    Aucun COUNT(*) ni OFFSET : chaque page est un `WHERE (ordre) > (dernière ligne) LIMIT n`,
+    le coût reste donc constant quelle que soit la profondeur de la page.
+    La vue choisit son ordre via `keyset_ordering` (ex. ('-date_event', 'id')).
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    default_ordering = ('-created_at', 'id')
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor.reverse)
+
+        ordering = [self._flip(field) for field in self.ordering] if self.reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            if len(cursor.values) != len(ordering):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                # Valeurs converties par leur champ : un curseur modifié à la main donne 404, pas 500
+                values = [
+                    _model_field(queryset.model, field.lstrip('-')).to_python(value)
+                    for field, value in zip(self.ordering, cursor.values)
+                ]
+                queryset = queryset.filter(self._keyset_filter(ordering, values))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Curseur de pagination renvoyé par `next` / `previous`.",
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f"Nombre de résultats par page (max {self.max_page_size}).",
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, view):
+        ordering = tuple(getattr(view, 'keyset_ordering', None) or self.default_ordering)
+        # L'id garantit un ordre total, indispensable pour ne jamais sauter de ligne
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering += ('id',)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return Cursor(values=list(payload['v']), reverse=bool(payload.get('r')))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item, reverse):
+        values = [_encode_value(_position_value(item, field.lstrip('-'))) for field in self.ordering]
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _keyset_filter(ordering, values):
+        """(a, b) > (x, y) décliné en ((a > x) OU (a = x ET b > y)), selon le sens de chaque champ."""
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': values[i]})
+            for previous_field, previous_value in zip(ordering[:i], values[:i]):
+                term &= Q(**{previous_field.lstrip('-'): previous_value})
+            condition |= term
+        return condition
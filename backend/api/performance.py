@@ -0,0 +1,80 @@
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Durées cumulées (secondes) par phase d'une requête échantillonnée, et requêtes SQL."""
+
+    def __init__(self):
+        self.phases = defaultdict(float)
+        self.queries = 0
+        self._depth = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] += seconds
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.phases['db'] += time.perf_counter() - start
+
+
+def route_name(request):
+    """Nom de la route résolue (api/urls.py), à défaut le nom de la vue ; None si l'URL n'a pas été résolue."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    return match.url_name or match.view_name
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def collecting(timings):
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    """Chronomètre une phase de la requête en cours ; sans effet hors requête échantillonnée."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+class TimedRepresentationMixin:
+    """
+    Temps de sérialisation (phase 'serialize') : seul le serializer le plus externe est chronométré,
+    les serializers imbriqués sont déjà compris dans sa durée.
+    """
+
+    def to_representation(self, instance):
+        timings = _current.get()
+        if timings is None or timings._depth:
+            return super().to_representation(instance)
+        timings._depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings._depth -= 1
+            timings.add('serialize', time.perf_counter() - start)
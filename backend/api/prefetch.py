@@ -0,0 +1,163 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from .sparse import parse_field_spec, prune_fields
+
+
+class QueryPlan:
+    """
+    Relations à joindre (select_related) ou à précharger (prefetch_related) pour un serializer,
+    et colonnes réellement lues (pour only()).
+    """
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.columns = set()
+        # Faux dès qu'un champ lit une valeur que le planificateur ne sait pas rattacher à une colonne
+        self.deferrable = True
+
+    def apply(self, queryset, defer=False):
+        defer = defer and self.deferrable and self.columns
+        if defer:
+            # Jointures héritées du queryset de la vue retirées : une relation jointe dont only()
+            # ne garde aucune colonne lève FieldError (à la fois différée et traversée)
+            queryset = queryset.select_related(None)
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+        if defer:
+            queryset = queryset.only(*sorted(self.columns))
+        return queryset
+
+
+def _add_path(plan, model, attrs):
+    """
+    Suit un chemin d'attributs ('player', 'user', 'email') depuis le modèle racine.
+    Chemin de FK / OneToOne : select_related ; dès qu'une relation multiple est traversée : prefetch_related.
+    """
+    path = []
+    many = False
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break  # propriété ou méthode : rien à joindre au-delà
+        if not field.is_relation:
+            break
+        path.append(attr)
+        many = many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    if path:
+        target = plan.prefetch_related if many else plan.select_related
+        target.add('__'.join(path))
+
+
+def _add_column(plan, model, attrs, relation_ok=False):
+    """
+    Colonne lue au bout du chemin, pour only(). Les colonnes derrière une relation multiple
+    sont laissées au prefetch ; une propriété ou un objet lié complet rend le plan non réductible.
+    """
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            plan.deferrable = False
+            return
+        if field.many_to_many or field.one_to_many:
+            return
+        last = index == len(attrs) - 1
+        if field.is_relation and not last:
+            model = field.related_model
+            continue
+        if field.is_relation and not relation_ok:
+            plan.deferrable = False
+            return
+        if not last:
+            plan.deferrable = False
+            return
+        plan.columns.add('__'.join(attrs))
+
+
+def _plan_serializer(plan, serializer, model, prefix=()):
+    dependencies = getattr(getattr(serializer, 'Meta', None), 'field_dependencies', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        # Champs calculés (SerializerMethodField, propriétés) : dépendances déclarées dans Meta
+        if name in dependencies:
+            for dependency in dependencies[name]:
+                path = prefix + tuple(dependency.split('__'))
+                _add_path(plan, model, path)
+                _add_column(plan, model, path)
+            continue
+
+        attrs = tuple(field.source_attrs)
+        if not attrs:
+            plan.deferrable = False
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            # Serializer imbriqué : on joint la relation puis on planifie ses propres champs
+            _add_path(plan, model, prefix + attrs)
+            _add_nested_pk(plan, model, prefix + attrs)
+            _plan_serializer(plan, field, model, prefix + attrs)
+            continue
+
+        if isinstance(field, serializers.RelatedField) and len(attrs) == 1 and field.use_pk_only_optimization():
+            # seule la clé étrangère (<champ>_id) est lue : pas de jointure
+            _add_column(plan, model, prefix + attrs, relation_ok=True)
+            continue
+
+        _add_path(plan, model, prefix + attrs)
+        _add_column(plan, model, prefix + attrs)
+
+
+def _add_nested_pk(plan, model, attrs):
+    """only() refuse une relation jointe dont aucune colonne n'est chargée : on garde au moins sa clé."""
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return
+        if not field.is_relation or field.many_to_many or field.one_to_many:
+            return
+        model = field.related_model
+    plan.columns.add('__'.join(attrs + (model._meta.pk.name,)))
+
+
+@lru_cache(maxsize=256)
+def plan_for_serializer(serializer_class, fields='', omit='', ordering=()):
+    """
+    Plan calculé une seule fois par classe de serializer et par forme demandée
+    (?fields= / ?omit=, voir api/sparse.py). Les champs d'ordre restent chargés.
+    """
+    plan = QueryPlan()
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is not None:
+        serializer = prune_fields(serializer_class(), parse_field_spec(fields), parse_field_spec(omit))
+        _plan_serializer(plan, serializer, model)
+        for field in ordering:
+            path = tuple(field.lstrip('-').split('__'))
+            if len(path) > 1:
+                _add_path(plan, model, path)
+            _add_column(plan, model, path)
+    # select_related('a__b') couvre déjà 'a'
+    plan.select_related = {
+        path for path in plan.select_related
+        if not any(other.startswith(path + '__') for other in plan.select_related)
+    }
+    return plan
+
+
+def plan_queryset(queryset, serializer_class, fields='', omit='', ordering=()):
+    """Jointures du serializer ; only() en plus quand une forme réduite est demandée."""
+    plan = plan_for_serializer(serializer_class, fields, omit, tuple(ordering))
+    return plan.apply(queryset, defer=bool(fields or omit))
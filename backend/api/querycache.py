@@ -0,0 +1,183 @@
+import functools
+import hashlib
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, transaction
+from django.db.models import F
+
+from .metrics import cache_lookup
+
+_MISSING = object()
+
+
+def _settings():
+    return (
+        caches[getattr(settings, "QUERY_CACHE_ALIAS", "default")],
+        getattr(settings, "QUERY_CACHE_TIMEOUT", 300),
+        getattr(settings, "QUERY_CACHE_VERSION_TTL", 1.0),
+    )
+
+
+# ------------------------
+# Versions par table (api.QueryCacheVersion), partagées par tous les workers
+# ------------------------
+class _VersionMemo:
+    """Versions lues en base, gardées QUERY_CACHE_VERSION_TTL secondes dans le processus."""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, tables, ttl):
+        now = time.monotonic()
+        with self._lock:
+            known = {table: entry for table, entry in self._versions.items() if table in tables and entry[1] > now}
+        missing = [table for table in tables if table not in known]
+        if missing:
+            Version = apps.get_model("api", "QueryCacheVersion")
+            read = dict(Version.objects.filter(table__in=missing).values_list("table", "version"))
+            fresh = {table: (read.get(table, 0), now + ttl) for table in missing}
+            with self._lock:
+                self._versions.update(fresh)
+            known.update(fresh)
+        return [known[table][0] for table in tables]
+
+    def forget(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions.pop(table, None)
+
+
+version_memo = _VersionMemo()
+
+
+def _bump(tables, using):
+    Version = apps.get_model("api", "QueryCacheVersion")
+    tables = sorted(tables)
+    versions = Version.objects.using(using)
+    # Lignes créées à la première écriture ; UPDATE relatif : sûr entre workers concurrents
+    versions.bulk_create([Version(table=table) for table in tables], ignore_conflicts=True)
+    versions.filter(table__in=tables).update(version=F("version") + 1)
+    version_memo.forget(tables)
+
+
+def invalidate_tables(*tables, using="default"):
+    """
+    Incrémente la version des tables, au commit de la transaction en cours (une seule fois
+    par transaction, quel que soit le nombre d'écritures) ou tout de suite hors transaction.
+    """
+    connection = connections[using]
+    version_memo.forget(tables)
+    if not connection.in_atomic_block:
+        _bump(tables, using)
+        return
+
+    pending = getattr(connection, "_query_cache_pending", None)
+    # Un rollback efface les callbacks on_commit : le lot en attente n'est valable que s'il y figure encore
+    if pending is None or not any(entry[1] is pending[1] for entry in connection.run_on_commit):
+        flush = functools.partial(_flush, connection, using)
+        pending = connection._query_cache_pending = (set(), flush)
+        transaction.on_commit(flush, using=using)
+    pending[0].update(tables)
+
+
+def _flush(connection, using):
+    tables, _ = connection._query_cache_pending
+    connection._query_cache_pending = None
+    _bump(tables, using)
+
+
+def invalidate_query_cache(*models_):
+    invalidate_tables(*(model._meta.db_table for model in models_))
+
+
+@functools.lru_cache(maxsize=1)
+def _table_names():
+    """(tables de tous les modèles, tables suivies = modèles dont le manager renvoie un CachedQuerySet)."""
+    every, tracked = set(), set()
+    for model in apps.get_models():
+        every.add(model._meta.db_table)
+        if issubclass(getattr(model._default_manager, "_queryset_class", object), CachedQuerySet):
+            tracked.add(model._meta.db_table)
+    return every, tracked
+
+
+# ------------------------
+# QuerySet
+# ------------------------
+class CachedQuerySet(models.QuerySet):
+    """
+    QuerySet dont les résultats peuvent être mis en cache avec .cached(). Clé : SQL compilé,
+    paramètres, forme du résultat et version de chaque table lue. Ne met en cache que les requêtes
+    qui ne lisent que des tables suivies, jamais dans une transaction ; les écritures passées
+    par ce QuerySet ou par save()/delete() (api/signals.py) incrémentent la version.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._query_cache_timeout = None
+
+    def cached(self, timeout=None):
+        clone = self._chain()
+        clone._query_cache_timeout = _settings()[1] if timeout is None else timeout
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._query_cache_timeout = self._query_cache_timeout
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is None and self._query_cache_timeout is not None:
+            results = self._cached_results()
+            if results is not _MISSING:
+                self._result_cache = results
+        super()._fetch_all()
+
+    def _cached_results(self):
+        connection = connections[self.db]
+        if connection.in_atomic_block or self._prefetch_related_lookups:
+            return _MISSING
+        try:
+            sql, params = self.query.chain().get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return _MISSING
+
+        every, tracked = _table_names()
+        tables = sorted(table for table in every if connection.ops.quote_name(table) in sql)
+        if not tables or not set(tables) <= tracked:
+            return _MISSING
+
+        cache, _, ttl = _settings()
+        versions = version_memo.get(tables, ttl)
+        shape = f"{self._iterable_class.__name__}:{self._fields}"
+        digest = hashlib.md5(f"{self.db}|{shape}|{sql}|{params!r}".encode(), usedforsecurity=False).hexdigest()
+        key = "query:" + ":".join(f"{table}.{version}" for table, version in zip(tables, versions)) + f":{digest}"
+
+        results = cache.get(key, _MISSING)
+        cache_lookup("query", hit=results is not _MISSING)
+        if results is _MISSING:
+            results = list(self._iterable_class(self))
+            cache.set(key, results, self._query_cache_timeout)
+        return results
+
+    # Écritures qui ne passent pas par save()/delete() : pas de signal, version incrémentée ici
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        invalidate_tables(self.model._meta.db_table, using=self.db)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        invalidate_tables(self.model._meta.db_table, using=self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        invalidate_tables(self.model._meta.db_table, using=self.db)
+        return rows
@@ -0,0 +1,279 @@
+import atexit
+import os
+import re
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+from .snapshots import read_snapshots, remove_snapshots, snapshot_path, write_snapshot
+
+SNAPSHOT_PREFIX = "querystats"
+OTHER_FINGERPRINT = "(autres requêtes)"
+SORT_KEYS = ("total", "count", "max", "per_request")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?|\$\d+")
+_TUPLE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_TUPLES = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """SQL sans ses valeurs : chaînes, nombres et paramètres deviennent ?, listes IN / VALUES deviennent (...)."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _TUPLE.sub("(...)", sql)
+    sql = _TUPLES.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def stats_dir():
+    return Path(_setting("QUERY_STATS_DIR", Path(tempfile.gettempdir()) / "querystats"))
+
+
+# ------------------------
+# Collecte pendant une requête HTTP
+# ------------------------
+
+class QueryCollector:
+    """
+    execute_wrapper d'une requête HTTP : nombre, durée totale et maximale par empreinte,
+    et la plus lente au-dessus de QUERY_STATS_SLOW_MS (SQL, paramètres, alias) pour l'EXPLAIN.
+    """
+
+    def __init__(self):
+        self.slow_seconds = _setting("QUERY_STATS_SLOW_MS", 100) / 1e3
+        self.queries = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.queries.setdefault(fingerprint(sql), {"count": 0, "total": 0.0, "max": 0.0, "sql": sql, "slow": None})
+            entry["count"] += 1
+            entry["total"] += elapsed
+            if elapsed > entry["max"]:
+                entry["max"] = elapsed
+                entry["sql"] = sql
+                if elapsed >= self.slow_seconds and not many:
+                    entry["slow"] = (sql, params, context["connection"].alias)
+
+
+def explain(sql, params, alias):
+    """Plan de la requête : EXPLAIN QUERY PLAN (SQLite), EXPLAIN ANALYZE pour les SELECT (PostgreSQL)."""
+    connection = connections[alias]
+    is_select = sql.lstrip()[:6].upper() in ("SELECT", "WITH ")
+    if connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif connection.vendor == "postgresql":
+        # ANALYZE exécute la requête : réservé aux lectures
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    else:
+        prefix = "EXPLAIN "
+    try:
+        # Point de sauvegarde : un EXPLAIN en erreur n'annule pas la transaction en cours
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return [f"EXPLAIN impossible : {exc}"]
+    if connection.vendor == "sqlite":
+        return [row[-1] for row in rows]
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+# ------------------------
+# Agrégats du processus
+# ------------------------
+
+class QueryStats:
+    """Agrégats par route et par empreinte depuis le démarrage du worker, recopiés dans QUERY_STATS_DIR."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.fingerprints = 0
+        self.explained = set()
+        self.last_flush = time.monotonic()
+        self.reset_seen = None
+
+    def record(self, route, collector):
+        explains = {}
+        for key, entry in collector.queries.items():
+            if entry["slow"] and key not in self.explained:
+                self.explained.add(key)
+                explains[key] = explain(*entry["slow"])
+
+        limit = _setting("QUERY_STATS_MAX_FINGERPRINTS", 1000)
+        with self.lock:
+            stats = self.routes.setdefault(route, {"requests": 0, "queries": {}})
+            stats["requests"] += 1
+            for key, entry in collector.queries.items():
+                if key not in stats["queries"] and self.fingerprints >= limit:
+                    key = OTHER_FINGERPRINT
+                current = stats["queries"].get(key)
+                if current is None:
+                    current = stats["queries"][key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "sql": entry["sql"], "explain": None}
+                    self.fingerprints += 1
+                current["count"] += entry["count"]
+                current["total_ms"] += entry["total"] * 1e3
+                if entry["max"] * 1e3 > current["max_ms"]:
+                    current["max_ms"] = entry["max"] * 1e3
+                    current["sql"] = entry["sql"]
+                if key in explains:
+                    current["explain"] = explains[key]
+        if time.monotonic() - self.last_flush >= _setting("QUERY_STATS_FLUSH_INTERVAL", 5):
+            self.flush()
+
+    def clear(self):
+        with self.lock:
+            self.routes = {}
+            self.fingerprints = 0
+            self.explained = set()
+
+    def flush(self):
+        """Écrit les agrégats du processus ; repart de zéro si une remise à zéro a eu lieu depuis le dernier passage."""
+        directory = stats_dir()
+        marker = _reset_marker(directory)
+        reset_at = marker.stat().st_mtime_ns if marker.exists() else 0
+        if self.reset_seen is not None and reset_at > self.reset_seen:
+            self.clear()
+        self.reset_seen = reset_at
+        self.last_flush = time.monotonic()
+        with self.lock:
+            if not self.routes and not snapshot_path(directory, SNAPSHOT_PREFIX).exists():
+                return
+            data = {"routes": self.routes, "updated": time.time()}
+            write_snapshot(directory, SNAPSHOT_PREFIX, data)
+
+
+process_stats = QueryStats()
+os.register_at_fork(after_in_child=process_stats.reset)
+
+
+@atexit.register
+def _flush_at_exit():
+    if process_stats.routes:
+        process_stats.flush()
+
+
+def _reset_marker(directory):
+    return Path(directory) / f"{SNAPSHOT_PREFIX}.reset"
+
+
+def reset():
+    """Remet à zéro les statistiques de tous les workers (chacun vide les siennes à sa prochaine écriture)."""
+    directory = stats_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    _reset_marker(directory).touch()
+    remove_snapshots(directory, SNAPSHOT_PREFIX)
+    process_stats.flush()
+
+
+# ------------------------
+# Lecture et rapports
+# ------------------------
+
+def collect():
+    """Agrégats de tous les workers (ceux des autres ont au plus QUERY_STATS_FLUSH_INTERVAL secondes de retard)."""
+    process_stats.flush()
+    snapshots = read_snapshots(stats_dir(), SNAPSHOT_PREFIX)
+    routes = {}
+    for _, data in snapshots:
+        for route, stats in data.get("routes", {}).items():
+            merged = routes.setdefault(route, {"requests": 0, "queries": {}})
+            merged["requests"] += stats["requests"]
+            for key, entry in stats["queries"].items():
+                current = merged["queries"].get(key)
+                if current is None:
+                    merged["queries"][key] = dict(entry)
+                    continue
+                current["count"] += entry["count"]
+                current["total_ms"] += entry["total_ms"]
+                if entry["max_ms"] > current["max_ms"]:
+                    current["max_ms"] = entry["max_ms"]
+                    current["sql"] = entry["sql"]
+                current["explain"] = current["explain"] or entry["explain"]
+    return len(snapshots), routes
+
+
+def _row(key, entry, requests=None):
+    row = {
+        "fingerprint": key,
+        "count": entry["count"],
+        "total_ms": round(entry["total_ms"], 2),
+        "mean_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0,
+        "max_ms": round(entry["max_ms"], 2),
+        "sql": entry["sql"],
+        "explain": entry["explain"],
+    }
+    if requests is not None:
+        row["per_request"] = round(entry["count"] / requests, 2) if requests else 0.0
+    return row
+
+
+def _sort_key(sort):
+    field = {"total": "total_ms", "count": "count", "max": "max_ms", "per_request": "per_request"}[sort]
+    return lambda row: row.get(field, 0)
+
+
+def report(by="route", sort="total", limit=20, route=None):
+    """
+    by='route' : par route, requêtes HTTP, requêtes SQL par requête HTTP et les empreintes les plus coûteuses
+    (per_request > 1 sur une même empreinte = requête exécutée en boucle).
+    by='fingerprint' : par empreinte, toutes routes confondues.
+    """
+    workers, routes = collect()
+    if route:
+        routes = {name: stats for name, stats in routes.items() if name == route}
+
+    if by == "fingerprint":
+        merged = {}
+        for name, stats in routes.items():
+            for key, entry in stats["queries"].items():
+                current = merged.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "sql": entry["sql"], "explain": None, "routes": []})
+                current["count"] += entry["count"]
+                current["total_ms"] += entry["total_ms"]
+                if entry["max_ms"] > current["max_ms"]:
+                    current["max_ms"] = entry["max_ms"]
+                    current["sql"] = entry["sql"]
+                current["explain"] = current["explain"] or entry["explain"]
+                current["routes"].append(name)
+        rows = [{**_row(key, entry), "routes": sorted(entry["routes"])} for key, entry in merged.items()]
+        rows.sort(key=_sort_key("total" if sort == "per_request" else sort), reverse=True)
+        return {"workers": workers, "by": by, "results": rows[:limit]}
+
+    rows = []
+    for name, stats in routes.items():
+        queries = [_row(key, entry, stats["requests"]) for key, entry in stats["queries"].items()]
+        queries.sort(key=_sort_key(sort), reverse=True)
+        count = sum(entry["count"] for entry in stats["queries"].values())
+        total = sum(entry["total_ms"] for entry in stats["queries"].values())
+        rows.append({
+            "route": name,
+            "requests": stats["requests"],
+            "count": count,
+            "per_request": round(count / stats["requests"], 2) if stats["requests"] else 0.0,
+            "total_ms": round(total, 2),
+            "max_ms": round(max((entry["max_ms"] for entry in stats["queries"].values()), default=0.0), 2),
+            "queries": queries[:limit],
+        })
+    rows.sort(key=_sort_key(sort), reverse=True)
+    return {"workers": workers, "by": by, "results": rows[:limit]}
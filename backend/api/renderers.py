@@ -0,0 +1,51 @@
+from django.conf import settings
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+from .performance import timed
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : repli sur le json de la stdlib
+    orjson = None
+
+
+def use_orjson():
+    """Backend JSON choisi par API_JSON_BACKEND ('orjson' ou 'json') ; 'json' si orjson est absent."""
+    return orjson is not None and getattr(settings, 'API_JSON_BACKEND', 'orjson') == 'orjson'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer de DRF servi par orjson : UUID, chaînes et nombres encodés nativement.
+    Les dates et Decimal passent par l'encodeur DRF (default) pour une sortie identique
+    octet pour octet. Indentation, ASCII forcé ou valeur non gérée : repli sur la stdlib.
+    Deux écarts avec la stdlib, sur les float seulement : exposant sans « + » ni zéro
+    (1e16, 1e-7 au lieu de 1e+16, 1e-07, même valeur pour tout parseur JSON), et NaN / Infinity
+    rendus null là où DRF (STRICT_JSON) lève une erreur 500. Les serializers de l'API ne
+    produisent ni l'un ni l'autre (Decimal en chaîne, moyennes arrondies).
+    """
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (not use_orjson() or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self._default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Même échappement que DRF : sortie strictement compatible JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -6,6 +6,12 @@ from django.utils import timezone
 import re
 # from django.core.exceptions import ValidationError
 # from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from .email_index import email_exists
+from .fast_serializers import player_display_name
+from .performance import TimedRepresentationMixin
+from .sparse import SparseFieldsetMixin
+from .utils import create_event_participations, create_with_unique_username
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
@@ -15,7 +21,7 @@ EMAIL_REGEX = r"^[\w\.-]+@[\w\.-]+\.\w+$"
 # ------------------------
 # User Serializer
 # ------------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     is_player = serializers.ReadOnlyField()
     is_admin_user = serializers.ReadOnlyField()
     role = serializers.ReadOnlyField()
@@ -30,6 +36,20 @@ class UserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'role', 'is_player', 'is_admin_user', 'is_approved']
         extra_kwargs = {'password': {'write_only': True}, 'email': {'read_only': True}}
+        # Colonnes lues par les champs calculés (propriétés du modèle), pour le planificateur de requêtes
+        field_dependencies = {
+            'is_player': ('role',),
+            'is_admin_user': ('role', 'is_staff', 'is_superuser'),
+        }
+
+    # Équivalents des propriétés du modèle pour le chemin rapide (lignes .values())
+    @staticmethod
+    def fast_is_player(get):
+        return get('role') == 'player'
+
+    @staticmethod
+    def fast_is_admin_user(get):
+        return get('role') == 'admin' or get('is_staff') or get('is_superuser')
 
     def create(self, validated_data):
         password = validated_data.pop('password', None)
@@ -54,7 +74,7 @@ class UserSerializer(serializers.ModelSerializer):
 # Register Serializer
 # ------------------------
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
 
     class Meta:
@@ -63,7 +83,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True}}
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if email_exists(value):
             raise serializers.ValidationError("Cet email est déjà utilisé.")
         return value
 
@@ -76,25 +96,27 @@ class RegisterSerializer(serializers.ModelSerializer):
         email = validated_data['email']
         password = validated_data['password']
         validated_data.pop('role', None)  # Ignorer le rôle fourni
-        # Génération d'un nom d'utilisateur unique basé sur l'email
-        username_base = email.split('@')[0]
-        username = username_base
-        i = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{username_base}{i}"
-            i += 1
-
         # Création du compte avec rôle 'player' par défaut
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            role='player',  # ✅ rôle attribué automatiquement
-            is_active=False,
-            is_approved=False,
-            is_staff=False,
-            is_superuser=False
-        )
+        def create_user(username):
+            return User.objects.create_user(
+                username=username,
+                email=email,
+                password=password,
+                role='player',  # ✅ rôle attribué automatiquement
+                is_active=False,
+                is_approved=False,
+                is_staff=False,
+                is_superuser=False
+            )
+
+        # Nom d'utilisateur unique basé sur l'email : une requête, nouvel essai en cas de course
+        try:
+            user = create_with_unique_username(email.split('@')[0], create_user)
+        except IntegrityError:
+            # Inscription concurrente avec le même email, passée entre validate_email et l'insertion
+            if User.objects.filter(email=email).exists():
+                raise serializers.ValidationError({"email": "Cet email est déjà utilisé."})
+            raise
         return user
 
 # ------------------------
@@ -109,10 +131,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["email"] = user.email
         return token
 
-    def validate(self, attrs):
-        email = attrs.get("email", "").strip().lower()
-        password = attrs.get("password", "")
-
+    @staticmethod
+    def check_credentials_format(email, password):
+        """Erreurs de saisie (champs vides, format d'email), avant toute requête ou hachage."""
         errors = {}
 
         # ✅ Champs vides
@@ -123,7 +144,28 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         if not password:
             errors["password"] = "Le mot de passe est requis."
+        return errors
+
+    @classmethod
+    def token_response(cls, user):
+        """Réponse de connexion : tokens + informations de l'utilisateur."""
+        refresh = cls.get_token(user)
+        access = refresh.access_token
+
+        return {
+            "refresh": str(refresh),
+            "access": str(access),
+            "role": user.role,
+            "email": user.email,
+            "id": str(user.id),
+            "expires_in": access.lifetime.total_seconds(),
+        }
+
+    def validate(self, attrs):
+        email = attrs.get("email", "").strip().lower()
+        password = attrs.get("password", "")
 
+        errors = self.check_credentials_format(email, password)
         if errors:
             raise serializers.ValidationError(errors)
 
@@ -147,24 +189,14 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             raise serializers.ValidationError({"email": "Le compte n'est pas encore approuvé."})
 
         # ✅ Génération des tokens
-        refresh = self.get_token(user)
-        access = refresh.access_token
-
-        return {
-            "refresh": str(refresh),
-            "access": str(access),
-            "role": user.role,
-            "email": user.email,
-            "id": str(user.id),
-            "expires_in": access.lifetime.total_seconds(),
-        }
+        return self.token_response(user)
 
 
 # ------------------------
 # Player Serializer
 # ------------------------
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -180,7 +212,7 @@ class PlayerSerializer(serializers.ModelSerializer):
 # Player Profile Serializer
 # ------------------------
 
-class PlayerProfileSerializer(serializers.ModelSerializer):
+class PlayerProfileSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     bio = serializers.CharField(source='user.bio', allow_blank=True, required=False)
     profile_picture = serializers.ImageField(source='user.profile_picture', allow_null=True, required=False)
@@ -194,16 +226,34 @@ class PlayerProfileSerializer(serializers.ModelSerializer):
 # Unapproved User Serializer
 # ------------------------
 
-class UnapprovedUserSerializer(serializers.ModelSerializer):
+class UnapprovedUserSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'username', 'role', 'is_approved']
         read_only_fields = ['id', 'email', 'username', 'role', 'is_approved']
 
+# ------------------------
+# Bulk Serializers (approbation, actions groupées)
+# ------------------------
+BULK_MAX_ITEMS = 500
+
+
+class IdListSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class PlayerBulkCreateSerializer(serializers.ModelSerializer):
+    # Existence et rôle de l'utilisateur vérifiés pour tout le lot en une requête (voir PlayerViewSet.bulk)
+    user = serializers.UUIDField()
+
+    class Meta:
+        model = Player
+        fields = ['user', 'position', 'team_name', 'jersey_number', 'is_available']
+
 # ------------------------
 # Approved User Serializer
 # ------------------------
-class ApprovedUserSerializer(serializers.ModelSerializer):
+class ApprovedUserSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -223,21 +273,26 @@ class ApprovedUserSerializer(serializers.ModelSerializer):
 # SeasonStats Serializer
 # ------------------------
 
-class SeasonStatsSerializer(serializers.ModelSerializer):
+class SeasonStatsSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     player_name = serializers.SerializerMethodField()
     player_position = serializers.CharField(source='player.position', read_only=True)
     player_id = serializers.UUIDField(source='player.id', read_only=True)
     class Meta:
         model = SeasonStats
         fields = '__all__'
+        field_dependencies = {
+            'player_name': ('player__user__first_name', 'player__user__last_name', 'player__user__email'),
+        }
         
     def get_player_name(self, obj):
         return obj.player.user.get_full_name() or obj.player.user.email
 
+    fast_player_name = staticmethod(player_display_name)
+
 # ------------------------
 # ReportAdmin Serializer
 # ------------------------
-class ReportAdminSerializer(serializers.ModelSerializer):
+class ReportAdminSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     def validate(self, data):
         user = self.context['request'].user
         if not user.is_authenticated:
@@ -262,7 +317,7 @@ class ReportAdminSerializer(serializers.ModelSerializer):
 # ------------------------
 # Participation Serializer
 # ------------------------
-class ParticipationSerializer(serializers.ModelSerializer):
+class ParticipationSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     player_name = serializers.SerializerMethodField()
     event_title = serializers.SerializerMethodField()
 
@@ -279,6 +334,10 @@ class ParticipationSerializer(serializers.ModelSerializer):
         ]
 
         read_only_fields = ['player', 'event', 'player_name', 'event_title']
+        field_dependencies = {
+            'player_name': ('player__user__first_name', 'player__user__last_name', 'player__user__email'),
+            'event_title': ('event__title',),
+        }
 
     def get_player_name(self, obj):
         return obj.player.user.get_full_name() or obj.player.user.email
@@ -286,6 +345,12 @@ class ParticipationSerializer(serializers.ModelSerializer):
     def get_event_title(self, obj):
         return obj.event.title
 
+    fast_player_name = staticmethod(player_display_name)
+
+    @staticmethod
+    def fast_event_title(get):
+        return get('event__title')
+
     def validate(self, data):
         user = self.context['request'].user
         if not user.is_authenticated:
@@ -301,7 +366,7 @@ class ParticipationSerializer(serializers.ModelSerializer):
 # ------------------------
 # Event Serializer
 # ------------------------
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Event
@@ -341,15 +406,8 @@ class EventSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Création d'un événement"""
-        event = Event.objects.create(**validated_data)
-
-        # Récupère tous les joueurs existants
-        players = Player.objects.all()
-        for player in players:
-            Participation.objects.create(
-                player=player,
-                event=event,
-                will_attend=False,
-                notified=False
-            )
+        with transaction.atomic():
+            event = Event.objects.create(**validated_data)
+            # Une participation par joueur, insérée par lots (ou reportée si l'effectif est énorme)
+            create_event_participations(event)
         return event
\ No newline at end of file
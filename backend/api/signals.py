@@ -1,9 +1,69 @@
-from django.db.models.signals import post_save
+from django.core.signals import request_started
+from django.db import DatabaseError
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import User,Player
+from .authentication import invalidate_cached_user
+from .cache import invalidate_models
+from .email_index import email_index
+from .querycache import invalidate_query_cache
+from .models import User,Player, PlayerProfile, Participation, Event, ReportAdmin, SeasonStats
+
+# Réponses en cache (api/cache.py) étiquetées par modèle. Pas de post_delete sur Participation :
+# un récepteur empêcherait la suppression en cascade rapide (une ligne chargée par participation) ;
+# ses parents invalident l'étiquette à sa place.
+CASCADE_DELETES = {User: (Participation,), Player: (Participation,), Event: (Participation,)}
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """Créer automatiquement un Player après la création d'un User"""
     if created and instance.role == "player":
         Player.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=PlayerProfile)
+@receiver(post_save, sender=Participation)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=ReportAdmin)
+@receiver(post_save, sender=SeasonStats)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=PlayerProfile)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=ReportAdmin)
+@receiver(post_delete, sender=SeasonStats)
+def invalidate_response_cache(sender, instance, **kwargs):
+    """Invalider les réponses en cache (stats d'équipe, listes) étiquetées par le modèle modifié"""
+    invalidate_models(sender, *CASCADE_DELETES.get(sender, ()))
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=SeasonStats)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=SeasonStats)
+def invalidate_cached_queries(sender, instance, **kwargs):
+    """Incrémenter la version de la table (cache de requêtes partagé entre workers)"""
+    invalidate_query_cache(sender)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Retirer l'utilisateur du cache d'authentification JWT dès qu'il change"""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def index_user_email(sender, instance, **kwargs):
+    """Ajouter l'email à l'index de disponibilité (les suppressions restent des faux positifs)"""
+    email_index.add(instance.email)
+
+
+@receiver(request_started)
+def warm_up_email_index(sender, **kwargs):
+    """Construire l'index des emails à la première requête du worker, avant toute vérification d'inscription"""
+    try:
+        email_index.warm_up()
+    except DatabaseError:
+        pass  # base indisponible : l'index sera construit à la première vérification
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows (développement) : pas de verrou entre processus
+    fcntl = None
+
+
+def snapshot_path(directory, prefix, pid=None):
+    return Path(directory) / f"{prefix}-{pid or os.getpid()}.json"
+
+
+def write_snapshot(directory, prefix, data, pid=None):
+    """Écrit l'état du processus courant (<prefix>-<pid>.json) ; remplacement atomique, jamais de fichier à moitié écrit."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{prefix}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp, snapshot_path(directory, prefix, pid))
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def read_snapshot(path):
+    """Contenu d'un fichier, None s'il est absent ou illisible."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def read_snapshots(directory, prefix):
+    """Liste (pid, données) des fichiers de tous les processus ; fichiers illisibles ignorés."""
+    snapshots = []
+    for path in sorted(Path(directory).glob(f"{prefix}-*.json")):
+        pid = path.stem[len(prefix) + 1:]
+        if not pid.isdigit():
+            continue
+        data = read_snapshot(path)
+        if data is not None:
+            snapshots.append((int(pid), data))
+    return snapshots
+
+
+def remove_snapshots(directory, prefix, pid=None):
+    """Supprime les fichiers d'un processus, ou de tous si pid est None."""
+    pattern = f"{prefix}-{pid}.json" if pid else f"{prefix}-*.json"
+    for path in Path(directory).glob(pattern):
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def snapshot_lock(directory, prefix):
+    """Verrou exclusif entre processus (flock sur <prefix>.lock) pour les lectures-modifications de fichiers partagés."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / f"{prefix}.lock", "a") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_UN)
@@ -0,0 +1,61 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_spec(raw):
+    """'id,user.first_name,user.last_name' -> {'id': {}, 'user': {'first_name': {}, 'last_name': {}}}"""
+    tree = {}
+    for item in (raw or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        node = tree
+        for part in item.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def prune_fields(serializer, include=None, exclude=None):
+    """Retire les champs non demandés (?fields=) ou exclus (?omit=), y compris dans les serializers imbriqués."""
+    fields = serializer.fields
+    if include:
+        for name in list(fields):
+            if name not in include:
+                fields.pop(name)
+    for name, nested in (exclude or {}).items():
+        if name in fields and not nested:
+            fields.pop(name)
+
+    for name, field in fields.items():
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(child, serializers.Serializer):
+            continue
+        nested_include = (include or {}).get(name)
+        nested_exclude = (exclude or {}).get(name)
+        if nested_include or nested_exclude:
+            prune_fields(child, nested_include, nested_exclude)
+    return serializer
+
+
+def sparse_params(request):
+    """(fields, omit) bruts de la requête ; ignorés hors lecture pour ne jamais filtrer une écriture."""
+    if request is None or request.method not in SAFE_METHODS:
+        return '', ''
+    params = getattr(request, 'query_params', request.GET)
+    return params.get(FIELDS_PARAM, ''), params.get(OMIT_PARAM, '')
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=id,jersey_number,user.first_name  -> seulement ces champs
+    ?omit=user.bio,user.profile_picture       -> tous les champs sauf ceux-là
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = sparse_params(self.context.get('request'))
+        if fields or omit:
+            prune_fields(self, parse_field_spec(fields), parse_field_spec(omit))
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Sum
+
+from .cache import get_or_compute, model_tag
+from .models import SeasonStats
+
+
+def _cache_timeout():
+    return getattr(settings, "TEAM_STATS_CACHE_TIMEOUT", 300)
+
+
+def _aggregates():
+    return {
+        "players_count": Count("id"),
+        "total_goals": Sum("goals"),
+        "total_assists": Sum("assists"),
+        "total_yellow": Sum("yellow_cards"),
+        "total_red": Sum("red_cards"),
+        "moyenne_notes": Avg("notes_moyenne_saison"),
+        "max_games": Max("games_played"),
+    }
+
+
+def _format(row):
+    return {
+        "players_count": row["players_count"],
+        "max_games_played": row["max_games"] or 0,
+        "total_goals": row["total_goals"] or 0,
+        "total_assists": row["total_assists"] or 0,
+        "total_yellow_cards": row["total_yellow"] or 0,
+        "total_red_cards": row["total_red"] or 0,
+        "average_rating": round(row["moyenne_notes"] or 0, 2),
+    }
+
+
+def compute_team_season_stats(season=None, group_by=None):
+    """Statistiques d'équipe calculées en une seule requête (GROUP BY season_year si demandé)."""
+    stats = SeasonStats.objects.all()
+    if season:
+        stats = stats.filter(season_year=season)
+
+    if group_by == "season":
+        # order_by remplace l'ordre par défaut (jointure sur l'email) qui casserait le GROUP BY
+        rows = stats.order_by("-season_year").values("season_year").annotate(**_aggregates())
+        grouped = {
+            row["season_year"]: {"season": row["season_year"], **_format(row)}
+            for row in rows
+        }
+        return {
+            "grouped_by_season": grouped,
+            "distinct_seasons": len(grouped),
+        }
+
+    row = stats.aggregate(distinct_seasons=Count("season_year", distinct=True), **_aggregates())
+    return {
+        "season": season or "Toutes",
+        **_format(row),
+        "distinct_seasons": row["distinct_seasons"],
+    }
+
+
+def get_team_season_stats(season=None, group_by=None):
+    """Version en cache de compute_team_season_stats, invalidée à chaque écriture sur SeasonStats."""
+    return get_or_compute(
+        f"team_season_stats:{season or ''}:{group_by or ''}",
+        [model_tag(SeasonStats)],
+        lambda: compute_team_season_stats(season, group_by),
+        _cache_timeout(),
+    )
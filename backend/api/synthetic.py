@@ -0,0 +1,152 @@
+import itertools
+import os
+import random
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+
+from .models import Event, Participation, Player, ReportAdmin, SeasonStats, User
+
+POSITIONS = ["Attaquant", "Milieu", "Défenseur", "Gardien"]
+EVENT_TYPES = [event_type for event_type, _ in Event.EVENT_TYPES]
+REPORT_TYPES = [report_type for report_type, _ in ReportAdmin.REPORT_TYPES]
+# Repères des lignes générées, pour pouvoir les retirer d'une base de développement
+SYNTHETIC_EMAILS = r'^joueur[0-9]+@test\.com$'
+SYNTHETIC_TEXT = "Donnée synthétique."
+
+
+@contextmanager
+def temporary_database(verbosity=0, file_backed=False):
+    """
+    Base de test jetable (comme `manage.py test`) pour les benchmarks : la base de dev n'est jamais touchée.
+    file_backed : SQLite dans un fichier plutôt qu'en mémoire, pour des écritures concurrentes
+    (le cache partagé en mémoire lève « table is locked » au lieu d'attendre le verrou).
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if file_backed and connection.vendor == 'sqlite':
+        test_settings['NAME'] = os.path.join(tempfile.gettempdir(), f"bench_{os.getpid()}.sqlite3")
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings['NAME'] = old_test_name
+
+
+def clear_synthetic():
+    """Supprime les données de seed_club (comptes joueurN@test.com en cascade, événements, rapports)."""
+    return sum(queryset.delete()[0] for queryset in (
+        User.objects.filter(email__regex=SYNTHETIC_EMAILS),
+        Event.objects.filter(description=SYNTHETIC_TEXT),
+        ReportAdmin.objects.filter(content__startswith=SYNTHETIC_TEXT),
+    ))
+
+
+def _insert(model, rows, batch_size):
+    """bulk_create par lots depuis un générateur : la mémoire reste bornée à un lot."""
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, batch_size)):
+        model.objects.bulk_create(batch, batch_size=batch_size)
+
+
+def seed_club(players=100, events=20, seasons=3, seed=0, password="test1234", batch_size=1000,
+              participation_rate=0.0, reports=0, admin=None):
+    """
+    Jeu de données synthétique inséré par bulk_create (pas de signal, un seul hash de mot de passe).
+    participation_rate : part des joueurs inscrits à chaque événement ; reports : rapports signés par admin.
+    Déterministe pour une même graine.
+    """
+    rng = random.Random(seed)
+    hashed = make_password(password)
+    now = timezone.now()
+
+    users = [
+        User(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            email=f"joueur{i + 1}@test.com",
+            username=f"joueur{i + 1}",
+            first_name="Joueur",
+            last_name=f"Numero{i + 1}",
+            password=hashed,
+            role="player",
+            is_active=True,
+            is_approved=True,
+        )
+        for i in range(players)
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size)
+
+    roster = [
+        Player(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            user=user,
+            position=rng.choice(POSITIONS),
+            jersey_number=i + 1,
+        )
+        for i, user in enumerate(users)
+    ]
+    Player.objects.bulk_create(roster, batch_size=batch_size)
+
+    calendar = Event.objects.bulk_create([
+        Event(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            title=f"Événement {i + 1}",
+            event_type=(event_type := rng.choice(EVENT_TYPES)),
+            opponent=None if event_type == "Entrainement" else f"Adversaire {rng.randint(1, 30)}",
+            date_event=now + timedelta(days=rng.randint(1, 365), minutes=rng.randint(0, 1440)),
+            location="Québec",
+            description=SYNTHETIC_TEXT,
+        )
+        for i in range(events)
+    ], batch_size=batch_size)
+
+    current = now.year
+    _insert(SeasonStats, (
+        SeasonStats(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            player=player,
+            season_year=f"{year}-{year + 1}",
+            games_played=rng.randint(0, 30),
+            goals=rng.randint(0, 20),
+            assists=rng.randint(0, 15),
+            yellow_cards=rng.randint(0, 6),
+            red_cards=rng.randint(0, 2),
+            notes_moyenne_saison=Decimal(rng.randint(400, 950)) / 100,
+        )
+        for player in roster
+        for year in range(current - seasons, current)
+    ), batch_size)
+
+    if participation_rate:
+        _insert(Participation, (
+            Participation(
+                id=uuid.UUID(int=rng.getrandbits(128)),
+                player=player,
+                event=event,
+                will_attend=rng.random() < 0.7,
+                notified=rng.random() < 0.5,
+            )
+            for event in calendar
+            for player in roster
+            if rng.random() < participation_rate
+        ), batch_size)
+
+    _insert(ReportAdmin, (
+        ReportAdmin(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            title=f"Rapport {i + 1}",
+            reporter_type=rng.choice(REPORT_TYPES),
+            content=SYNTHETIC_TEXT + " Compte rendu de match." * rng.randint(1, 20),
+            created_by_admin=admin,
+        )
+        for i in range(reports)
+    ), batch_size)
+    return roster
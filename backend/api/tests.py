@@ -1,3 +1,1365 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import MD5PasswordHasher
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import metrics, querystats, snapshots, urls
+from .authentication import user_cache
+from .cache import get_or_compute
+from .email_index import email_exists, email_index
+from .mixins import FastListMixin
+from .models import Event, Participation, Player, ReportAdmin, SeasonStats, User
+from .parsers import FastJSONParser
+from .querycache import version_memo
+from .renderers import FastJSONRenderer
+from .serializers import CustomTokenObtainPairSerializer
+from .stats import compute_team_season_stats
+from .throttling import ScopedSlidingWindowThrottle
+from .utils import allocate_username, bulk_create_participations, create_with_unique_username
+
+
+# ------------------------
+# N+1 guard : nombre de requêtes constant quel que soit le nombre de lignes
+# ------------------------
+FAST_HASHER = override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+
+@FAST_HASHER
+class QueryCountGuardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.player_user = User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+        cls.event = Event.objects.create(
+            title="Match", event_type="Entrainement", location="Québec",
+            date_event=timezone.now() + timedelta(days=7),
+        )
+
+    def setUp(self):
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(self.admin)
+        self.player_client = APIClient()
+        self.player_client.force_authenticate(self.player_user)
+        self.seasons = iter(f"{year}-{year + 1}" for year in range(2000, 2100))
+
+    def add_rows(self, count):
+        season = next(self.seasons)
+        for i in range(count):
+            user = User.objects.create_user(email=f"{season}-{i}@test.com", password="pw", is_approved=True)
+            SeasonStats.objects.create(player=user.player_profile, season_year=season, goals=i, notes_moyenne_saison=Decimal("6.50"))
+            Participation.objects.create(player=user.player_profile, event=self.event)
+            ReportAdmin.objects.create(title=f"Rapport {i}", reporter_type="match", content="-", created_by_admin=self.admin)
+        # Lignes propres au joueur connecté (saison + événement distincts)
+        event = Event.objects.create(
+            title=f"Entrainement {season}", event_type="Entrainement", location="Québec",
+            date_event=timezone.now() + timedelta(days=10),
+        )
+        SeasonStats.objects.create(player=self.player_user.player_profile, season_year=season)
+        Participation.objects.create(player=self.player_user.player_profile, event=event)
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def assertConstantQueries(self, client, url):
+        self.add_rows(2)
+        small = self.count_queries(client, url)
+        self.add_rows(8)
+        large = self.count_queries(client, url)
+        self.assertEqual(small, large, f"{url} : {small} requêtes pour peu de lignes, {large} pour plus de lignes")
+
+    def test_admin_season_stats(self):
+        self.assertConstantQueries(self.admin_client, "/api/admin/season-stats/")
+
+    def test_my_season_stats(self):
+        self.assertConstantQueries(self.player_client, "/api/player/my-season-stats/")
+
+    def test_event_participations(self):
+        self.assertConstantQueries(self.admin_client, f"/api/admin/event/{self.event.id}/participations/")
+
+    def test_my_participations(self):
+        self.assertConstantQueries(self.player_client, "/api/player/my-participations/")
+
+    def test_admin_players(self):
+        self.assertConstantQueries(self.admin_client, "/api/admin/players/")
+
+    def test_admin_reports(self):
+        self.assertConstantQueries(self.admin_client, "/api/admin/reports/")
+
+    def test_events(self):
+        self.assertConstantQueries(self.admin_client, "/api/events/")
+
+
+# ------------------------
+# Statistiques d'équipe (api/stats.py) : un GROUP BY, résultat en cache jusqu'à la prochaine écriture
+# ------------------------
+@FAST_HASHER
+class TeamSeasonStatsTests(TestCase):
+    url = "/api/admin/team-season-stats/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.rows = []
+        for i, season in enumerate(["2024-2025", "2024-2025", "2025-2026"]):
+            player = User.objects.create_user(email=f"joueur{i}@test.com", password="pw").player_profile
+            cls.rows.append(SeasonStats.objects.create(
+                player=player, season_year=season, goals=i + 1, games_played=10 + i, notes_moyenne_saison=Decimal("7.00"),
+            ))
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_one_query_whatever_the_grouping(self):
+        for kwargs in ({}, {"season": "2024-2025"}, {"group_by": "season"}):
+            with self.subTest(**kwargs), self.assertNumQueries(1):
+                compute_team_season_stats(**kwargs)
+
+        grouped = compute_team_season_stats(group_by="season")
+        self.assertEqual(grouped["distinct_seasons"], 2)
+        self.assertEqual(grouped["grouped_by_season"]["2024-2025"]["total_goals"], 3)
+        self.assertEqual(grouped["grouped_by_season"]["2025-2026"]["max_games_played"], 12)
+        self.assertEqual(compute_team_season_stats()["total_goals"], 6)
+
+    def season_stats_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            body = self.client.get(self.url).json()
+        return body, [q for q in queries if "api_seasonstats" in q["sql"]]
+
+    def test_cached_until_a_season_stats_row_changes(self):
+        body, queries = self.season_stats_queries()
+        self.assertEqual((body["total_goals"], len(queries)), (6, 1))
+        body, queries = self.season_stats_queries()
+        self.assertEqual((body["total_goals"], queries), (6, []))
+
+        row = self.rows[0]
+        row.goals = 11
+        row.save()
+        body, queries = self.season_stats_queries()
+        self.assertEqual((body["total_goals"], len(queries)), (16, 1))
+
+        row.delete()
+        self.assertEqual(self.client.get(self.url).json()["total_goals"], 5)
+
+
+# ------------------------
+# Exports CSV / NDJSON en streaming (api/exports.py)
+# ------------------------
+@FAST_HASHER
+class ExportTests(TestCase):
+    url = "/api/admin/exports/season-stats/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.count = 0
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_rows(self, count, season="2025-2026"):
+        for _ in range(count):
+            self.count += 1
+            player = User.objects.create_user(
+                email=f"joueur{self.count}@test.com", password="pw", first_name="Léa", last_name=f"N{self.count}",
+            ).player_profile
+            SeasonStats.objects.create(player=player, season_year=season, goals=self.count, notes_moyenne_saison=Decimal("7.25"))
+
+    def download(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+            body = b"".join(response.streaming_content).decode()
+        return response, body, len(queries)
+
+    def test_csv(self):
+        self.add_rows(2)
+        self.add_rows(1, season="2024-2025")
+        response, body, _ = self.download(season="2025-2026")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="season_stats.csv"')
+        lines = body.splitlines()
+        self.assertEqual(lines[0], "Player,Season,Games Played,Goals,Assists,Yellow Cards,Red Cards,Note moyenne")
+        self.assertEqual(sorted(lines[1:]), ["Léa N1,2025-2026,0,1,0,0,0,7.25", "Léa N2,2025-2026,0,2,0,0,0,7.25"])
+
+    def test_ndjson(self):
+        self.add_rows(2)
+        response, body, _ = self.download(output="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        rows = sorted((json.loads(line) for line in body.splitlines()), key=lambda row: row["goals"])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0], {
+            "player": "Léa N1", "season": "2025-2026", "games_played": 0, "goals": 1, "assists": 0,
+            "yellow_cards": 0, "red_cards": 0, "notes_moyenne_saison": "7.25",
+        })
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for output in ("csv", "ndjson"):
+            with self.subTest(output=output):
+                self.add_rows(2)
+                _, body, small = self.download(output=output)
+                self.add_rows(10)
+                _, large_body, large = self.download(output=output)
+                self.assertEqual(small, large)
+                self.assertGreater(len(large_body.splitlines()), len(body.splitlines()))
+
+    def test_invalid_output_is_400(self):
+        self.assertEqual(self.client.get(self.url, {"output": "xml"}).status_code, 400)
+
+
+# ------------------------
+# JSON orjson (api/renderers.py, api/parsers.py) : mêmes octets que DRF
+# ------------------------
+class FastJSONTests(TestCase):
+    data = {
+        "decimal": Decimal("7.25"),
+        "datetime": datetime(2025, 11, 1, 18, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        "naive": datetime(2025, 11, 1, 18, 30),
+        "date": date(2025, 11, 1),
+        "time": dt_time(18, 30, 15, 500),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "text": "Élodie — Québec 北京 🎉 \u2028\u2029 \"guillemets\" \\",
+        "numbers": [0, -3, 2 ** 53, 0.1, 1.5, None, True, False],
+        "nested": [{"vide": {}, "liste": []}],
+        1: "clé entière",
+    }
+
+    def test_renderer_matches_drf(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        with override_settings(API_JSON_BACKEND="json"):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        indented = "application/json; indent=2"
+        self.assertEqual(FastJSONRenderer().render(self.data, indented), JSONRenderer().render(self.data, indented))
+
+    def test_documented_float_differences(self):
+        self.assertEqual(FastJSONRenderer().render({"f": 1e16}), b'{"f":1e16}')
+        self.assertEqual(json.loads(FastJSONRenderer().render({"f": 1e16})), json.loads(JSONRenderer().render({"f": 1e16})))
+        self.assertEqual(FastJSONRenderer().render({"f": float("nan")}), b'{"f":null}')
+
+    def parse(self, parser, body, encoding="utf-8"):
+        return parser.parse(BytesIO(body), "application/json", {"encoding": encoding})
+
+    def test_parser_matches_drf(self):
+        body = '{"nom": "Élodie 北京 🎉", "n": [1, 2.5, -3e2, null, true], "o": {"\\u00e9": "\\n"}}'
+        for encoding in ("utf-8", "latin-1"):
+            if encoding == "latin-1":
+                body = body.replace(" 北京 🎉", "")
+            with self.subTest(encoding=encoding):
+                raw = body.encode(encoding)
+                self.assertEqual(self.parse(FastJSONParser(), raw, encoding), self.parse(JSONParser(), raw, encoding))
+
+    def test_parser_rejects_what_drf_rejects(self):
+        for body in (b"{", b'{"a": NaN}', b'{"a": Infinity}', b"\xff"):
+            for parser in (FastJSONParser(), JSONParser()):
+                with self.subTest(body=body, parser=type(parser).__name__), self.assertRaises(ParseError):
+                    self.parse(parser, body)
+
+    def test_malformed_body_is_400(self):
+        client = APIClient()
+        response = client.post("/api/auth/validate-email/", b'{"email": ', content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
+
+
+# ------------------------
+# Plans EXPLAIN et nombre de requêtes par URL, comparés à api/query_baseline.json.
+# Une requête en plus ou un nouveau parcours complet de table fait échouer le test.
+# Après un changement voulu : UPDATE_QUERY_BASELINE=1 python manage.py test api
+# ------------------------
+QUERY_BASELINE = Path(__file__).resolve().parent / "query_baseline.json"
+
+
+def explain_scans(sql, params):
+    """Tables lues en entier, sans index, par une requête SELECT (SQLite : SCAN, PostgreSQL : Seq Scan)."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[3] for row in cursor.fetchall()]
+            return [detail for detail in details if detail.startswith("SCAN ") and " USING " not in detail]
+        cursor.execute(f"EXPLAIN {sql}", params)
+        lines = [row[0].strip().lstrip("-> ") for row in cursor.fetchall()]
+        return [line.split("  (")[0] for line in lines if line.startswith("Seq Scan")]
+
+
+@FAST_HASHER
+class QueryBaselineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.player_user = User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+        User.objects.create_user(email="attente@test.com", password="pw")
+        cls.player = cls.player_user.player_profile
+        cls.event = Event.objects.create(
+            title="Match", event_type="Entrainement", location="Québec",
+            date_event=timezone.now() + timedelta(days=7),
+        )
+        cls.participation = Participation.objects.create(player=cls.player, event=cls.event)
+        cls.stats = SeasonStats.objects.create(player=cls.player, season_year="2025-2026", goals=3)
+        ReportAdmin.objects.create(title="Rapport", reporter_type="match", content="-", created_by_admin=cls.admin)
+
+    def url_cases(self):
+        """Libellé -> (nom de route, kwargs, query string) ; toutes les routes de api/urls.py y figurent."""
+        cases = {
+            "user_update": ("user_update", {"pk": self.player_user.pk}, ""),
+            "approve_user": ("approve_user", {"user_id": self.player_user.pk}, ""),
+            "delete_player_and_user": ("delete_player_and_user", {"pk": self.player.pk}, ""),
+            "admin_season_stats?season": ("admin_season_stats", {}, "?season=2025-2026"),
+            "season_stats_detail": ("season_stats_detail", {"pk": self.stats.pk}, ""),
+            "event_participations": ("event_participations", {"event_id": self.event.pk}, ""),
+            "player_participation_update": ("player_participation_update", {"pk": self.participation.pk}, ""),
+            "event-detail": ("event-detail", {"pk": self.event.pk}, ""),
+            "player-detail": ("player-detail", {"pk": self.player.pk}, ""),
+            "team_season_stats?group_by": ("team_season_stats", {}, "?group_by=season"),
+        }
+        for resource in ("season-stats", "participations", "reports"):
+            cases[f"admin_export:{resource}"] = ("admin_export", {"resource": resource}, "")
+        names = {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern)}
+        for name in names - {name for name, _, _ in cases.values()}:
+            cases[name] = (name, {}, "")
+        return cases
+
+    def record(self, name, kwargs, query):
+        client = APIClient()
+        client.force_authenticate(self.player_user if name.startswith(("player_", "my_")) else self.admin)
+        # Caches de réponses et de throttling vidés : chaque URL est mesurée à froid
+        caches["default"].clear()
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            response = client.get(reverse(name, kwargs=kwargs) + query)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        scans = []
+        for sql, params in statements:
+            if sql.lstrip().upper().startswith("SELECT"):
+                scans.extend(explain_scans(sql, params))
+        return {"status": response.status_code, "queries": len(statements), "scans": sorted(scans)}
+
+    def test_urls_match_baseline(self):
+        measured = {label: self.record(*case) for label, case in sorted(self.url_cases().items())}
+        baseline = json.loads(QUERY_BASELINE.read_text(encoding="utf-8")) if QUERY_BASELINE.exists() else {}
+
+        if os.environ.get("UPDATE_QUERY_BASELINE"):
+            baseline[connection.vendor] = measured
+            QUERY_BASELINE.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            return
+        if connection.vendor not in baseline:
+            self.skipTest(f"Pas de référence pour {connection.vendor} (UPDATE_QUERY_BASELINE=1 pour l'enregistrer)")
+
+        expected = baseline[connection.vendor]
+        self.assertEqual(sorted(measured), sorted(expected), "Routes ajoutées ou retirées : mettre la référence à jour")
+        for label, result in measured.items():
+            reference = expected[label]
+            with self.subTest(url=label):
+                self.assertEqual(result["status"], reference["status"])
+                self.assertLessEqual(
+                    result["queries"], reference["queries"],
+                    f"{label} : {result['queries']} requêtes au lieu de {reference['queries']}",
+                )
+                added = Counter(result["scans"]) - Counter(reference["scans"])
+                self.assertFalse(added, f"{label} : nouveaux parcours complets {sorted(added.elements())}")
+
+
+class QueryStatsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(QUERY_STATS_DIR=directory.name, QUERY_STATS_SLOW_MS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        querystats.reset()
+        self.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+
+    def test_fingerprint_normalizes_literals(self):
+        self.assertEqual(
+            querystats.fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"),
+            querystats.fingerprint("SELECT * FROM t WHERE a = 'y''z' AND b IN (%s) LIMIT 5"),
+        )
+
+    def test_endpoint_reports_routes_with_explain(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        client.get(reverse("admin_season_stats"))
+        client.get(reverse("admin_season_stats"))
+
+        results = client.get(reverse("query_stats")).json()["results"]
+        route = next(row for row in results if row["route"] == "admin_season_stats")
+        self.assertEqual(route["requests"], 2)
+        self.assertTrue(all(row["explain"] for row in route["queries"]))
+
+        player = User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+        client.force_authenticate(player)
+        self.assertEqual(client.get(reverse("query_stats")).status_code, 403)
+
+
+@FAST_HASHER
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS_DIR=directory.name, METRICS_TOKEN="jeton")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.registry.reset()
+        caches["default"].clear()
+        User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+
+    def scrape(self, **headers):
+        return APIClient().get(reverse("metrics"), **headers)
+
+    def test_requires_token(self):
+        self.assertEqual(self.scrape().status_code, 401)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION="Bearer autre").status_code, 401)
+
+    def test_exposes_latency_and_login_outcomes(self):
+        client = APIClient()
+        client.post(reverse("async_login"), {"email": "joueur@test.com", "password": "pw"}, format="json")
+        client.post(reverse("async_login"), {"email": "joueur@test.com", "password": "faux"}, format="json")
+
+        response = self.scrape(HTTP_AUTHORIZATION="Bearer jeton")
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        lines = response.content.decode().splitlines()
+        self.assertIn('api_login_attempts_total{route="async_login",outcome="success"} 1', lines)
+        self.assertIn('api_login_attempts_total{route="async_login",outcome="failure"} 1', lines)
+        self.assertIn('api_http_request_duration_seconds_count{route="async_login",method="POST",status="200"} 1', lines)
+        self.assertIn('api_http_request_duration_seconds_bucket{route="async_login",method="POST",status="401",le="+Inf"} 1', lines)
+        self.assertIn("api_workers 1", lines)
+
+    def write_worker_file(self, pid, logins, instance="ancien"):
+        counters = [["api_login_attempts_total", ["login", "success"], logins]]
+        snapshots.write_snapshot(settings.METRICS_DIR, metrics.SNAPSHOT_PREFIX,
+                                 {"counters": counters, "histograms": [], "buckets": list(metrics.buckets()),
+                                  "in_flight": 0, "instance": instance}, pid=pid)
+
+    def logins(self):
+        counters, _, _ = metrics.collect()
+        return counters[("api_login_attempts_total", ("login", "success"))]
+
+    def test_dead_workers_are_folded_into_one_file(self):
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        self.write_worker_file(dead.pid, 3)
+        self.assertEqual(self.logins(), 3)
+        self.assertEqual(self.logins(), 3)
+        files = sorted(path.name for path in Path(settings.METRICS_DIR).glob("metrics-*.json"))
+        self.assertEqual(files, [f"metrics-{os.getpid()}.json", "metrics-retired.json"])
+
+    def test_reused_pid_keeps_the_previous_totals(self):
+        self.write_worker_file(os.getpid(), 4)
+        metrics.inc("api_login_attempts_total", route="login", outcome="success")
+        self.assertEqual(self.logins(), 5)
+        self.assertEqual(self.logins(), 5)
+
+    def test_request_counters_start_the_flusher(self):
+        metrics.registry.request_started()
+        metrics.registry.request_finished()
+        self.assertEqual(metrics.registry.flusher_pid, os.getpid())
+
+
+# ------------------------
+# Connexion async (auth/login/)
+# ------------------------
+class CountingHasher(MD5PasswordHasher):
+    """MD5 (rapide) qui compte les hachages : verify() et make_password() passent par encode()."""
+    calls = 0
+
+    def encode(self, password, salt):
+        CountingHasher.calls += 1
+        return super().encode(password, salt)
+
+
+@override_settings(PASSWORD_HASHERS=["api.tests.CountingHasher"])
+class AsyncLoginTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+        User.objects.create_user(email="attente@test.com", password="pw", is_active=False)
+
+    def login(self, body, url="async_login"):
+        if isinstance(body, bytes):
+            return self.client.post(reverse(url), body, content_type="application/json")
+        return self.client.post(reverse(url), body, format="json")
+
+    def test_success_returns_tokens(self):
+        body = self.login({"email": " Joueur@Test.com ", "password": "pw"}).json()
+        self.assertEqual(body["email"], "joueur@test.com")
+        self.assertTrue(body["access"] and body["refresh"])
+
+    def test_malformed_json_has_the_sync_view_error_shape(self):
+        for url in ("async_login", "token_obtain_pair"):
+            with self.subTest(url=url):
+                response = self.login(b'{"email": ', url)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), ["detail"])
+        response = self.login({"email": "pas-un-email", "password": ""})
+        self.assertEqual(response.json(), {
+            "email": ["Format d'email invalide."], "password": ["Le mot de passe est requis."],
+        })
+
+    def test_unknown_user_and_wrong_password_look_the_same(self):
+        unknown = self.login({"email": "inconnu@test.com", "password": "pw"})
+        wrong = self.login({"email": "joueur@test.com", "password": "faux"})
+        self.assertEqual((unknown.status_code, wrong.status_code), (401, 401))
+        self.assertEqual(unknown.json(), wrong.json())
+
+    def test_unapproved_account_is_rejected(self):
+        response = self.login({"email": "attente@test.com", "password": "pw"})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("access", response.json())
+
+    def test_one_hash_per_attempt(self):
+        for email, password in (("joueur@test.com", "pw"), ("joueur@test.com", "faux"), ("inconnu@test.com", "pw")):
+            with self.subTest(email=email, password=password):
+                CountingHasher.calls = 0
+                self.login({"email": email, "password": password})
+                self.assertEqual(CountingHasher.calls, 1)
+
+
+# ------------------------
+# Noms d'utilisateur (api/utils.py)
+# ------------------------
+@FAST_HASHER
+class UsernameAllocationTests(TestCase):
+    def add(self, username):
+        return User.objects.create_user(email=f"{username}@exemple.com", password="pw", username=username)
+
+    def test_first_free_suffix(self):
+        self.assertEqual(allocate_username("john"), "john")
+        self.add("john")
+        self.add("john2")
+        self.add("johnny")
+        self.assertEqual(allocate_username("john"), "john1")
+        self.add("john1")
+        self.assertEqual(allocate_username("john"), "john3")
+
+    def test_single_query(self):
+        self.add("john")
+        with self.assertNumQueries(1):
+            allocate_username("john")
+
+    def test_retry_after_a_concurrent_registration(self):
+        self.add("john")
+        attempts = []
+
+        def allocate_then_race(base):
+            username = allocate_username(base)
+            if not attempts:
+                # Inscription concurrente validée entre l'allocation et l'INSERT
+                self.add(username)
+            attempts.append(username)
+            return username
+
+        def create(username):
+            return User.objects.create_user(email="john@test.com", password="pw", username=username)
+
+        with mock.patch("api.utils.allocate_username", side_effect=allocate_then_race):
+            user = create_with_unique_username("john", create)
+        self.assertEqual(attempts, ["john1", "john2"])
+        self.assertEqual(user.username, "john2")
+
+    def test_other_integrity_errors_are_raised(self):
+        self.add("john")
+
+        def create(username):
+            return User.objects.create_user(email="john@exemple.com", password="pw", username=username)
+
+        with self.assertRaises(IntegrityError):
+            create_with_unique_username("john", create)
+
+
+# ------------------------
+# Mesures par requête (PerformanceMiddleware)
+# ------------------------
+class PerformanceMiddlewareTests(TestCase):
+    url = "/api/events/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self):
+        with self.assertLogs("api.performance", "INFO") as logs:
+            response = self.client.get(self.url)
+        return response, [(record.levelname, json.loads(record.getMessage())) for record in logs.records]
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0, PERFORMANCE_SERVER_TIMING=True, PERFORMANCE_SLOW_MS=None)
+    def test_server_timing_and_log_line(self):
+        response, logs = self.get()
+        phases = [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+        self.assertEqual(phases[0], "db")
+        self.assertIn("view", phases)
+        self.assertEqual(phases[-1], "total")
+        self.assertRegex(response["Server-Timing"], r'^db;dur=\d+\.\d;desc="\d+ SQL"')
+
+        [(level, record)] = logs
+        self.assertEqual(level, "INFO")
+        self.assertEqual(
+            {key: record[key] for key in ("route", "method", "status")},
+            {"route": "event-list-create", "method": "GET", "status": 200},
+        )
+        self.assertGreater(record["db_queries"], 0)
+        self.assertIn("total_ms", record)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0, PERFORMANCE_SERVER_TIMING=False, PERFORMANCE_SLOW_MS=None)
+    def test_header_can_be_turned_off(self):
+        response, logs = self.get()
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(len(logs), 1)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0.25, PERFORMANCE_SLOW_MS=None)
+    def test_sample_rate(self):
+        with mock.patch("api.middleware.random.random", return_value=0.5):
+            with self.assertNoLogs("api.performance"):
+                response = self.client.get(self.url)
+            self.assertNotIn("Server-Timing", response)
+        with mock.patch("api.middleware.random.random", return_value=0.1):
+            response, logs = self.get()
+        self.assertIn("Server-Timing", response)
+        self.assertEqual(len(logs), 1)
+
+        with override_settings(PERFORMANCE_SAMPLE_RATE=0), self.assertNoLogs("api.performance"):
+            self.client.get(self.url)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0, PERFORMANCE_SLOW_MS=0)
+    def test_slow_requests_are_warnings(self):
+        _, [(level, record)] = self.get()
+        self.assertEqual(level, "WARNING")
+        self.assertIn("db_queries", record)
+
+        # Hors échantillon : durée totale seule
+        with override_settings(PERFORMANCE_SAMPLE_RATE=0):
+            response, [(level, record)] = self.get()
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(level, "WARNING")
+        self.assertEqual(set(record), {"route", "method", "status", "total_ms"})
+
+
+# ------------------------
+# Fan-out des participations
+# ------------------------
+@FAST_HASHER
+class ParticipationFanoutTests(TestCase):
+    def test_counts_only_inserted_rows(self):
+        first = User.objects.create_user(email="un@test.com", password="pw", is_approved=True).player_profile
+        event = Event.objects.create(
+            title="Match", event_type="Entrainement", location="Québec",
+            date_event=timezone.now() + timedelta(days=7),
+        )
+        second = User.objects.create_user(email="deux@test.com", password="pw", is_approved=True).player_profile
+        Participation.objects.create(player=first, event=event)
+
+        self.assertEqual(bulk_create_participations([first.id, second.id], [event.id]), 1)
+        self.assertEqual(bulk_create_participations([first.id, second.id], [event.id]), 0)
+        self.assertEqual(Participation.objects.filter(event=event).count(), 2)
+
+
+# ------------------------
+# Pagination par clé
+# ------------------------
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Entrainement {i}", event_type="Entrainement", location="Québec",
+                # Deux événements par date : l'id départage
+                date_event=now + timedelta(days=1 + i // 2),
+            )
+            for i in range(7)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        caches["default"].clear()
+
+    def test_cursor_round_trip(self):
+        seen, url, pages = [], "/api/events/?page_size=2", []
+        while url:
+            page = self.client.get(url).json()
+            pages.append(page)
+            seen += [event["id"] for event in page["results"]]
+            url = page["next"]
+        self.assertEqual(sorted(seen), sorted(str(event.id) for event in self.events))
+        self.assertEqual(len(seen), len(set(seen)))
+
+        # previous depuis la dernière page renvoie l'avant-dernière
+        previous = self.client.get(pages[-1]["previous"]).json()
+        self.assertEqual(previous["results"], pages[-2]["results"])
+
+    def test_tampered_cursor_is_404(self):
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        for cursor in (
+            "pas-du-base64!",
+            encode({"x": 1}),
+            encode({"v": ["2025-01-01T00:00:00Z"]}),
+            encode({"v": ["2025-01-01T00:00:00Z", "nope"]}),
+            encode({"v": ["pas une date", str(self.events[0].id)]}),
+            encode({"v": [None, None]}),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(f"/api/events/?cursor={cursor}").status_code, 404)
+
+    def test_season_stats_keep_the_email_tiebreak(self):
+        players = {}
+        for email in ["zoe@test.com", "alex@test.com", "marc@test.com"]:
+            players[email] = User.objects.create_user(email=email, password="pw", is_approved=True).player_profile
+            SeasonStats.objects.create(player=players[email], season_year="2025-2026")
+            SeasonStats.objects.create(player=players[email], season_year="2024-2025")
+
+        seen, url = [], "/api/admin/season-stats/?page_size=2"
+        while url:
+            page = self.client.get(url).json()
+            seen += [(row["season_year"], row["player"]) for row in page["results"]]
+            url = page["next"]
+        expected = [(season, str(players[email].id)) for season in ("2025-2026", "2024-2025") for email in sorted(players)]
+        self.assertEqual(seen, expected)
+
+
+# ------------------------
+# Chemin rapide (FastListMixin) : même JSON que le serializer DRF
+# ------------------------
+@FAST_HASHER
+class FastListParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.player_user = User.objects.create_user(
+            email="joueur@test.com", password="pw", is_approved=True, first_name="Léa", last_name="Tremblay",
+        )
+        # Sans nom : le nom affiché retombe sur l'email
+        anonymous = User.objects.create_user(email="sans-nom@test.com", password="pw", is_approved=True, first_name="", last_name="")
+        for user, goals, note in ((cls.player_user, 3, Decimal("7.25")), (anonymous, 0, None)):
+            SeasonStats.objects.create(player=user.player_profile, season_year="2025-2026", goals=goals, notes_moyenne_saison=note)
+        Event.objects.create(
+            title="Match", event_type="Match", opponent="Laval", location="Québec",
+            date_event=timezone.now() + timedelta(days=3, microseconds=123456),
+        )
+        Event.objects.create(
+            title="Entrainement", event_type="Entrainement", location="Québec", description="Terrain 2",
+            date_event=timezone.now() + timedelta(days=5),
+        )
+
+    @staticmethod
+    def fast_views():
+        """(nom de route, classe) des routes de liste servies par FastListMixin."""
+        for pattern in urls.urlpatterns:
+            view = getattr(pattern.callback, "cls", None)
+            actions = getattr(pattern.callback, "actions", None) or {"get": "list"}
+            if view and issubclass(view, FastListMixin) and actions.get("get") == "list":
+                yield pattern.name, view
+
+    def fetch(self, name):
+        client = APIClient()
+        client.force_authenticate(self.player_user if name.startswith(("player_", "my_")) else self.admin)
+        caches["default"].clear()
+        response = client.get(reverse(name))
+        self.assertEqual(response.status_code, 200, name)
+        return response.json()
+
+    def test_fast_path_matches_serializer(self):
+        views = list(self.fast_views())
+        self.assertGreaterEqual(len(views), 4)
+        for name, view in views:
+            with self.subTest(route=name):
+                fast = self.fetch(name)
+                self.assertTrue(fast["results"], name)
+                with mock.patch.object(view, "fast_list", False):
+                    slow = self.fetch(name)
+                self.assertEqual(fast, slow)
+
+
+# ------------------------
+# ?fields= / ?omit=
+# ------------------------
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.player = User.objects.create_user(
+            email="joueur@test.com", password="pw", is_approved=True, first_name="Léa", last_name="Tremblay",
+        ).player_profile
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        caches["default"].clear()
+
+    def test_fields_on_list_and_detail(self):
+        for url in ("/api/admin/players/", f"/api/admin/players/{self.player.id}/"):
+            with self.subTest(url=url):
+                body = self.client.get(url, {"fields": "id,user.first_name"}).json()
+                item = body["results"][0] if "results" in body else body
+                self.assertEqual(item, {"id": str(self.player.id), "user": {"first_name": "Léa"}})
+
+    def test_omit_on_list_and_detail(self):
+        full = self.client.get(f"/api/admin/players/{self.player.id}/").json()
+        for url in ("/api/admin/players/", f"/api/admin/players/{self.player.id}/"):
+            with self.subTest(url=url):
+                body = self.client.get(url, {"omit": "position,user.bio"}).json()
+                item = body["results"][0] if "results" in body else body
+                self.assertNotIn("position", item)
+                self.assertNotIn("bio", item["user"])
+                self.assertEqual(item["user"]["email"], full["user"]["email"])
+                self.assertEqual(set(full) - set(item), {"position"})
+
+    def test_pruning_a_joined_relation(self):
+        # user est joint par le queryset de la vue : le retirer ne doit pas le garder dans select_related
+        cases = [
+            ({"fields": "id"}, {"id": str(self.player.id)}),
+            ({"fields": "jersey_number"}, {"jersey_number": None}),
+            ({"fields": "inconnu"}, {}),
+        ]
+        for url in ("/api/admin/players/", f"/api/admin/players/{self.player.id}/"):
+            for params, expected in cases:
+                with self.subTest(url=url, params=params):
+                    response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
+                    body = response.json()
+                    self.assertEqual(body["results"][0] if "results" in body else body, expected)
+            with self.subTest(url=url, params="omit=user"):
+                response = self.client.get(url, {"omit": "user"})
+                self.assertEqual(response.status_code, 200)
+                body = response.json()
+                self.assertNotIn("user", body["results"][0] if "results" in body else body)
+
+    def test_writes_ignore_fields(self):
+        response = self.client.patch(
+            f"/api/admin/players/{self.player.id}/?fields=id", {"position": "Gardien"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["position"], "Gardien")
+
+
+# ------------------------
+# Liste des événements : borne « à venir » et filtres
+# ------------------------
+class EventListFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.now = timezone.now()
+
+        def event(title, days, event_type="Match", **extra):
+            return Event.objects.create(
+                title=title, event_type=event_type, location="Québec",
+                date_event=cls.now + timedelta(days=days), **extra,
+            )
+
+        event("Match Laval", 2, opponent="FC Laval")
+        event("Entrainement", 5, event_type="Entrainement")
+        event("Tournoi", 10, event_type="Tournoi", opponent="Laval United")
+        # save() refuse une date passée
+        Event.objects.filter(pk=event("Match passé", 1, opponent="FC Laval").pk).update(
+            date_event=cls.now - timedelta(days=1),
+        )
+        event("Match annulé", 3, opponent="AS Lévis", is_cancelled=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        caches["default"].clear()
+
+    def titles(self, **params):
+        response = self.client.get("/api/events/", params)
+        self.assertEqual(response.status_code, 200)
+        return {event["title"] for event in response.json()["results"]}
+
+    def test_default_is_upcoming_and_not_cancelled(self):
+        self.assertEqual(self.titles(), {"Match Laval", "Entrainement", "Tournoi"})
+
+    def test_cutoff_is_computed_per_request(self):
+        Event.objects.create(title="Bientôt", event_type="Entrainement", location="Québec",
+                             date_event=self.now + timedelta(hours=1))
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            self.assertIn("Bientôt", self.titles())
+        with mock.patch("django.utils.timezone.now", return_value=self.now + timedelta(hours=2)):
+            self.assertNotIn("Bientôt", self.titles())
+
+    def test_each_filter_narrows_the_list(self):
+        cases = [
+            ({"event_type": "Match"}, {"Match Laval"}),
+            ({"opponent": "laval"}, {"Match Laval", "Tournoi"}),
+            ({"from": (self.now - timedelta(days=2)).date().isoformat()},
+             {"Match passé", "Match Laval", "Entrainement", "Tournoi"}),
+            ({"to": (self.now + timedelta(days=6)).date().isoformat()}, {"Match Laval", "Entrainement"}),
+            ({"from": (self.now + timedelta(days=4)).isoformat(), "to": (self.now + timedelta(days=6)).isoformat()},
+             {"Entrainement"}),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.titles(**params), expected)
+
+    def test_invalid_dates_are_400(self):
+        for name, value in (("from", "demain"), ("to", "2025-13-40"), ("from", "2025-01-01T25:00")):
+            with self.subTest(**{name: value}):
+                response = self.client.get("/api/events/", {name: value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(name, response.json())
+
+
+# ------------------------
+# GET conditionnels (ETag / 304)
+# ------------------------
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.events = [
+            Event.objects.create(
+                title=f"Entrainement {i}", event_type="Entrainement", location="Québec",
+                date_event=timezone.now() + timedelta(days=2 + i),
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        caches["default"].clear()
+
+    def test_not_modified_then_invalidated_by_update(self):
+        url = f"/api/events/{self.events[0].id}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.patch(url, {"location": "Lévis"}, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["location"], "Lévis")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_changes_on_delete(self):
+        etag = self.client.get("/api/events/")["ETag"]
+        self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.events[1].delete()
+        response = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_cached_list_skips_the_probe(self):
+        etag = self.client.get("/api/events/")["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get("/api/events/")
+            not_modified = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertFalse([q["sql"] for q in queries if "api_event" in q["sql"]])
+
+    def test_cached_view_etag_changes_on_write(self):
+        etag = self.client.get("/api/admin/available-seasons/")["ETag"]
+        self.assertEqual(self.client.get("/api/admin/available-seasons/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        player = User.objects.create_user(email="joueur@test.com", password="pw").player_profile
+        SeasonStats.objects.create(player=player, season_year="2025-2026")
+        response = self.client.get("/api/admin/available-seasons/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+# ------------------------
+# Authentification JWT : cache des utilisateurs et révocation
+# ------------------------
+@FAST_HASHER
+class CachedJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+
+    def setUp(self):
+        user_cache.clear()
+        caches["default"].clear()
+        self.client = APIClient()
+        token = CustomTokenObtainPairSerializer.get_token(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_event(self):
+        return self.client.post("/api/events/", {
+            "title": "Match", "event_type": "Entrainement", "location": "Québec",
+            "date_event": (timezone.now() + timedelta(days=3)).isoformat(),
+        }, format="json")
+
+    def test_writes_reload_user_revoked_on_another_worker(self):
+        self.assertEqual(self.client.get("/api/events/").status_code, 200)
+        self.assertEqual(self.create_event().status_code, 201)
+
+        # update() : aucun signal, comme une désactivation faite par un autre worker
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        self.assertEqual(self.create_event().status_code, 401)
+        User.objects.filter(pk=self.admin.pk).delete()
+        self.assertEqual(self.create_event().status_code, 401)
+
+    def test_save_invalidates_cached_user(self):
+        self.assertEqual(self.client.get("/api/admin/players/").status_code, 200)
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertEqual(self.client.get("/api/admin/players/").status_code, 401)
+
+    def test_current_user_body_matches_etag(self):
+        first = self.client.get("/api/auth/current-user/")
+        self.assertEqual(self.client.get("/api/auth/current-user/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        User.objects.filter(pk=self.admin.pk).update(first_name="Nouveau", updated_at=timezone.now() + timedelta(seconds=1))
+        response = self.client.get("/api/auth/current-user/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.json()["first_name"], "Nouveau")
+
+
+# ------------------------
+# Limitation des endpoints publics
+# ------------------------
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates})
+
+
+@FAST_HASHER
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+
+    @throttle_rates(**{"validate_email.ip": "3/min"})
+    def test_ratelimit_headers_then_429(self):
+        remaining = []
+        for i in range(3):
+            response = self.client.post("/api/auth/validate-email/", {"email": f"libre{i}@test.com"}, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["RateLimit-Limit"], "3")
+            remaining.append(response["RateLimit-Remaining"])
+        self.assertEqual(remaining, ["2", "1", "0"])
+
+        response = self.client.post("/api/auth/validate-email/", {"email": "libre@test.com"}, format="json")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(response["RateLimit-Remaining"], "0")
+
+    @throttle_rates(**{"login.identifier": "2/min", "validate_login.identifier": "20/min"})
+    def test_validate_login_does_not_consume_login_attempts(self):
+        credentials = {"email": "joueur@test.com", "password": "pw"}
+        for _ in range(5):
+            self.assertEqual(self.client.post("/api/auth/validate-login/", credentials, format="json").status_code, 200)
+
+        self.assertEqual(self.client.post("/api/auth/login/", credentials, format="json").status_code, 200)
+        self.assertEqual(self.client.post("/api/auth/token/", credentials, format="json").status_code, 200)
+        # Portée login partagée par les deux routes de connexion, par email quelle que soit l'IP
+        self.assertEqual(self.client.post("/api/auth/login/", credentials, format="json").status_code, 429)
+
+    @throttle_rates(**{"compte.user": "1/min"})
+    def test_base_throttle_is_per_user_then_per_ip(self):
+        throttle_class = type("CompteThrottle", (ScopedSlidingWindowThrottle,), {"scope": "compte"})
+        user = User.objects.get(email="joueur@test.com")
+        other = User.objects.create_user(email="autre@test.com", password="pw")
+        factory = APIRequestFactory()
+
+        def allowed(as_user, ip="10.0.0.1"):
+            request = Request(factory.get("/", REMOTE_ADDR=ip))
+            request.user = as_user or AnonymousUser()
+            return throttle_class().allow_request(request, None)
+
+        self.assertEqual([allowed(user), allowed(user), allowed(other)], [True, False, True])
+        self.assertEqual([allowed(None), allowed(None), allowed(None, ip="10.0.0.2")], [True, False, True])
+
+
+# ------------------------
+# Approbation groupée
+# ------------------------
+@FAST_HASHER
+class BulkApproveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.pending = User.objects.create_user(email="attente@test.com", password="pw", is_active=False)
+        cls.other = User.objects.create_user(email="autre@test.com", password="pw", is_active=False)
+        cls.active = User.objects.create_user(email="actif@test.com", password="pw", is_approved=True)
+        cls.event = Event.objects.create(
+            title="Match", event_type="Entrainement", location="Québec",
+            date_event=timezone.now() + timedelta(days=7),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def approve(self, ids):
+        response = self.client.post("/api/admin/approve-players/", {"ids": [str(i) for i in ids]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_statuses_per_id(self):
+        missing = uuid.uuid4()
+        body = self.approve([self.pending.id, self.active.id, missing, self.pending.id])
+        self.assertEqual(body["approved"], 1)
+        self.assertEqual(
+            [(row["id"], row["status"]) for row in body["results"]],
+            [(str(self.pending.id), "approved"), (str(self.active.id), "already_active"), (str(missing), "not_found")],
+        )
+        self.assertEqual(Participation.objects.filter(player__user=self.pending, event=self.event).count(), 1)
+
+        body = self.approve([self.pending.id])
+        self.assertEqual(body["results"][0]["status"], "already_active")
+
+    def test_approved_but_inactive_account(self):
+        User.objects.filter(pk=self.other.pk).update(is_approved=True)
+        body = self.approve([self.other.id, self.pending.id])
+        self.assertEqual([row["status"] for row in body["results"]], ["already_approved", "approved"])
+        self.assertFalse(User.objects.get(pk=self.other.pk).is_active)
+
+    def test_locked_database_is_a_conflict(self):
+        with mock.patch("api.views.bulk_approve_users", side_effect=OperationalError("database is locked")):
+            response = self.client.post("/api/admin/approve-players/", {"ids": [str(self.pending.id)]}, format="json")
+        self.assertEqual(response.status_code, 409)
+
+
+# ------------------------
+# Actions groupées sur les joueurs : admin/players/bulk/
+# ------------------------
+@FAST_HASHER
+class PlayerBulkTests(TestCase):
+    url = "/api/admin/players/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.players = [
+            User.objects.create_user(email=f"joueur{i}@test.com", password="pw").player_profile for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def errors_by_index(self, response):
+        self.assertEqual(response.status_code, 400)
+        return {error["index"]: error["errors"] for error in response.json()["errors"]}
+
+    def test_create_reports_every_failing_item_and_writes_nothing(self):
+        without_profile = User.objects.create_user(email="sans@test.com", password="pw")
+        without_profile.player_profile.delete()
+        payload = [
+            {"user": str(without_profile.id), "position": "Gardien"},
+            {"user": str(self.admin.id)},
+            {"user": str(without_profile.id)},
+            {"user": str(uuid.uuid4())},
+            {"user": "pas-un-uuid"},
+        ]
+        errors = self.errors_by_index(self.client.post(self.url, payload, format="json"))
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertFalse(Player.objects.filter(user=without_profile).exists())
+
+        response = self.client.post(self.url, payload[:1], format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Player.objects.get(user=without_profile).position, "Gardien")
+
+    def test_partial_update_is_all_or_nothing(self):
+        first, second, _ = self.players
+        payload = [
+            {"id": str(first.id), "jersey_number": 7},
+            {"id": str(uuid.uuid4()), "jersey_number": 8},
+            {"id": str(second.id), "jersey_number": -1},
+            {"id": str(first.id), "jersey_number": 9},
+        ]
+        errors = self.errors_by_index(self.client.patch(self.url, payload, format="json"))
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        first.refresh_from_db()
+        self.assertIsNone(first.jersey_number)
+
+        response = self.client.patch(self.url, payload[:1], format="json")
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        self.assertEqual(first.jersey_number, 7)
+
+    def test_destroy_indexes_match_the_request_and_flag_duplicates(self):
+        first, second, third = self.players
+        missing = uuid.uuid4()
+        ids = [str(first.id), str(first.id), str(missing), str(second.id)]
+        errors = self.errors_by_index(self.client.delete(self.url, {"ids": ids}, format="json"))
+        self.assertEqual(sorted(errors), [1, 2])
+        self.assertEqual(Player.objects.count(), 3)
+
+        response = self.client.delete(self.url, {"ids": [str(first.id), str(second.id)]}, format="json")
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(list(Player.objects.values_list("id", flat=True)), [third.id])
+        self.assertFalse(User.objects.filter(email="joueur0@test.com").exists())
+
+
+# ------------------------
+# Cache des réponses (api/cache.py)
+# ------------------------
+@FAST_HASHER
+class ResponseCacheTests(TestCase):
+    url = "/api/admin/players/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="admin@test.com", password="pw")
+        cls.player = User.objects.create_user(email="joueur@test.com", password="pw").player_profile
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def jersey_numbers(self):
+        return [row["jersey_number"] for row in self.client.get(self.url).json()["results"]]
+
+    def test_second_read_is_served_from_cache(self):
+        self.jersey_numbers()
+        with CaptureQueriesContext(connection) as queries:
+            self.jersey_numbers()
+        self.assertFalse([q for q in queries if "api_player" in q["sql"]])
+
+    def test_writes_invalidate_cached_lists(self):
+        self.assertEqual(self.jersey_numbers(), [None])
+
+        response = self.client.patch(f"{self.url}{self.player.id}/", {"jersey_number": 4}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.jersey_numbers(), [4])
+
+        response = self.client.patch(f"{self.url}bulk/", [{"id": str(self.player.id), "jersey_number": 5}], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.jersey_numbers(), [5])
+
+        # Écriture hors vue : le signal post_save invalide aussi
+        self.player.jersey_number = 6
+        self.player.save()
+        self.assertEqual(self.jersey_numbers(), [6])
+
+    @override_settings(RESPONSE_CACHE_LOCK_WAIT=0.05)
+    def test_waiting_for_a_stuck_computation_is_bounded(self):
+        # Verrou tenu par un calcul qui ne se termine pas
+        with mock.patch.object(caches["default"], "add", return_value=False):
+            start = time.monotonic()
+            value = get_or_compute("clé", ("api.player",), lambda: "calculé")
+        self.assertEqual(value, "calculé")
+        self.assertLess(time.monotonic() - start, 1)
+
+
+# ------------------------
+# Cache de requêtes (api/querycache.py)
+# TransactionTestCase : .cached() ne sert jamais le cache dans une transaction
+# ------------------------
+@FAST_HASHER
+class QueryCacheTests(TransactionTestCase):
+    def setUp(self):
+        caches["default"].clear()
+        version_memo.forget(["api_player"])
+        self.user = User.objects.create_user(email="joueur@test.com", password="pw", is_approved=True)
+        self.player = self.user.player_profile
+
+    def cached_position(self):
+        return Player.objects.cached().get(pk=self.player.pk).position
+
+    def player_queries(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            value = func()
+        return value, [q for q in queries if 'FROM "api_player"' in q["sql"]]
+
+    def set_position_behind_the_cache(self, position):
+        # Écriture d'un autre worker dont ce processus n'a pas encore vu la version
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE api_player SET position = %s WHERE id = %s", [position, self.player.pk.hex])
+
+    def test_hit_until_the_version_changes(self):
+        self.cached_position()
+        position, queries = self.player_queries(self.cached_position)
+        self.assertEqual((position, queries), ("", []))
+
+        self.player.position = "Gardien"
+        self.player.save()
+        self.assertEqual(self.cached_position(), "Gardien")
+
+        Player.objects.filter(pk=self.player.pk).update(position="Ailier")
+        self.assertEqual(self.cached_position(), "Ailier")
+
+    def test_versions_are_bumped_on_commit_not_inside_the_transaction(self):
+        self.cached_position()
+        with transaction.atomic():
+            Player.objects.filter(pk=self.player.pk).update(position="Gardien")
+            # Dans la transaction : lecture en base, jamais servie ni remplie par le cache
+            position, queries = self.player_queries(self.cached_position)
+            self.assertEqual(position, "Gardien")
+            self.assertTrue(queries)
+        self.assertEqual(self.cached_position(), "Gardien")
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Player.objects.filter(pk=self.player.pk).update(position="Ailier")
+            raise RuntimeError
+        self.assertEqual(self.cached_position(), "Gardien")
+
+    def test_profile_writes_start_from_the_database_row(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/api/player/profile/").json()["position"], "")
+        self.set_position_behind_the_cache("Gardien")
+        self.assertEqual(client.get("/api/player/profile/").json()["position"], "")
+
+        response = client.patch("/api/player/profile/", {"jersey_number": 9}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["position"], "Gardien")
+        self.player.refresh_from_db()
+        self.assertEqual((self.player.position, self.player.jersey_number), ("Gardien", 9))
+
+
+# ------------------------
+# Index des emails (api/email_index.py)
+# ------------------------
+@FAST_HASHER
+class EmailIndexTests(TestCase):
+    def setUp(self):
+        email_index.reset()
+        self.addCleanup(email_index.reset)
+        User.objects.create_user(email="joueur@test.com", password="pw")
+
+    def test_built_by_the_first_request(self):
+        APIClient().get("/api/events/")
+        with self.assertNumQueries(0):
+            self.assertFalse(email_exists("inconnu@test.com"))
+        with self.assertNumQueries(1):
+            self.assertTrue(email_exists("joueur@test.com"))
@@ -0,0 +1,106 @@
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .email_index import normalize_email
+
+RATE_LIMIT_ATTR = 'rate_limit'
+
+
+def record_rate_limit(request, limit, remaining, reset):
+    """Garde, pour les en-têtes RateLimit-*, la limite la plus proche d'être atteinte."""
+    request = getattr(request, '_request', request)
+    current = getattr(request, RATE_LIMIT_ATTR, None)
+    if current is None or remaining < current[1]:
+        setattr(request, RATE_LIMIT_ATTR, (limit, remaining, reset))
+
+
+class ScopedSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Fenêtre glissante de DRF (historique des horodatages en cache), avec :
+    - un cache interchangeable (THROTTLE_CACHE_ALIAS, 'default' : locmem par processus) ;
+    - un taux lu dans DEFAULT_THROTTLE_RATES sous '<scope>.<kind>' ; absent = pas de limite ;
+    - l'état de la limite publié pour RateLimitHeadersMiddleware.
+    Utilisée telle quelle, elle limite par utilisateur connecté (par IP pour un anonyme),
+    comme UserRateThrottle de DRF ; les sous-classes changent kind et get_ident_value.
+    """
+    kind = 'user'
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f'{self.scope}.{self.kind}')
+
+    def get_ident_value(self, request):
+        """Valeur qui distingue les clients dans la clé de cache ; None = requête non limitée."""
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return str(user.pk)
+        return self.get_ident(request)
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': f'{self.scope}.{self.kind}', 'ident': ident}
+
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        if self.rate is not None and getattr(self, 'key', None) is not None:
+            reset = self.duration - (self.now - self.history[-1]) if self.history else self.duration
+            remaining = max(self.num_requests - len(self.history), 0)
+            record_rate_limit(request, self.num_requests, remaining, math.ceil(reset))
+        return allowed
+
+
+class IPRateThrottle(ScopedSlidingWindowThrottle):
+    """Limite par adresse IP (X-Forwarded-For selon NUM_PROXIES)."""
+    kind = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class IdentifierRateThrottle(ScopedSlidingWindowThrottle):
+    """Limite par identifiant visé (email normalisé), quelle que soit l'IP : freine le bourrage d'identifiants."""
+    kind = 'identifier'
+    field = 'email'
+    identifier = None  # fourni directement pour les vues hors DRF
+
+    def get_ident_value(self, request):
+        value = self.identifier
+        if value is None:
+            data = getattr(request, 'data', None)
+            value = data.get(self.field) if hasattr(data, 'get') else None
+        return normalize_email(str(value)) if value else None
+
+
+def scoped_throttles(scope, identifier_field=None):
+    """
+    Classes de throttle pour une vue : par IP, et par identifiant si identifier_field est donné.
+    Taux dans REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] : '<scope>.ip', '<scope>.identifier'.
+    """
+    throttles = [type(f'{scope}IPRateThrottle', (IPRateThrottle,), {'scope': scope})]
+    if identifier_field:
+        throttles.append(type(
+            f'{scope}IdentifierRateThrottle', (IdentifierRateThrottle,),
+            {'scope': scope, 'field': identifier_field},
+        ))
+    return throttles
+
+
+def check_throttles(request, throttle_classes, identifier=None):
+    """Pour les vues hors DRF : None si la requête passe, sinon l'attente conseillée (s)."""
+    waits = []
+    for throttle_class in throttle_classes:
+        throttle = throttle_class()
+        if identifier is not None and isinstance(throttle, IdentifierRateThrottle):
+            throttle.identifier = identifier
+        if not throttle.allow_request(request, None):
+            waits.append(throttle.wait() or throttle.duration)
+    return max(waits) if waits else None
@@ -3,13 +3,13 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.routers import DefaultRouter
 from .views import (
     # Auth
-    RegisterView, CurrentUserView, CustomTokenObtainPairView,
+    RegisterView, CurrentUserView, CustomTokenObtainPairView, async_login,
 
     # Admin
-    UnapprovedUserListView, ApproveUserView,ApprovedUserListView,
+    UnapprovedUserListView, ApproveUserView, BulkApproveUserView, ApprovedUserListView,
     SeasonStatsAdminListView, SeasonStatsDetailView,
     EventParticipationView, ReportAdminCreateView, ReportAdminListView, TeamSeasonStatsView, AvailableSeasonsView,
-    CreateSeasonStatsView, DeletePlayerAndUserView,
+    CreateSeasonStatsView, DeletePlayerAndUserView, ExportView, QueryStatsView,
     # Player
     PlayerProfileView, PlayerParticipationUpdateView, MyParticipationsView,
     MySeasonStatsView,PlayerViewSet,UserUpdateView,
@@ -29,6 +29,7 @@ urlpatterns = [
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/current-user/', CurrentUserView.as_view(), name='current_user'),
     path('auth/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/login/', async_login, name='async_login'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
     # ------------------------
@@ -38,6 +39,7 @@ urlpatterns = [
     path('admin/unapproved-users/', UnapprovedUserListView.as_view(), name='unapproved_users'),
     path('admin/approved-users/', ApprovedUserListView.as_view(), name='approved_users'),
     path('admin/approve-player/<uuid:user_id>/', ApproveUserView.as_view(), name='approve_user'),
+    path('admin/approve-players/', BulkApproveUserView.as_view(), name='bulk_approve_users'),
     path('admin/players/<uuid:pk>/delete-both/', DeletePlayerAndUserView.as_view(), name='delete_player_and_user'),
     # path('admin/players/', PlayerListView.as_view(), name='player_list'),
     path('admin/season-stats/', SeasonStatsAdminListView.as_view(), name='admin_season_stats'),
@@ -48,6 +50,8 @@ urlpatterns = [
     path('admin/event/<uuid:event_id>/participations/', EventParticipationView.as_view(), name='event_participations'),
     path('admin/reports/', ReportAdminListView.as_view(), name='report_admin_list'),
     path('admin/reports/create/', ReportAdminCreateView.as_view(), name='report_admin_create'),
+    path('admin/exports/<str:resource>/', ExportView.as_view(), name='admin_export'),
+    path('admin/query-stats/', QueryStatsView.as_view(), name='query_stats'),
 
     # ------------------------
     # ⚽ Player-only routes
@@ -1,3 +1,21 @@
+import itertools
+import logging
+import threading
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .authentication import invalidate_cached_user
+from .cache import invalidate_models
+from .models import Event, Participation, Player, User
+
+logger = logging.getLogger(__name__)
+
+
 def approve_user(user, admin_user):
     if not admin_user.is_authenticated or admin_user.role != 'admin':
         raise PermissionError("Seul un administrateur peut approuver les utilisateurs.")
@@ -5,4 +23,239 @@ def approve_user(user, admin_user):
         raise ValueError("L'utilisateur est déjà approuvé.")
     user.is_approved = True
     user.is_active = True
-    user.save()
\ No newline at end of file
+    user.save()
+    invalidate_cached_user(user.pk)
+
+
+APPROVAL_MESSAGES = {
+    'approved': "Utilisateur approuvé avec succès.",
+    'already_active': "L'utilisateur est déjà actif.",
+    'already_approved': "L'utilisateur est déjà approuvé.",
+    'not_found': "Utilisateur introuvable.",
+}
+
+
+def _approval_statuses(user_ids, users, approved_at):
+    statuses = {}
+    for user_id in user_ids:
+        row = users.get(user_id)
+        if row is None:
+            statuses[user_id] = 'not_found'
+        elif row['updated_at'] == approved_at:
+            statuses[user_id] = 'approved'
+        elif row['is_active']:
+            statuses[user_id] = 'already_active'
+        else:
+            # L'UPDATE couvre tous les comptes en attente : seul reste approuvé mais inactif
+            statuses[user_id] = 'already_approved'
+    return statuses
+
+
+def bulk_approve_users(user_ids, admin_user):
+    """
+    Approbation groupée : un UPDATE des comptes en attente, une lecture, un bulk_create des
+    Player manquants, puis le rattachement aux événements à venir. Renvoie un statut par id
+    (mêmes règles que l'approbation unitaire), dans l'ordre reçu.
+    """
+    if not admin_user.is_authenticated or admin_user.role != 'admin':
+        raise PermissionError("Seul un administrateur peut approuver les utilisateurs.")
+
+    user_ids = list(dict.fromkeys(user_ids))
+    approved_at = timezone.now()
+    with transaction.atomic():
+        # L'écriture d'abord : elle prend le verrou (base entière sous SQLite, lignes ailleurs) avant
+        # toute lecture. Une lecture suivie d'une écriture échoue sous SQLite (« database is locked »)
+        # quand une autre approbation écrit entre les deux ; un UPDATE attend son tour.
+        # update() ne déclenche ni save() ni signal : updated_at posé à la main, il repère aussi
+        # les comptes approuvés par cet appel.
+        User.objects.filter(id__in=user_ids, is_active=False, is_approved=False).update(
+            is_approved=True, is_active=True, updated_at=approved_at,
+        )
+        users = {
+            row['id']: row
+            for row in User.objects.filter(id__in=user_ids).values('id', 'role', 'is_active', 'is_approved', 'updated_at')
+        }
+        statuses = _approval_statuses(user_ids, users, approved_at)
+        to_approve = [user_id for user_id, state in statuses.items() if state == 'approved']
+
+        player_user_ids = [user_id for user_id in to_approve if users[user_id]['role'] == 'player']
+        if player_user_ids:
+            # ignore_conflicts : le signal create_user_profile a souvent déjà créé le profil
+            Player.objects.bulk_create(
+                [Player(user_id=user_id) for user_id in player_user_ids],
+                ignore_conflicts=True, batch_size=_fanout_batch_size(),
+            )
+            backfill_participations(
+                Player.objects.filter(user_id__in=player_user_ids).values_list('id', flat=True)
+            )
+
+    for user_id in to_approve:
+        invalidate_cached_user(user_id)
+    if to_approve:
+        invalidate_models(User, Player)
+    return [
+        {'id': str(user_id), 'status': state, 'detail': APPROVAL_MESSAGES[state]}
+        for user_id, state in statuses.items()
+    ]
+
+
+def allocate_username(base):
+    """
+    Premier nom libre parmi base, base1, base2... en une seule requête (préfixe indexé),
+    au lieu d'une requête par suffixe essayé.
+    """
+    taken = set(User.objects.filter(username__startswith=base).values_list('username', flat=True))
+    if base not in taken:
+        return base
+    suffixes = {int(name[len(base):]) for name in taken if name[len(base):].isdigit()}
+    suffix = 1
+    while suffix in suffixes:
+        suffix += 1
+    return f"{base}{suffix}"
+
+
+def create_with_unique_username(base, create, attempts=5):
+    """
+    Appelle create(username) avec un nom alloué par allocate_username. Si une inscription
+    concurrente a pris le même nom entre-temps (IntegrityError), on réalloue et on réessaie.
+    """
+    for attempt in range(attempts):
+        username = allocate_username(base)
+        try:
+            with transaction.atomic():
+                return create(username)
+        except IntegrityError:
+            # Autre contrainte (email...) ou dernier essai : l'erreur remonte telle quelle
+            if attempt == attempts - 1 or not User.objects.filter(username=username).exists():
+                raise
+
+
+def parse_datetime_param(params, name, end_of_day=False):
+    """
+    Lit un paramètre de requête date ('2025-11-01') ou date-heure ISO 8601.
+    Une date seule vaut le début du jour, ou le lendemain 00:00 si end_of_day (borne exclusive).
+    """
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        day = parse_date(raw)
+        if day is not None:
+            if end_of_day:
+                day += timedelta(days=1)
+            value = datetime.combine(day, time.min)
+        else:
+            value = parse_datetime(raw)
+            if value is None:
+                raise ValueError
+    except ValueError:
+        raise ValidationError({name: "Date invalide (format attendu : AAAA-MM-JJ ou ISO 8601)."})
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+# ------------------------
+# Participations (fan-out joueurs x événements)
+# ------------------------
+
+def _fanout_batch_size():
+    return getattr(settings, "PARTICIPATION_FANOUT_BATCH_SIZE", 500)
+
+
+def _fanout_defer_threshold():
+    # Au-delà de ce nombre de lignes, l'insertion est reportée hors de la requête.
+    # None désactive le report.
+    return getattr(settings, "PARTICIPATION_FANOUT_DEFER_THRESHOLD", 5000)
+
+
+def bulk_create_participations(player_ids, event_ids):
+    """
+    Insère les participations manquantes (joueurs x événements) par lots, dans une seule transaction.
+    Renvoie le nombre de lignes absentes avant chaque lot, c'est-à-dire réellement insérées
+    (hors insertion concurrente du même couple, ignorée par la contrainte d'unicité).
+    """
+    batch_size = _fanout_batch_size()
+    event_ids = list(event_ids)
+    created = 0
+    if not event_ids:
+        return created
+
+    pairs = ((player_id, event_id) for player_id in player_ids for event_id in event_ids)
+    with transaction.atomic():
+        while True:
+            batch = list(itertools.islice(pairs, batch_size))
+            if not batch:
+                break
+            existing = set(
+                Participation.objects.filter(
+                    player_id__in={player_id for player_id, _ in batch},
+                    event_id__in={event_id for _, event_id in batch},
+                ).values_list('player_id', 'event_id')
+            )
+            missing = [
+                Participation(player_id=player_id, event_id=event_id, will_attend=False, notified=False)
+                for player_id, event_id in batch if (player_id, event_id) not in existing
+            ]
+            # ignore_conflicts : unique_together (player, event) protège des doublons concurrents
+            Participation.objects.bulk_create(missing, batch_size=batch_size, ignore_conflicts=True)
+            created += len(missing)
+        # bulk_create n'émet pas post_save
+        invalidate_models(Participation)
+    return created
+
+
+def _run_in_background(player_ids, event_ids):
+    """
+    Fan-out dans un thread démon après le commit. Rien n'est persisté : si le worker s'arrête
+    ou est recyclé pendant l'insertion, les participations manquantes se rattrapent avec
+    backfill_participations (idempotent), à relancer d'après les logs de début / fin.
+    """
+    def target():
+        close_old_connections()
+        logger.info(
+            "Fan-out des participations démarré : %d joueur(s) x %d événement(s)",
+            len(player_ids), len(event_ids),
+        )
+        try:
+            created = bulk_create_participations(player_ids, event_ids)
+        except Exception:
+            logger.exception(
+                "Échec du fan-out des participations en arrière-plan (%d joueur(s) x %d événement(s)) : "
+                "relancer backfill_participations", len(player_ids), len(event_ids),
+            )
+        else:
+            logger.info("Fan-out des participations terminé : %d participation(s) créée(s)", created)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=target, name="participation-fanout", daemon=True).start()
+
+
+def _schedule_participations(player_ids, event_ids, rows):
+    threshold = _fanout_defer_threshold()
+    if threshold is not None and rows >= threshold:
+        # Gros effectif : on répond tout de suite et on insère après le commit
+        transaction.on_commit(lambda: _run_in_background(player_ids, event_ids))
+        return 0
+    return bulk_create_participations(player_ids, event_ids)
+
+
+def create_event_participations(event):
+    """Crée une participation pour chaque joueur lors de la création d'un événement."""
+    player_ids = list(Player.objects.values_list('id', flat=True))
+    return _schedule_participations(player_ids, [event.id], len(player_ids))
+
+
+def backfill_participations(players):
+    """
+    Rattache des joueurs (nouvellement approuvés) aux événements à venir déjà existants.
+    Idempotent : sert aussi à rattraper un fan-out en arrière-plan interrompu (voir _run_in_background).
+    """
+    player_ids = [getattr(player, 'pk', player) for player in players]
+    if not player_ids:
+        return 0
+    event_ids = list(
+        Event.objects.filter(is_cancelled=False, date_event__gte=timezone.now()).values_list('id', flat=True)
+    )
+    return _schedule_participations(player_ids, event_ids, len(player_ids) * len(event_ids))
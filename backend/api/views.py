@@ -1,16 +1,31 @@
+import json
+import math
 import re
+import uuid
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated , IsAdminUser
-from rest_framework.exceptions import NotFound
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated , IsAdminUser
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, OperationalError, transaction
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from django.utils.crypto import constant_time_compare
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.exceptions import NotAuthenticated
+from .authentication import acheck_password, ahash_password
+from .cache import CachedListMixin, cache_response, invalidate_models, model_tag
+from .email_index import email_exists
 from .models import User, Player, SeasonStats, Participation, ReportAdmin, Event
-from django.db.models import Sum, Avg, Max
+from .mixins import AutoPrefetchMixin, ConditionalGetMixin, FastListMixin
+from .prefetch import plan_queryset
 from .permissions import RoleBasedAccess
 from .serializers import (
     RegisterSerializer,
@@ -24,9 +39,16 @@ from .serializers import (
     ReportAdminSerializer,
     EventSerializer,
     ApprovedUserSerializer,
+    IdListSerializer,
+    PlayerBulkCreateSerializer,
+    BULK_MAX_ITEMS,
 )
 
-from .utils import approve_user
+from .exports import CONTENT_TYPES, EXPORTS, ExportContentNegotiation, streaming_export_response
+from . import metrics, querystats
+from .stats import get_team_season_stats
+from .throttling import check_throttles, scoped_throttles
+from .utils import approve_user, backfill_participations, bulk_approve_users, parse_datetime_param
 
 # ------------------------
 # User Registration
@@ -35,19 +57,88 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_classes = scoped_throttles('register', identifier_field='email')
 
 # ------------------------
 # JWT Login
 # ------------------------
+# Portée partagée par les connexions (token, login async) ; validate_login, appelé en même temps
+# par le frontend, a la sienne pour ne pas consommer les essais de connexion
+LOGIN_THROTTLES = scoped_throttles('login', identifier_field='email')
+VALIDATE_LOGIN_THROTTLES = scoped_throttles('validate_login', identifier_field='email')
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = LOGIN_THROTTLES
+
+# ------------------------
+# Async Login (un seul hachage, hors de la boucle d'événements)
+# ------------------------
+def _login_error(errors, status=400):
+    # Même forme que les ValidationError DRF de CustomTokenObtainPairSerializer
+    return JsonResponse({field: [message] for field, message in errors.items()}, status=status)
+
+
+# Email inconnu ou mot de passe faux : même réponse, on ne révèle pas quels comptes existent
+INVALID_CREDENTIALS = {"password": "Les identifiants sont invalides."}
+
+
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """
+    Remplace validate_login + auth/token/ : une seule vérification du mot de passe,
+    exécutée dans un pool borné (voir api/authentication.py), puis les tokens.
+    Identifiants invalides : 401, même corps et un hachage, que l'email existe ou non.
+    """
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return JsonResponse({"detail": "JSON invalide."}, status=400)
+
+    email = str(data.get("email", "")).strip().lower()
+    password = str(data.get("password", ""))
+    errors = CustomTokenObtainPairSerializer.check_credentials_format(email, password)
+    if errors:
+        return _login_error(errors)
+
+    wait = await sync_to_async(check_throttles)(request, LOGIN_THROTTLES, identifier=email)
+    if wait is not None:
+        retry_after = math.ceil(wait)
+        response = JsonResponse({"detail": f"Trop de tentatives. Réessayez dans {retry_after} secondes."}, status=429)
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    try:
+        user = await User.objects.aget(email=email)
+    except User.DoesNotExist:
+        await ahash_password(password)
+        return _login_error(INVALID_CREDENTIALS, status=401)
+
+    if not await acheck_password(user, password):
+        return _login_error(INVALID_CREDENTIALS, status=401)
+    if not user.is_active:
+        return _login_error({"email": "Le compte utilisateur n'est pas actif."})
+    if not user.is_approved:
+        return _login_error({"email": "Le compte n'est pas encore approuvé."})
+
+    return JsonResponse(CustomTokenObtainPairSerializer.token_response(user))
 
 # ------------------------
 # Current User Info
 # ------------------------
-class CurrentUserView(generics.RetrieveAPIView):
+class CurrentUserView(ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    conditional_last_modified = True
+    # Corps sérialisé depuis request.user : relu en base pour correspondre à l'ETag de la sonde
+    fresh_user = True
+
+    def get_conditional_queryset(self):
+        return User.objects.filter(pk=self.request.user.pk)
 
     def get_object(self):
         return self.request.user
@@ -55,23 +146,40 @@ class CurrentUserView(generics.RetrieveAPIView):
 # ------------------------
 # Player Profile View (for player to update their own profile)
 # ------------------------
-class PlayerProfileView(generics.RetrieveUpdateAPIView):
+class PlayerProfileView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = PlayerProfileSerializer
     permission_classes = [IsAuthenticated]
+    # bio et photo viennent du User : sa date de modification compte aussi
+    conditional_timestamp_fields = ('updated_at', 'user__updated_at')
+    conditional_last_modified = True
+    fresh_user = True
+
+    def get_conditional_queryset(self):
+        return Player.objects.filter(user=self.request.user)
+
     def get_object(self):
+        # Lecture depuis le cache de requêtes ; une écriture part de la ligne en base, car save()
+        # réécrit tous les champs et écraserait une modification pas encore vue par ce worker
+        read = self.request.method in SAFE_METHODS
+        queryset = Player.objects.cached() if read else Player.objects.select_related('user')
         try:
-            return self.request.user.player_profile
+            player = queryset.get(user_id=self.request.user.pk)
         except Player.DoesNotExist:
             raise NotFound("Profil joueur non trouvé.")
+        if read:
+            # bio et photo lues sur l'utilisateur de la requête (rechargé en base : fresh_user)
+            player.user = self.request.user
+        return player
 
 
 # ------------------------
 # List of Unapproved Users (admin only)
 # ------------------------
-class UnapprovedUserListView(generics.ListAPIView):
+class UnapprovedUserListView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = UnapprovedUserSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('email', 'id')
 
     def get_queryset(self):
         return User.objects.filter(is_approved=False).exclude(role='admin')
@@ -79,10 +187,11 @@ class UnapprovedUserListView(generics.ListAPIView):
 # ------------------------
 # List of Unapproved Users (admin only)
 # ------------------------
-class ApprovedUserListView(generics.ListAPIView):
+class ApprovedUserListView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = ApprovedUserSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('email', 'id')
 
     def get_queryset(self):
         return User.objects.filter(is_approved=True).exclude(role='admin')
@@ -107,13 +216,37 @@ class ApproveUserView(APIView):
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         if user_to_approve.role == 'player':
-            Player.objects.get_or_create(user=user_to_approve)
+            player, _ = Player.objects.get_or_create(user=user_to_approve)
+            # Le joueur rejoint les événements à venir déjà planifiés
+            backfill_participations([player])
         return Response({"detail": f"User {user_to_approve.email} approuvé avec succès."}, status=status.HTTP_200_OK)
 
+# ------------------------
+# Bulk Approve Users (admin only)
+# ------------------------
+class BulkApproveUserView(APIView):
+    """POST {"ids": [...]} : approuve une vague d'inscriptions en un aller-retour, statut par id."""
+    permission_classes = [RoleBasedAccess]
+    admin_only = True
+
+    def post(self, request):
+        serializer = IdListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            results = bulk_approve_users(serializer.validated_data['ids'], request.user)
+        except PermissionError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        except OperationalError:
+            # SQLite : verrou d'écriture encore tenu par une autre approbation au bout du délai d'attente
+            return Response({"detail": "Une autre approbation est en cours, réessayez."},
+                            status=status.HTTP_409_CONFLICT)
+        approved = sum(result['status'] == 'approved' for result in results)
+        return Response({"approved": approved, "results": results}, status=status.HTTP_200_OK)
+
 # ------------------------
 # Admin View of All Players
 # ------------------------
-class PlayerListView(generics.ListAPIView):
+class PlayerListView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = PlayerSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
@@ -125,37 +258,172 @@ class PlayerListView(generics.ListAPIView):
 # Player ViewSet for Admin
 from rest_framework import viewsets
 
-class PlayerViewSet(viewsets.ModelViewSet):
-    serializer_class = PlayerSerializer
-    permission_classes = [RoleBasedAccess]
-    admin_only = True
 
-    def get_queryset(self):
-        return Player.objects.select_related('user').filter(user__is_approved=True)
+def _as_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
 
-# ------------------------
-# Player ViewSet for Admin
-from rest_framework import viewsets
 
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(CachedListMixin, FastListMixin, AutoPrefetchMixin, viewsets.ModelViewSet):
     queryset = Player.objects.select_related('user').all()
     serializer_class = PlayerSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    # Ordre de liste changé (avant : équipe, maillot, email) : jersey_number est nullable et une
+    # comparaison avec NULL ferait sauter des lignes à la pagination par clé ; created_at ne l'est pas
+    keyset_ordering = ('team_name', 'created_at', 'id')
+    cache_tags = (model_tag(Player), model_tag(User))
+
+    # ------------------------
+    # Actions groupées : admin/players/bulk/
+    # Tout le lot est validé d'abord ; la moindre erreur renvoie 400 avec les erreurs
+    # par élément et rien n'est écrit. Sinon, une seule transaction.
+    # ------------------------
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        handler = {'POST': self.bulk_create, 'PATCH': self.bulk_partial_update, 'DELETE': self.bulk_destroy}
+        return handler[request.method](request)
+
+    def _bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise DRFValidationError({"detail": "Une liste non vide d'éléments est attendue."})
+        if len(items) > BULK_MAX_ITEMS:
+            raise DRFValidationError({"detail": f"{BULK_MAX_ITEMS} éléments au maximum par requête."})
+        return items
+
+    @staticmethod
+    def _bulk_errors(errors):
+        return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _bulk_response(self, player_ids, status_code):
+        players = plan_queryset(Player.objects.filter(id__in=player_ids), self.get_serializer_class())
+        return Response(self.get_serializer(players, many=True).data, status=status_code)
+
+    def bulk_create(self, request):
+        """POST [{"user": <uuid>, "position": ..., ...}] : profils joueurs créés en un bulk_create."""
+        items = self._bulk_items(request)
+        serializers_ = [PlayerBulkCreateSerializer(data=item) for item in items]
+        valid = [serializer.is_valid() for serializer in serializers_]
+
+        user_ids = [serializer.validated_data['user'] for serializer, ok in zip(serializers_, valid) if ok]
+        roles = dict(User.objects.filter(id__in=user_ids).values_list('id', 'role'))
+        with_profile = set(Player.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+
+        errors, seen = [], set()
+        for index, (serializer, ok) in enumerate(zip(serializers_, valid)):
+            if not ok:
+                errors.append({"index": index, "errors": serializer.errors})
+                continue
+            user_id = serializer.validated_data['user']
+            if user_id not in roles:
+                message = "Utilisateur introuvable."
+            elif roles[user_id] != 'player':
+                message = "Le profil joueur ne peut être créé que pour les utilisateurs ayant le rôle 'player'."
+            elif user_id in with_profile or user_id in seen:
+                message = "Cet utilisateur a déjà un profil joueur."
+            else:
+                seen.add(user_id)
+                continue
+            errors.append({"index": index, "errors": {"user": [message]}})
+        if errors:
+            return self._bulk_errors(errors)
+
+        players = [
+            Player(user_id=data.pop('user'), **data)
+            for data in (dict(serializer.validated_data) for serializer in serializers_)
+        ]
+        try:
+            with transaction.atomic():
+                Player.objects.bulk_create(players, batch_size=BULK_MAX_ITEMS)
+                invalidate_models(Player)
+                # Les nouveaux joueurs rejoignent les événements à venir
+                backfill_participations(players)
+        except IntegrityError:
+            return Response({"detail": "Un profil joueur a été créé en parallèle pour l'un de ces utilisateurs."},
+                            status=status.HTTP_409_CONFLICT)
+        return self._bulk_response([player.pk for player in players], status.HTTP_201_CREATED)
+
+    def bulk_partial_update(self, request):
+        """PATCH [{"id": <uuid>, "jersey_number": 10, ...}] : un seul bulk_update."""
+        items = self._bulk_items(request)
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        players = Player.objects.select_related('user').in_bulk(
+            [player_uuid for player_uuid in map(_as_uuid, ids) if player_uuid is not None]
+        )
+
+        errors, changed, fields = [], {}, set()
+        for index, (item, player_id) in enumerate(zip(items, ids)):
+            player = players.get(_as_uuid(player_id))
+            if player is None:
+                errors.append({"index": index, "id": player_id, "errors": {"id": ["Joueur introuvable."]}})
+                continue
+            if player.pk in changed:
+                errors.append({"index": index, "id": player_id, "errors": {"id": ["Joueur présent deux fois dans le lot."]}})
+                continue
+            serializer = self.get_serializer(player, data=item, partial=True)
+            if not serializer.is_valid():
+                errors.append({"index": index, "id": player_id, "errors": serializer.errors})
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(player, field, value)
+                fields.add(field)
+            changed[player.pk] = player
+        if errors:
+            return self._bulk_errors(errors)
+
+        if fields:
+            # bulk_update ne passe pas par save() : updated_at posé à la main
+            now = timezone.now()
+            for player in changed.values():
+                player.updated_at = now
+            with transaction.atomic():
+                Player.objects.bulk_update(list(changed.values()), sorted(fields | {'updated_at'}), batch_size=BULK_MAX_ITEMS)
+                invalidate_models(Player)
+        return self._bulk_response(changed.keys(), status.HTTP_200_OK)
+
+    def bulk_destroy(self, request):
+        """DELETE {"ids": [...]} : joueurs et comptes supprimés en une suppression en cascade."""
+        serializer = IdListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        users = dict(Player.objects.filter(id__in=ids).values_list('id', 'user__is_superuser'))
+
+        # index : position dans la liste reçue, doublons compris
+        errors, seen = [], set()
+        for index, player_id in enumerate(ids):
+            if player_id not in users:
+                errors.append({"index": index, "id": str(player_id), "errors": {"id": ["Joueur introuvable."]}})
+            elif player_id in seen:
+                errors.append({"index": index, "id": str(player_id), "errors": {"id": ["Joueur présent deux fois dans le lot."]}})
+            elif users[player_id]:
+                errors.append({"index": index, "id": str(player_id),
+                               "errors": {"id": ["Vous ne pouvez pas supprimer un utilisateur superadmin."]}})
+            seen.add(player_id)
+        if errors:
+            return self._bulk_errors(errors)
+
+        # Supprimer les User emporte Player, Participation et SeasonStats (on_delete=CASCADE)
+        with transaction.atomic():
+            User.objects.filter(player_profile__id__in=ids).delete()
+        return Response({"deleted": len(ids)}, status=status.HTTP_200_OK)
 
 # ------------------------
 # SeasonStats Serializer
 # ------------------------
-class SeasonStatsAdminView(generics.ListCreateAPIView):
+class SeasonStatsAdminView(FastListMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = SeasonStats.objects.all()
     serializer_class = SeasonStatsSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('-season_year', 'player__user__email', 'id')
 
 # ------------------------
 # SeasonStats Detail View (for admin to update stats)
 # ------------------------
-class SeasonStatsDetailView(generics.RetrieveUpdateAPIView):
+class SeasonStatsDetailView(AutoPrefetchMixin, generics.RetrieveUpdateAPIView):
     queryset = SeasonStats.objects.all()
     serializer_class = SeasonStatsSerializer
     permission_classes = [RoleBasedAccess]
@@ -165,10 +433,11 @@ class SeasonStatsDetailView(generics.RetrieveUpdateAPIView):
 # ------------------------
 #  SeasonStats List View with Filtering (admin only)
 # ------------------------
-class SeasonStatsAdminListView(generics.ListAPIView):
+class SeasonStatsAdminListView(FastListMixin, AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = SeasonStatsSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('-season_year', 'player__user__email', 'id')
 
     def get_queryset(self):
         season = self.request.query_params.get('season')
@@ -178,10 +447,11 @@ class SeasonStatsAdminListView(generics.ListAPIView):
 # ------------------------
 # My SeasonStats View (for players to view their own stats)
 # ------------------------
-class MySeasonStatsView(generics.ListAPIView):
+class MySeasonStatsView(FastListMixin, AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = SeasonStatsSerializer
     permission_classes = [RoleBasedAccess]
     player_only = True
+    keyset_ordering = ('-season_year', 'player__user__email', 'id')
 
     def get_queryset(self):
         user = self.request.user
@@ -202,73 +472,27 @@ class MySeasonStatsView(generics.ListAPIView):
 
 class TeamSeasonStatsView(APIView):
     permission_classes = [IsAuthenticated]
+    claims_only_user = True
 
     def get(self, request):
         season = request.query_params.get("season")
         group_by = request.query_params.get("group_by")
+        return Response(get_team_season_stats(season, group_by))
 
-        stats = SeasonStats.objects.all()
-        if season:
-            stats = stats.filter(season_year=season)
-
-        if group_by == "season":
-            grouped = {}
-            for year in stats.values_list("season_year", flat=True).distinct():
-                season_stats = stats.filter(season_year=year)
-                aggregated = season_stats.aggregate(
-                    total_goals=Sum("goals"),
-                    total_assists=Sum("assists"),
-                    total_yellow=Sum("yellow_cards"),
-                    total_red=Sum("red_cards"),
-                    moyenne_notes=Avg("notes_moyenne_saison"),
-                    max_games=Max("games_played"),
-                )
-
-                grouped[year] = {
-                    "season": year,
-                    "players_count": season_stats.count(),
-                    "max_games_played": aggregated["max_games"] or 0,
-                    "total_goals": aggregated["total_goals"] or 0,
-                    "total_assists": aggregated["total_assists"] or 0,
-                    "total_yellow_cards": aggregated["total_yellow"] or 0,
-                    "total_red_cards": aggregated["total_red"] or 0,
-                    "average_rating": round(aggregated["moyenne_notes"] or 0, 2),
-                }
-
-            return Response({
-                "grouped_by_season": grouped,
-                "distinct_seasons": len(grouped),
-            })
-
-        aggregated = stats.aggregate(
-            total_goals=Sum("goals"),
-            total_assists=Sum("assists"),
-            total_yellow=Sum("yellow_cards"),
-            total_red=Sum("red_cards"),
-            moyenne_notes=Avg("notes_moyenne_saison"),
-            max_games=Max("games_played"),
-        )
-
-        return Response({
-            "season": season or "Toutes",
-            "players_count": stats.count(),
-            "max_games_played": aggregated["max_games"] or 0,
-            "total_goals": aggregated["total_goals"] or 0,
-            "total_assists": aggregated["total_assists"] or 0,
-            "total_yellow_cards": aggregated["total_yellow"] or 0,
-            "total_red_cards": aggregated["total_red"] or 0,
-            "average_rating": round(aggregated["moyenne_notes"] or 0, 2),
-            "distinct_seasons": stats.values_list("season_year", flat=True).distinct().count(),
-        })
 # ------------------------
 # Available Seasons View (admin only)
 # ------------------------
 
-class AvailableSeasonsView(APIView):
+class AvailableSeasonsView(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
+    claims_only_user = True
 
+    def get_conditional_queryset(self):
+        return SeasonStats.objects.all()
+
+    @cache_response((model_tag(SeasonStats),))
     def get(self, request):
-        seasons = SeasonStats.objects.values_list("season_year", flat=True).distinct().order_by("-season_year")
+        seasons = SeasonStats.objects.cached().values_list("season_year", flat=True).distinct().order_by("-season_year")
         return Response(list(seasons))
     
 class CreateSeasonStatsView(APIView):
@@ -284,17 +508,18 @@ class CreateSeasonStatsView(APIView):
 # ------------------------
 # Event Participation View (admin only)
 # ------------------------
-class EventParticipationView(generics.ListAPIView):
+class EventParticipationView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = ParticipationSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('player__user__email', 'id')
 
     def get_queryset(self):
         event_id = self.kwargs['event_id']
         return Participation.objects.filter(event__id=event_id)
 
 
-class PlayerParticipationUpdateView(generics.UpdateAPIView):
+class PlayerParticipationUpdateView(AutoPrefetchMixin, generics.UpdateAPIView):
     serializer_class = ParticipationSerializer
     permission_classes = [RoleBasedAccess]
     player_only = True
@@ -310,16 +535,18 @@ class ReportAdminCreateView(generics.CreateAPIView):
     permission_classes = [RoleBasedAccess]
     admin_only = True
 
-class ReportAdminListView(generics.ListAPIView):
+class ReportAdminListView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = ReportAdminSerializer
     permission_classes = [RoleBasedAccess]
     admin_only = True
+    keyset_ordering = ('-created_at', 'id')
     queryset = ReportAdmin.objects.all()
 
-class MyParticipationsView(generics.ListAPIView):
+class MyParticipationsView(AutoPrefetchMixin, generics.ListAPIView):
     serializer_class = ParticipationSerializer
     permission_classes = [RoleBasedAccess]
     player_only = True
+    keyset_ordering = ('event__date_event', 'id')
 
     def get_queryset(self):
         user = self.request.user
@@ -327,15 +554,111 @@ class MyParticipationsView(generics.ListAPIView):
             raise NotAuthenticated("Vous devez être connecté pour accéder à cette ressource.")
         return Participation.objects.filter(player__user=self.request.user)
 
-class EventListCreateView(generics.ListCreateAPIView):
-    queryset = Event.objects.filter(is_cancelled=False,date_event__gte=timezone.now())
+# ------------------------
+# Streaming exports (admin only)
+# ------------------------
+class ExportView(APIView):
+    """Export CSV / NDJSON en streaming : /admin/exports/<season-stats|participations|reports>/?output=ndjson"""
+    permission_classes = [RoleBasedAccess]
+    admin_only = True
+    content_negotiation_class = ExportContentNegotiation
+
+    def get(self, request, resource):
+        if resource not in EXPORTS:
+            raise NotFound("Export inconnu.")
+        export, model = EXPORTS[resource]
+
+        output = request.query_params.get('output', 'csv')
+        if output not in CONTENT_TYPES:
+            return Response({"detail": "Format d'export invalide (csv ou ndjson)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            queryset = export.filter(model.objects.all(), request.query_params)
+        except (ValueError, DjangoValidationError):
+            return Response({"detail": "Filtre d'export invalide."}, status=status.HTTP_400_BAD_REQUEST)
+        return streaming_export_response(export, queryset, output)
+
+# ------------------------
+# Query stats (admin only)
+# ------------------------
+class QueryStatsView(APIView):
+    """Journal des requêtes SQL de tous les workers : ?by=route|fingerprint&sort=total|count|max|per_request&limit=&route="""
+    permission_classes = [RoleBasedAccess]
+    admin_only = True
+
+    def get(self, request):
+        by = request.query_params.get('by', 'route')
+        sort = request.query_params.get('sort', 'total')
+        if by not in ('route', 'fingerprint') or sort not in querystats.SORT_KEYS:
+            return Response({"detail": "Paramètre by ou sort invalide."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, int(request.query_params.get('limit', 20)))
+        except ValueError:
+            return Response({"detail": "limit doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(querystats.report(by=by, sort=sort, limit=limit, route=request.query_params.get('route')))
+
+    def delete(self, request):
+        querystats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+# ------------------------
+# Prometheus metrics
+# ------------------------
+@require_GET
+def metrics_view(request):
+    """
+    /metrics au format texte Prometheus, agrégé sur tous les workers (api/metrics.py).
+    Jeton METRICS_TOKEN exigé en en-tête Authorization: Bearer ; sans jeton configuré, ouvert en DEBUG seulement.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    elif not settings.DEBUG:
+        return HttpResponse(status=404)
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+class EventListCreateView(ConditionalGetMixin, CachedListMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = EventSerializer
     permission_classes = [RoleBasedAccess]
+    claims_only_user = True
+    keyset_ordering = ('-date_event', 'id')
+    cache_tags = (model_tag(Event),)
+    cache_timeout = 60
+
+    def cache_variant(self, request):
+        # Sans « from », la borne avance avec l'heure : une entrée par minute, un événement
+        # passé ne reste pas plus d'une minute dans la liste en cache
+        if request.query_params.get('from'):
+            return ""
+        return timezone.now().strftime('%Y-%m-%dT%H:%M')
+
+    def get_queryset(self):
+        params = self.request.query_params
+        # Borne "à venir" calculée à chaque requête (et non à l'import du module)
+        date_from = parse_datetime_param(params, 'from') or timezone.now()
+        queryset = Event.objects.filter(is_cancelled=False, date_event__gte=date_from)
+
+        date_to = parse_datetime_param(params, 'to', end_of_day=True)
+        if date_to:
+            queryset = queryset.filter(date_event__lt=date_to)
+
+        event_type = params.get('event_type')
+        if event_type:
+            queryset = queryset.filter(event_type=event_type)
+
+        opponent = params.get('opponent')
+        if opponent:
+            queryset = queryset.filter(opponent__icontains=opponent)
+
+        return queryset
 
-class EventRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class EventRetrieveUpdateDestroyView(ConditionalGetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [RoleBasedAccess]
+    claims_only_user = True
+    conditional_last_modified = True
 
 
 # ------------------------
@@ -344,6 +667,7 @@ class EventRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(scoped_throttles('validate_email', identifier_field='email'))
 def validate_email(request):
     email = request.data.get("email", "").strip().lower()
     pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]{2,}$"
@@ -354,7 +678,7 @@ def validate_email(request):
     if not re.fullmatch(pattern, email):
         return Response({"error": "Format d'email invalide."}, status=400)
 
-    if User.objects.filter(email=email).exists():
+    if email_exists(email):
         return Response({"error": "Cet email est déjà utilisé."}, status=409)
 
     return Response({"success": "L'email est disponible."}, status=200)
@@ -363,6 +687,7 @@ def validate_email(request):
 # validate password strength
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(scoped_throttles('validate_password'))
 def validate_password(request):
     password = request.data.get("password", "")
 
@@ -387,6 +712,7 @@ def validate_password(request):
 #validate login
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(VALIDATE_LOGIN_THROTTLES)
 def validate_login(request):
     email = request.data.get("email", "").strip().lower()
     password = request.data.get("password", "")
@@ -408,7 +734,7 @@ def validate_login(request):
     except User.DoesNotExist:
         return Response({"error": "Les identifiants sont invalides."}, status=401)
 
-class UserUpdateView(generics.RetrieveUpdateDestroyAPIView):
+class UserUpdateView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'pk'
@@ -1,7 +1,7 @@
 import os 
 import dj_database_url
 from .settings import *
-from .settings import BASE_DIR
+from .settings import BASE_DIR, CACHES, LOGGING, REST_FRAMEWORK
 
 ALLOWED_HOSTS = [os.environ.get('RENDER_EXTERNAL_HOSTNAME')]
 CSRF_TRUSTED_ORIGINS = [
@@ -15,7 +15,11 @@ SECRET_KEY = os.environ.get('SECRET_KEY')
 
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.QueryStatsMiddleware',
+    'api.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.RateLimitHeadersMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -26,6 +30,54 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# En production : JSON uniquement (pas d'API navigable), servi par orjson
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('api.renderers.FastJSONRenderer',),
+    # Derrière le proxy de Render : l'IP client est la dernière entrée de X-Forwarded-For
+    'NUM_PROXIES': 1,
+}
+API_JSON_BACKEND = os.environ.get('API_JSON_BACKEND', 'orjson')
+
+# Mesures par requête : 5 % des requêtes par défaut, lignes JSON dans les logs de Render
+PERFORMANCE_SAMPLE_RATE = float(os.environ.get('PERFORMANCE_SAMPLE_RATE', '0.05'))
+PERFORMANCE_SERVER_TIMING = os.environ.get('PERFORMANCE_SERVER_TIMING', 'true').lower() == 'true'
+PERFORMANCE_SLOW_MS = float(os.environ.get('PERFORMANCE_SLOW_MS', '1000'))
+QUERY_STATS_SLOW_MS = float(os.environ.get('QUERY_STATS_SLOW_MS', '200'))
+if os.environ.get('QUERY_STATS_DIR'):
+    QUERY_STATS_DIR = os.environ['QUERY_STATS_DIR']
+# /metrics : fermé sans METRICS_TOKEN ; METRICS_DIR doit être local et partagé par les workers d'une même instance
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+if os.environ.get('METRICS_DIR'):
+    METRICS_DIR = os.environ['METRICS_DIR']
+LOGGING = {
+    **LOGGING,
+    'loggers': {
+        **LOGGING['loggers'],
+        'api.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Cache des réponses partagé par les workers gunicorn : RESPONSE_CACHE_BACKEND = 'db' (par défaut,
+# table créée par createcachetable dans build.sh), 'file' (RESPONSE_CACHE_DIR, même machine) ou
+# 'locmem'. Avec 'locmem', chaque worker a son cache et ses versions d'étiquettes : une écriture
+# n'invalide que le cache du worker qui l'a traitée, à réserver à un seul worker.
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'db')
+if RESPONSE_CACHE_BACKEND == 'db':
+    CACHES = {**CACHES, 'responses': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'api_response_cache',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }}
+    RESPONSE_CACHE_ALIAS = 'responses'
+elif RESPONSE_CACHE_BACKEND == 'file':
+    CACHES = {**CACHES, 'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('RESPONSE_CACHE_DIR', '/tmp/api_response_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }}
+    RESPONSE_CACHE_ALIAS = 'responses'
+
 CORS_ALLOWED_ORIGINS = [
     'https://projet-app-web-bassoum-kouyate-hernandez-eieb.onrender.com'
 ]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -56,15 +57,106 @@ SIMPLE_JWT = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication + cache LRU des utilisateurs (api/authentication.py)
+        'api.authentication.CachedJWTAuthentication',
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         'rest_framework.permissions.IsAuthenticated',
-    )
+    ),
+    # Pagination par clé (sans COUNT ni OFFSET) ; ?page_size= pour ajuster, borné par max_page_size
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # JSON via orjson (api/renderers.py, api/parsers.py) ; repli automatique sur la stdlib
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Endpoints publics (api/throttling.py) : '<portée>.ip' et '<portée>.identifier' (email visé).
+    # La limite par email ne doit pas permettre à un tiers de bloquer le compte : assez haute pour
+    # quelques essais réels par minute. Les validations ajax partent à la frappe (IP partagée possible).
+    'DEFAULT_THROTTLE_RATES': {
+        'login.ip': '30/min',
+        'login.identifier': '10/min',
+        'validate_login.ip': '60/min',
+        'validate_login.identifier': '20/min',
+        'register.ip': '10/hour',
+        'register.identifier': '3/hour',
+        'validate_email.ip': '300/min',
+        'validate_email.identifier': '60/min',
+        'validate_password.ip': '300/min',
+    },
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+# Cache des utilisateurs JWT, propre à chaque processus : nombre d'entrées et durée de vie (s)
+JWT_USER_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+}
+
+# Threads dédiés au hachage des mots de passe à la connexion (None : un par cœur)
+LOGIN_HASH_WORKERS = None
+
+# Index des emails (filtre de Bloom par processus) : taux de faux positifs et resynchronisation (s)
+EMAIL_INDEX_ERROR_RATE = 0.01
+EMAIL_INDEX_REFRESH = 30
+
+# Cache local au processus ; la production peut y ajouter un cache partagé (deployment_settings.py)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
 
+# Cache des compteurs de throttling (alias de CACHES)
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Cache des réponses étiquetées par modèle (api/cache.py) : alias de CACHES et durée de vie (s)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+# Attente maximale (s) du calcul d'un autre thread avant de calculer soi-même
+RESPONSE_CACHE_LOCK_WAIT = 0.5
+
+# Cache de requêtes (.cached() sur Player, SeasonStats) : alias, durée de vie (s) et durée
+# pendant laquelle un worker garde les versions lues en base avant de les relire (s)
+QUERY_CACHE_ALIAS = 'default'
+QUERY_CACHE_TIMEOUT = 300
+QUERY_CACHE_VERSION_TTL = 1.0
+
+# Backend du JSON de l'API : 'orjson' (si installé) ou 'json' (stdlib)
+API_JSON_BACKEND = 'orjson'
+
+# Mesures par requête (api/middleware.py) : part des requêtes échantillonnées et en-tête Server-Timing
+PERFORMANCE_SAMPLE_RATE = 1.0
+PERFORMANCE_SERVER_TIMING = True
+# Au-delà (ms), la requête est journalisée en WARNING même hors échantillon (None : jamais)
+PERFORMANCE_SLOW_MS = 1000
+
+# Journal des requêtes SQL (api/querystats.py) : EXPLAIN au-delà du seuil, un fichier par worker dans QUERY_STATS_DIR
+QUERY_STATS_SLOW_MS = 100
+QUERY_STATS_DIR = Path(tempfile.gettempdir()) / 'myteams-querystats'
+QUERY_STATS_FLUSH_INTERVAL = 5
+QUERY_STATS_MAX_FINGERPRINTS = 1000
+
+# Métriques Prometheus sur /metrics (api/metrics.py) : un fichier par worker dans METRICS_DIR, publié toutes les
+# METRICS_FLUSH_INTERVAL secondes ; METRICS_TOKEN exigé en Bearer (sans jeton, /metrics n'est ouvert qu'en DEBUG)
+METRICS_DIR = Path(tempfile.gettempdir()) / 'myteams-metrics'
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = None
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.QueryStatsMiddleware',
+    'api.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.RateLimitHeadersMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -96,6 +188,8 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
+# Lisibles par le frontend pour ralentir avant d'être bloqué
+CORS_EXPOSE_HEADERS = ['RateLimit-Limit', 'RateLimit-Remaining', 'RateLimit-Reset', 'Retry-After', 'Server-Timing']
 FRONTEND_URL = "http://localhost:5173"
 AUTH_USER_MODEL = 'api.User'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
@@ -161,4 +255,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # EMAIL_USE_TLS = True
 # EMAIL_HOST_USER = 'your_email@gmail.com'
 # EMAIL_HOST_PASSWORD = 'your_email_password'
-# DEFAULT_FROM_EMAIL = 'webmaster@localhost'
\ No newline at end of file
+# DEFAULT_FROM_EMAIL = 'webmaster@localhost'
+
+# Une ligne JSON par requête échantillonnée sur 'api.performance' (niveau INFO pour les voir)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.performance': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# Participations : insertion par lots à la création d'un événement / approbation d'un joueur.
+# Au-delà du seuil (joueurs x événements), l'insertion est faite en arrière-plan après le commit.
+PARTICIPATION_FANOUT_BATCH_SIZE = 500
+PARTICIPATION_FANOUT_DEFER_THRESHOLD = 5000
+
+# Durée de vie (secondes) des statistiques d'équipe en cache, invalidées à chaque écriture sur SeasonStats.
+TEAM_STATS_CACHE_TIMEOUT = 300
@@ -4,6 +4,8 @@ set -o errexit   # Stop script if any command fails
 pip install -r requirements.txt
 python manage.py collectstatic --noinput
 python manage.py migrate
+# Table du cache des réponses (sans effet si RESPONSE_CACHE_BACKEND n'est pas 'db')
+python manage.py createcachetable
 
 # Create superuser if requested
 if [[ "$CREATE_SUPERUSER" == "true" ]]; then